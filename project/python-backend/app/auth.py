@@ -7,8 +7,9 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials, OAuth2Pas
 from decouple import config
 import uuid
 
-from app.database import database, users_table
+from app.database import database, read_router, users_table
 from app.models import User, TokenData
+from app.services.user_cache import UserCache, default_generations_path
 
 # Configuration
 SECRET_KEY = config("SECRET_KEY", default="fallback-secret-key-for-development")
@@ -19,6 +20,14 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token", auto_error=False)
 
+# Resolved users by token subject; invalidate whenever a cached field changes.
+# Workers on one host share generation counters through the mmap'd file.
+user_cache = UserCache(
+    maxsize=config("USER_CACHE_MAX_ENTRIES", default=10000, cast=int),
+    ttl=config("USER_CACHE_TTL", default=60, cast=float),
+    generations_path=config("USER_CACHE_GENERATIONS_PATH", default=default_generations_path()) or None,
+)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -52,19 +61,36 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
         
     token_data = verify_token(token, credentials_exception)
     
+    user = user_cache.get(token_data.email)
+    if user is not None:
+        return user
+    
+    generation = user_cache.generation(token_data.email)
     query = users_table.select().where(users_table.c.email == token_data.email)
     user = await database.fetch_one(query)
     
     if user is None:
         raise credentials_exception
     
-    return User(**dict(user))
+    user = User(**dict(user))
+    user_cache.set(token_data.email, user, generation)
+    return user
 
 async def get_current_active_user(current_user: User = Depends(get_current_user)):
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
+async def get_current_writer(current_user: User = Depends(get_current_active_user)):
+    """Active user for mutating routes; pins their reads to the primary for a while"""
+    read_router.record_write(current_user.id)
+    yield current_user
+    read_router.record_write(current_user.id)
+
+async def get_user_reader(current_user: User = Depends(get_current_active_user)):
+    """Database for the user's read-only queries: a replica unless they just wrote"""
+    return read_router.for_user(current_user.id)
+
 async def create_user(user_data: dict) -> str:
     user_id = str(uuid.uuid4())
     user_data["id"] = user_id
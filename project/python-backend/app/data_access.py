@@ -0,0 +1,76 @@
+import sqlite3
+from typing import Any, Dict, Iterable, Optional
+
+import sqlalchemy
+from sqlalchemy.dialects import sqlite
+
+from app.database import IS_SQLITE, database
+
+# SQLAlchemy 1.4 (what `databases` 0.8 runs on) only compiles RETURNING for
+# PostgreSQL; SQLite has executed it natively since 3.35.
+_NATIVE_RETURNING = not IS_SQLITE or int(sqlalchemy.__version__.split(".")[0]) >= 2
+_SQLITE_NAMED = sqlite.dialect(paramstyle="named")
+
+try:
+    from asyncpg.exceptions import IntegrityConstraintViolationError, UniqueViolationError
+    INTEGRITY_ERRORS = (sqlite3.IntegrityError, IntegrityConstraintViolationError)
+except ImportError:  # SQLite-only install
+    UniqueViolationError = None
+    INTEGRITY_ERRORS = (sqlite3.IntegrityError,)
+
+# sqlite3 extended result codes: SQLITE_CONSTRAINT_PRIMARYKEY, SQLITE_CONSTRAINT_UNIQUE
+_SQLITE_UNIQUE_CODES = {1555, 2067}
+
+
+def is_unique_violation(error: Exception) -> bool:
+    """Whether an INTEGRITY_ERRORS exception is a unique or primary key conflict, not NOT NULL or a foreign key"""
+    if isinstance(error, sqlite3.IntegrityError):
+        code = getattr(error, "sqlite_errorcode", None)  # Python 3.11+
+        if code is not None:
+            return code in _SQLITE_UNIQUE_CODES
+        return str(error).startswith("UNIQUE constraint failed")
+    return UniqueViolationError is not None and isinstance(error, UniqueViolationError)
+
+
+def _returning(statement, table: sqlalchemy.Table):
+    """`statement RETURNING <every column of table>`, typed like a select of table"""
+    if _NATIVE_RETURNING:
+        return statement.returning(*table.c)
+    compiled = statement.compile(dialect=_SQLITE_NAMED, compile_kwargs={"render_postcompile": True})
+    columns = ", ".join(_SQLITE_NAMED.identifier_preparer.quote(column.name) for column in table.c)
+    binds = [
+        sqlalchemy.bindparam(name, value, type_=compiled.binds[name].type)
+        for name, value in compiled.params.items()
+    ]
+    return sqlalchemy.text(f"{compiled.string} RETURNING {columns}").bindparams(*binds).columns(*table.c)
+
+
+def with_defaults(table: sqlalchemy.Table, values: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill in Python-side column defaults, which `databases` never evaluates"""
+    filled = dict(values)
+    for column in table.c:
+        default = column.default
+        if column.name in filled or default is None or not (default.is_scalar or default.is_callable):
+            continue
+        filled[column.name] = default.arg if default.is_scalar else default.arg(None)
+    return filled
+
+
+async def fetch_for_update(table: sqlalchemy.Table, where: Iterable[Any]):
+    """Read a row and lock it until the surrounding transaction ends (no-op lock on SQLite)"""
+    return await database.fetch_one(table.select().where(*where).with_for_update())
+
+
+async def insert_row(table: sqlalchemy.Table, values: Dict[str, Any]):
+    """Insert and return the stored row, server defaults included, in one round trip"""
+    return await database.fetch_one(_returning(table.insert().values(**with_defaults(table, values)), table))
+
+
+async def update_row(table: sqlalchemy.Table, where: Iterable[Any], values: Dict[str, Any]):
+    """Update the row matching every `where` condition; None when nothing matched"""
+    return await database.fetch_one(_returning(table.update().where(*where).values(**values), table))
+
+
+async def delete_row(table: sqlalchemy.Table, where: Iterable[Any]) -> Optional[Any]:
+    """Delete the row matching every `where` condition; None when nothing matched"""
+    return await database.fetch_one(_returning(table.delete().where(*where), table))
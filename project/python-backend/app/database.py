@@ -1,18 +1,72 @@
-import databases
+import os
+
 import sqlalchemy
 from sqlalchemy import create_engine, MetaData
-from decouple import config
+from decouple import Csv, config
+
+from app.db_pool import PooledDatabase, ReadRouter
+from app.services.shared_counters import SharedCounters, runtime_directory
 
 DATABASE_URL = config("DATABASE_URL", default="sqlite:///./globe_trotter.db")
+IS_SQLITE = DATABASE_URL.startswith("sqlite")
+
+
+def _with_driver(url: str, async_driver: bool) -> str:
+    scheme, _, rest = url.partition("://")
+    dialect = {"postgres": "postgresql"}.get(scheme.split("+")[0], scheme.split("+")[0])
+    if not async_driver:
+        return f"{dialect}://{rest}"
+    return f"{dialect}+{'aiosqlite' if dialect == 'sqlite' else 'asyncpg'}://{rest}"
+
+
+# The async side always runs on asyncpg / aiosqlite; DDL and Alembic use the
+# plain sync driver, whatever driver suffix DATABASE_URL carries.
+ASYNC_DATABASE_URL = _with_driver(DATABASE_URL, async_driver=True)
+SYNC_DATABASE_URL = _with_driver(DATABASE_URL, async_driver=False)
+DATABASE_READ_URLS = config("DATABASE_READ_URLS", default="", cast=Csv())
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "migrations")
+
+# SQLite performance profile, applied to every pooled connection. busy_timeout
+# comes first so the switch to WAL waits out other writers instead of failing.
+SQLITE_PRAGMAS = {
+    "busy_timeout": config("SQLITE_BUSY_TIMEOUT_MS", default=5000, cast=int),
+    "journal_mode": config("SQLITE_JOURNAL_MODE", default="WAL"),
+    "synchronous": config("SQLITE_SYNCHRONOUS", default="NORMAL"),
+    "mmap_size": config("SQLITE_MMAP_SIZE", default=268435456, cast=int),
+    "cache_size": config("SQLITE_CACHE_SIZE", default=-65536, cast=int),
+    "temp_store": config("SQLITE_TEMP_STORE", default="MEMORY"),
+}
+
+
+def _pooled_database(url: str) -> PooledDatabase:
+    return PooledDatabase(
+        _with_driver(url, async_driver=True),
+        min_size=config("DATABASE_POOL_MIN_SIZE", default=2, cast=int),
+        max_size=config("DATABASE_POOL_MAX_SIZE", default=10, cast=int),
+        acquire_timeout=config("DATABASE_POOL_ACQUIRE_TIMEOUT", default=10, cast=float),
+        max_lifetime=config("DATABASE_POOL_MAX_LIFETIME", default=300, cast=float),
+        statement_cache_size=config("DATABASE_STATEMENT_CACHE_SIZE", default=100, cast=int),
+        sqlite_pragmas=SQLITE_PRAGMAS if config("SQLITE_PERFORMANCE_PROFILE", default=True, cast=bool) else None,
+    )
 
-# For SQLite in development
-if DATABASE_URL.startswith("sqlite"):
-    database = databases.Database(DATABASE_URL)
-    engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
-else:
-    # For PostgreSQL in production
-    database = databases.Database(DATABASE_URL)
-    engine = create_engine(DATABASE_URL)
+
+# SQLite in development, PostgreSQL in production. Schema changes go through
+# Alembic (see migrations/); create_schema() runs them for development.
+database = _pooled_database(DATABASE_URL)
+
+# Read-only handler queries go through read_router; with no DATABASE_READ_URLS
+# it always answers with the primary. Workers on one host share the
+# read-your-writes window through READ_YOUR_WRITES_PATH.
+read_router = ReadRouter(
+    database,
+    [_pooled_database(url) for url in DATABASE_READ_URLS],
+    sticky_seconds=config("READ_YOUR_WRITES_SECONDS", default=5, cast=float),
+    health_timeout=config("DATABASE_READ_HEALTH_TIMEOUT", default=2, cast=float),
+    write_times=SharedCounters(
+        config("READ_YOUR_WRITES_PATH", default=os.path.join(runtime_directory(), "recent_writes")) or None,
+        slots=65536,
+    ),
+)
 
 metadata = MetaData()
 
@@ -45,7 +99,8 @@ destinations_table = sqlalchemy.Table(
     sqlalchemy.Column("longitude", sqlalchemy.Float),
     sqlalchemy.Column("description", sqlalchemy.Text),
     sqlalchemy.Column("short_description", sqlalchemy.String),
-    sqlalchemy.Column("avg_rating", sqlalchemy.Float, default=0.0),
+    # NOT NULL: keyset pages compare (avg_rating, id) tuples, which skip NULLs
+    sqlalchemy.Column("avg_rating", sqlalchemy.Float, nullable=False, server_default="0"),
     sqlalchemy.Column("review_count", sqlalchemy.Integer, default=0),
     sqlalchemy.Column("average_price", sqlalchemy.Float),
     sqlalchemy.Column("currency", sqlalchemy.String, default="USD"),
@@ -56,6 +111,10 @@ destinations_table = sqlalchemy.Table(
     sqlalchemy.Column("is_featured", sqlalchemy.Boolean, default=False),
     sqlalchemy.Column("is_active", sqlalchemy.Boolean, default=True),
     sqlalchemy.Column("created_at", sqlalchemy.DateTime, server_default=sqlalchemy.func.now()),
+    # Keyset pagination: ORDER BY avg_rating DESC, id DESC
+    sqlalchemy.Index("ix_destinations_active_rating_id", "is_active", "avg_rating", "id"),
+    # Natural key the bulk catalog loader upserts on
+    sqlalchemy.Index("ux_destinations_name_city_country", "name", "city", "country", unique=True),
 )
 
 # Trips table
@@ -73,10 +132,36 @@ trips_table = sqlalchemy.Table(
     sqlalchemy.Column("currency", sqlalchemy.String, default="USD"),
     sqlalchemy.Column("status", sqlalchemy.String, default="draft"),
     sqlalchemy.Column("privacy_level", sqlalchemy.String, default="private"),
-    sqlalchemy.Column("destinations", sqlalchemy.JSON),  # Array of destination IDs with details
     sqlalchemy.Column("ai_suggestions", sqlalchemy.JSON, nullable=True),
+    # Optimistic concurrency: bumped by every update, checked by PATCH
+    sqlalchemy.Column("version", sqlalchemy.Integer, nullable=False, server_default="1"),
     sqlalchemy.Column("created_at", sqlalchemy.DateTime, server_default=sqlalchemy.func.now()),
     sqlalchemy.Column("updated_at", sqlalchemy.DateTime, server_default=sqlalchemy.func.now(), onupdate=sqlalchemy.func.now()),
+    # Keyset pagination: ORDER BY created_at DESC, id DESC per user
+    sqlalchemy.Index("ix_trips_user_created_id", "user_id", "created_at", "id"),
+)
+
+# Trip stops: one row per stop, ordered within a trip by sequence_order
+trip_stops_table = sqlalchemy.Table(
+    "trip_stops",
+    metadata,
+    sqlalchemy.Column("id", sqlalchemy.String, primary_key=True),
+    sqlalchemy.Column("trip_id", sqlalchemy.String, sqlalchemy.ForeignKey("trips.id", ondelete="CASCADE"), nullable=False),
+    sqlalchemy.Column("destination_id", sqlalchemy.String, sqlalchemy.ForeignKey("destinations.id"), nullable=True),
+    # Fractional, so moving a stop rewrites only that stop's row
+    sqlalchemy.Column("sequence_order", sqlalchemy.Float, nullable=False),
+    sqlalchemy.Column("arrival_date", sqlalchemy.Date, nullable=True),
+    sqlalchemy.Column("departure_date", sqlalchemy.Date, nullable=True),
+    sqlalchemy.Column("notes", sqlalchemy.Text, nullable=True),
+    sqlalchemy.Column("budget", sqlalchemy.Float, nullable=True),
+    # Free-form stops that are not in the catalog
+    sqlalchemy.Column("name", sqlalchemy.String, nullable=True),
+    sqlalchemy.Column("latitude", sqlalchemy.Float, nullable=True),
+    sqlalchemy.Column("longitude", sqlalchemy.Float, nullable=True),
+    sqlalchemy.Column("created_at", sqlalchemy.DateTime, server_default=sqlalchemy.func.now()),
+    sqlalchemy.Index("ix_trip_stops_trip_order", "trip_id", "sequence_order", unique=True),
+    # "Which trips visit destination X"
+    sqlalchemy.Index("ix_trip_stops_destination_trip", "destination_id", "trip_id"),
 )
 
 # Bookings table
@@ -93,6 +178,8 @@ bookings_table = sqlalchemy.Table(
     sqlalchemy.Column("booking_details", sqlalchemy.JSON),
     sqlalchemy.Column("service_date", sqlalchemy.Date),
     sqlalchemy.Column("created_at", sqlalchemy.DateTime, server_default=sqlalchemy.func.now()),
+    # Keyset pagination: ORDER BY created_at DESC, id DESC per user
+    sqlalchemy.Index("ix_bookings_user_created_id", "user_id", "created_at", "id"),
 )
 
 # Reviews table
@@ -109,4 +196,113 @@ reviews_table = sqlalchemy.Table(
     sqlalchemy.Column("is_approved", sqlalchemy.Boolean, default=True),
     sqlalchemy.Column("helpful_votes", sqlalchemy.Integer, default=0),
     sqlalchemy.Column("created_at", sqlalchemy.DateTime, server_default=sqlalchemy.func.now()),
-)
\ No newline at end of file
+)
+
+# Monthly climate per destination: 12 little-endian float32 values per blob
+# (see app.services.climate), loaded into NumPy by the catalog indexes
+destination_climate_table = sqlalchemy.Table(
+    "destination_climate",
+    metadata,
+    sqlalchemy.Column("destination_id", sqlalchemy.String, sqlalchemy.ForeignKey("destinations.id"), primary_key=True),
+    sqlalchemy.Column("temperatures", sqlalchemy.LargeBinary, nullable=False),  # mean °C, Jan..Dec
+    sqlalchemy.Column("rainfall", sqlalchemy.LargeBinary, nullable=False),  # mm, Jan..Dec
+    sqlalchemy.Column("best_time", sqlalchemy.String, nullable=True),
+    sqlalchemy.Column("updated_at", sqlalchemy.DateTime, server_default=sqlalchemy.func.now()),
+)
+
+# Per-user rollup of trips, bookings and reviews, kept current by
+# app.services.user_stats in the same transaction as each change
+user_stats_table = sqlalchemy.Table(
+    "user_stats",
+    metadata,
+    sqlalchemy.Column("user_id", sqlalchemy.String, sqlalchemy.ForeignKey("users.id"), primary_key=True),
+    sqlalchemy.Column("total_trips", sqlalchemy.Integer, nullable=False, server_default="0"),
+    sqlalchemy.Column("completed_trips", sqlalchemy.Integer, nullable=False, server_default="0"),
+    sqlalchemy.Column("total_budget", sqlalchemy.Float, nullable=False, server_default="0"),
+    sqlalchemy.Column("total_bookings", sqlalchemy.Integer, nullable=False, server_default="0"),
+    sqlalchemy.Column("total_spent", sqlalchemy.Float, nullable=False, server_default="0"),
+    sqlalchemy.Column("total_reviews", sqlalchemy.Integer, nullable=False, server_default="0"),
+    sqlalchemy.Column("rating_sum", sqlalchemy.Integer, nullable=False, server_default="0"),
+    sqlalchemy.Column("updated_at", sqlalchemy.DateTime, server_default=sqlalchemy.func.now(), onupdate=sqlalchemy.func.now()),
+)
+
+# Full-text search index over destinations.
+# SQLite: external-content FTS5 table kept in sync by triggers.
+# PostgreSQL: generated tsvector column with a GIN index.
+SEARCH_COLUMNS = ["name", "city", "country", "short_description", "description"]
+
+SQLITE_SEARCH_DDL = [
+    f"""CREATE VIRTUAL TABLE destinations_fts USING fts5(
+        {", ".join(SEARCH_COLUMNS)},
+        content='destinations', content_rowid='rowid',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS destinations_fts_insert AFTER INSERT ON destinations BEGIN
+        INSERT INTO destinations_fts(rowid, {", ".join(SEARCH_COLUMNS)})
+        VALUES (new.rowid, {", ".join("new." + c for c in SEARCH_COLUMNS)});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS destinations_fts_delete AFTER DELETE ON destinations BEGIN
+        INSERT INTO destinations_fts(destinations_fts, rowid, {", ".join(SEARCH_COLUMNS)})
+        VALUES ('delete', old.rowid, {", ".join("old." + c for c in SEARCH_COLUMNS)});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS destinations_fts_update AFTER UPDATE OF {", ".join(SEARCH_COLUMNS)} ON destinations BEGIN
+        INSERT INTO destinations_fts(destinations_fts, rowid, {", ".join(SEARCH_COLUMNS)})
+        VALUES ('delete', old.rowid, {", ".join("old." + c for c in SEARCH_COLUMNS)});
+        INSERT INTO destinations_fts(rowid, {", ".join(SEARCH_COLUMNS)})
+        VALUES (new.rowid, {", ".join("new." + c for c in SEARCH_COLUMNS)});
+    END""",
+    "INSERT INTO destinations_fts(destinations_fts) VALUES ('rebuild')",
+]
+
+POSTGRES_SEARCH_DDL = [
+    """ALTER TABLE destinations ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(city, '') || ' ' || coalesce(country, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(short_description, '')), 'C') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'D')
+    ) STORED""",
+    "CREATE INDEX IF NOT EXISTS ix_destinations_search_vector ON destinations USING GIN (search_vector)",
+]
+
+@sqlalchemy.event.listens_for(metadata, "after_create")
+def create_search_index(target, connection, **kw):
+    if connection.dialect.name == "sqlite":
+        exists = connection.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'destinations_fts'"
+        ).first()
+        if exists:
+            return
+        statements = SQLITE_SEARCH_DDL
+    elif connection.dialect.name == "postgresql":
+        statements = POSTGRES_SEARCH_DDL
+    else:
+        return
+
+    for statement in statements:
+        connection.exec_driver_sql(statement)
+
+
+def create_schema():
+    """Bring the database to the latest migration: `alembic upgrade head` for development.
+
+    Tables from the old startup DDL are adopted and upgraded by the migrations.
+    A schema made by metadata.create_all() without Alembic is already current
+    and is only stamped.
+    """
+    from alembic import command
+    from alembic.config import Config
+
+    # No ini file, so Alembic leaves the server's logging configuration alone
+    alembic_config = Config()
+    alembic_config.set_main_option("script_location", MIGRATIONS_DIR)
+    connect_args = {"check_same_thread": False} if IS_SQLITE else {}
+    engine = create_engine(SYNC_DATABASE_URL, connect_args=connect_args)
+    try:
+        tables = set(sqlalchemy.inspect(engine).get_table_names())
+    finally:
+        engine.dispose()
+    if "alembic_version" not in tables and "trip_stops" in tables:
+        command.stamp(alembic_config, "head")
+    else:
+        command.upgrade(alembic_config, "head")
+
@@ -0,0 +1,348 @@
+import asyncio
+import itertools
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlencode
+
+import databases
+
+from app.services.shared_counters import SharedCounters
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeout(Exception):
+    """No database connection became free within the acquire timeout"""
+
+
+def pragma_hook(pragmas: Dict[str, Any]) -> Callable[[Any], Awaitable[None]]:
+    """on_connect hook applying `pragmas` in order to each new aiosqlite connection"""
+
+    async def apply(connection):
+        for name, value in pragmas.items():
+            await connection.execute(f"PRAGMA {name}={value}")
+
+    return apply
+
+
+class SQLiteConnectionPool:
+    """Reusable aiosqlite connections for the `databases` SQLite backend.
+
+    The stock backend opens a fresh connection (and its worker thread) for
+    every acquire. This keeps up to max_size open, hands them out LIFO and
+    retires each after max_lifetime seconds. on_connect runs once per new
+    connection, e.g. to apply PRAGMAs.
+    """
+
+    def __init__(
+        self,
+        url,
+        min_size: int = 1,
+        max_size: int = 10,
+        max_lifetime: float = 300,
+        cached_statements: int = 128,
+        on_connect: Optional[Callable[[Any], Awaitable[None]]] = None,
+    ):
+        self._database = url.database
+        if url.options:
+            self._database += "?" + urlencode(url.options)
+        # Read by SQLiteBackend.disconnect(); shared-cache memory databases are not pooled specially
+        self._memref = None
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_lifetime = max_lifetime
+        self.cached_statements = cached_statements
+        self.on_connect = on_connect
+        self._idle: List[Tuple[Any, float]] = []
+        self._created: Dict[int, float] = {}
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    def get_size(self) -> int:
+        return len(self._created)
+
+    def get_idle_size(self) -> int:
+        return len(self._idle)
+
+    async def _open(self):
+        import aiosqlite
+
+        connection = aiosqlite.connect(
+            database=self._database,
+            isolation_level=None,
+            cached_statements=self.cached_statements,
+            uri=self._database.startswith("file:"),
+        )
+        # Idle pooled connections must not keep the interpreter alive at exit.
+        # aiosqlite < 0.20 is itself the worker thread; newer versions own one.
+        getattr(connection, "_thread", connection).daemon = True
+        await connection.__aenter__()
+        if self.on_connect is not None:
+            await self.on_connect(connection)
+        self._created[id(connection)] = time.monotonic()
+        return connection
+
+    async def _close(self, connection):
+        self._created.pop(id(connection), None)
+        await connection.__aexit__(None, None, None)
+
+    async def acquire(self):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_size)
+        await self._slots.acquire()
+        try:
+            while self._idle:
+                connection, created_at = self._idle.pop()
+                if time.monotonic() - created_at < self.max_lifetime:
+                    return connection
+                await self._close(connection)
+            return await self._open()
+        except BaseException:
+            self._slots.release()
+            raise
+
+    async def release(self, connection):
+        try:
+            created_at = self._created.get(id(connection))
+            if created_at is None or time.monotonic() - created_at >= self.max_lifetime:
+                await self._close(connection)
+                return
+            if connection.in_transaction:
+                # A handler failed mid-transaction; never hand its state to the next one
+                await connection.rollback()
+            self._idle.append((connection, created_at))
+        except Exception:
+            await self._close(connection)
+        finally:
+            self._slots.release()
+
+    async def close(self):
+        while self._idle:
+            connection, _ = self._idle.pop()
+            await self._close(connection)
+
+
+class InstrumentedPool:
+    """Wraps the backend's pool to enforce an acquire timeout and record usage.
+
+    Installed as `backend._pool` so every connection the `databases` package
+    takes goes through it. Anything else is forwarded to the wrapped pool.
+    """
+
+    def __init__(self, pool, max_size: int, acquire_timeout: float):
+        self._inner = pool
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self.in_use = 0
+        self.waiting = 0
+        self.acquisitions = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._inner, name)
+
+    async def acquire(self):
+        start = time.perf_counter()
+        self.waiting += 1
+        try:
+            connection = await asyncio.wait_for(self._inner.acquire(), self.acquire_timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise PoolTimeout(f"No database connection available within {self.acquire_timeout}s")
+        finally:
+            self.waiting -= 1
+        waited = time.perf_counter() - start
+        self.acquisitions += 1
+        self.wait_total += waited
+        self.wait_max = max(self.wait_max, waited)
+        self.in_use += 1
+        return connection
+
+    async def release(self, connection):
+        self.in_use -= 1
+        return await self._inner.release(connection)
+
+    def stats(self) -> Dict[str, Any]:
+        size = self._inner.get_size()
+        return {
+            "size": size,
+            "max_size": self.max_size,
+            "in_use": self.in_use,
+            "idle": self._inner.get_idle_size(),
+            "waiting": self.waiting,
+            "acquisitions": self.acquisitions,
+            "timeouts": self.timeouts,
+            "avg_wait_ms": round(self.wait_total / self.acquisitions * 1000, 3) if self.acquisitions else 0.0,
+            "max_wait_ms": round(self.wait_max * 1000, 3),
+        }
+
+
+class PooledDatabase(databases.Database):
+    """`databases.Database` with explicit pool sizing, acquire timeout and stats.
+
+    PostgreSQL runs on asyncpg's pool; asyncpg has no absolute connection age,
+    so max_lifetime recycles idle connections instead. SQLite runs on
+    SQLiteConnectionPool, with sqlite_pragmas applied to every new connection.
+    connect() pre-opens min_size connections.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        min_size: int = 2,
+        max_size: int = 10,
+        acquire_timeout: float = 10,
+        max_lifetime: float = 300,
+        statement_cache_size: int = 100,
+        sqlite_pragmas: Optional[Dict[str, Any]] = None,
+    ):
+        self.min_size = min_size
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        if url.startswith("sqlite"):
+            super().__init__(url)
+            self._backend._pool = SQLiteConnectionPool(
+                self.url,
+                min_size=min_size,
+                max_size=max_size,
+                max_lifetime=max_lifetime,
+                cached_statements=statement_cache_size,
+                on_connect=pragma_hook(sqlite_pragmas) if sqlite_pragmas else None,
+            )
+        else:
+            super().__init__(
+                url,
+                min_size=min_size,
+                max_size=max_size,
+                max_inactive_connection_lifetime=max_lifetime,
+                statement_cache_size=statement_cache_size,
+            )
+
+    async def connect(self):
+        if self.is_connected:
+            return
+        await super().connect()
+        if not isinstance(self._backend._pool, InstrumentedPool):
+            self._backend._pool = InstrumentedPool(self._backend._pool, self.max_size, self.acquire_timeout)
+        await self.warm(self.min_size)
+
+    async def warm(self, count: int):
+        """Check out `count` connections at once and run a trivial query on each"""
+        pool = self._backend._pool
+        connections = await asyncio.gather(*(pool.acquire() for _ in range(count)))
+        try:
+            for connection in connections:
+                await connection.execute("SELECT 1")
+        finally:
+            for connection in connections:
+                await pool.release(connection)
+
+    async def disconnect(self):
+        await super().disconnect()
+        pool = getattr(self._backend._pool, "_inner", self._backend._pool)
+        if isinstance(pool, SQLiteConnectionPool):
+            await pool.close()
+
+    def pool_stats(self) -> Dict[str, Any]:
+        if not self.is_connected:
+            return {"connected": False}
+        return {"connected": True, "driver": self.url.driver, **self._backend._pool.stats()}
+
+
+class ReadRouter:
+    """Sends reads to healthy replicas round-robin and falls back to the primary.
+
+    Writes always use the primary. A user who wrote within the last
+    sticky_seconds reads from the primary too, so replica lag never hides
+    their own change from them. Write times live in write_times, shared by the
+    workers on the host, so the next request sees them on whichever worker it
+    lands; a slot collision only sends another user to the primary.
+    """
+
+    def __init__(
+        self,
+        primary: databases.Database,
+        replicas: Sequence[PooledDatabase] = (),
+        sticky_seconds: float = 5.0,
+        health_timeout: float = 2.0,
+        write_times: Optional[SharedCounters] = None,
+    ):
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.healthy = [False] * len(self.replicas)
+        self.sticky_seconds = sticky_seconds
+        self.health_timeout = health_timeout
+        # Last write per user, in milliseconds since the epoch
+        self.write_times = write_times if write_times is not None else SharedCounters(slots=65536)
+        self._turn = itertools.count()
+        self.replica_reads = 0
+        self.primary_reads = 0
+        self.sticky_reads = 0
+
+    def pick(self) -> databases.Database:
+        """Next healthy replica, or the primary when there is none"""
+        count = len(self.replicas)
+        for _ in range(count):
+            index = next(self._turn) % count
+            if self.healthy[index]:
+                self.replica_reads += 1
+                return self.replicas[index]
+        self.primary_reads += 1
+        return self.primary
+
+    def for_user(self, user_id: str) -> databases.Database:
+        if self.replicas and time.time() * 1000 - self.write_times.get(user_id) < self.sticky_seconds * 1000:
+            self.sticky_reads += 1
+            return self.primary
+        return self.pick()
+
+    def record_write(self, user_id: str):
+        if self.replicas:
+            self.write_times.set(user_id, int(time.time() * 1000))
+
+    def open(self):
+        """Map the shared write times; call at startup. Without replicas there is nothing to share"""
+        if self.replicas:
+            self.write_times.open()
+
+    async def _probe(self, index: int):
+        replica = self.replicas[index]
+        try:
+            if not replica.is_connected:
+                await asyncio.wait_for(replica.connect(), self.health_timeout)
+            await asyncio.wait_for(replica.fetch_val("SELECT 1"), self.health_timeout)
+            healthy = True
+        except Exception as exc:
+            healthy = False
+            if self.healthy[index]:
+                logger.warning("Read replica %s is unhealthy: %r", replica.url.obscure_password, exc)
+        if healthy and not self.healthy[index]:
+            logger.info("Read replica %s is serving reads", replica.url.obscure_password)
+        self.healthy[index] = healthy
+
+    async def check(self):
+        await asyncio.gather(*(self._probe(index) for index in range(len(self.replicas))))
+
+    async def run_health_checks(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            await self.check()
+
+    async def disconnect(self):
+        for replica in self.replicas:
+            if replica.is_connected:
+                await replica.disconnect()
+        self.write_times.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "replicas": [
+                {"url": replica.url.obscure_password, "healthy": healthy, **replica.pool_stats()}
+                for replica, healthy in zip(self.replicas, self.healthy)
+            ],
+            "replica_reads": self.replica_reads,
+            "primary_reads": self.primary_reads,
+            "sticky_reads": self.sticky_reads,
+        }
@@ -0,0 +1,148 @@
+"""RFC 6902 JSON Patch: operation parsing, and applying patches to plain JSON documents"""
+
+import copy
+from typing import Any, List, NamedTuple, Optional
+
+from fastapi import HTTPException
+
+OPERATIONS = ("add", "remove", "replace", "move", "copy", "test")
+MEDIA_TYPE = "application/json-patch+json"
+
+
+class Operation(NamedTuple):
+    op: str
+    path: List[str]
+    value: Any = None
+    source: Optional[List[str]] = None  # "from" of move and copy
+
+
+def invalid(detail: str) -> HTTPException:
+    return HTTPException(status_code=400, detail=detail)
+
+
+def conflict(detail: str) -> HTTPException:
+    """The patch is well-formed but cannot be applied to the current document"""
+    return HTTPException(status_code=409, detail=detail)
+
+
+def parse_pointer(pointer: Any) -> List[str]:
+    """RFC 6901 pointer to its unescaped reference tokens; "" is the whole document"""
+    if not isinstance(pointer, str) or (pointer and not pointer.startswith("/")):
+        raise invalid(f"Invalid JSON pointer: {pointer!r}")
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer.split("/")[1:]]
+
+
+def format_pointer(path: List[str]) -> str:
+    return "".join("/" + token.replace("~", "~0").replace("/", "~1") for token in path)
+
+
+def parse(operations: Any) -> List[Operation]:
+    if not isinstance(operations, list) or not operations:
+        raise invalid("JSON Patch must be a non-empty array of operations")
+    parsed = []
+    for item in operations:
+        if not isinstance(item, dict) or item.get("op") not in OPERATIONS:
+            raise invalid(f"Unknown JSON Patch operation: {item!r}")
+        op = item["op"]
+        if op in ("add", "replace", "test") and "value" not in item:
+            raise invalid(f"'{op}' needs a value")
+        source = None
+        if op in ("move", "copy"):
+            if "from" not in item:
+                raise invalid(f"'{op}' needs a from pointer")
+            source = parse_pointer(item["from"])
+        parsed.append(Operation(op, parse_pointer(item.get("path")), item.get("value"), source))
+    return parsed
+
+
+def equal(left: Any, right: Any) -> bool:
+    """JSON equality: unlike Python, true is not 1"""
+    if isinstance(left, bool) or isinstance(right, bool):
+        return type(left) is type(right) and left == right
+    if isinstance(left, dict) and isinstance(right, dict):
+        return left.keys() == right.keys() and all(equal(left[key], right[key]) for key in left)
+    if isinstance(left, list) and isinstance(right, list):
+        return len(left) == len(right) and all(equal(a, b) for a, b in zip(left, right))
+    return left == right
+
+
+def array_index(array: list, token: str, allow_end: bool = False) -> int:
+    """Index for an array reference token; "-" (past the end) only where adding"""
+    if allow_end and token == "-":
+        return len(array)
+    if not token.isdigit() or (len(token) > 1 and token.startswith("0")):
+        raise conflict(f"Invalid array index: {token!r}")
+    index = int(token)
+    if index > len(array) or (index == len(array) and not allow_end):
+        raise conflict(f"Array index out of range: {index}")
+    return index
+
+
+def resolve(document: Any, path: List[str]) -> Any:
+    for token in path:
+        if isinstance(document, dict) and token in document:
+            document = document[token]
+        elif isinstance(document, list):
+            document = document[array_index(document, token)]
+        else:
+            raise conflict(f"Path not found: {format_pointer(path)}")
+    return document
+
+
+def _add(document: Any, path: List[str], value: Any) -> Any:
+    if not path:
+        return value
+    parent = resolve(document, path[:-1])
+    if isinstance(parent, dict):
+        parent[path[-1]] = value
+    elif isinstance(parent, list):
+        parent.insert(array_index(parent, path[-1], allow_end=True), value)
+    else:
+        raise conflict(f"Cannot add to {format_pointer(path[:-1])}")
+    return document
+
+
+def _remove(document: Any, path: List[str]) -> Any:
+    if not path:
+        raise conflict("Cannot remove the whole document")
+    parent = resolve(document, path[:-1])
+    if isinstance(parent, dict) and path[-1] in parent:
+        return parent.pop(path[-1])
+    if isinstance(parent, list):
+        return parent.pop(array_index(parent, path[-1]))
+    raise conflict(f"Path not found: {format_pointer(path)}")
+
+
+def apply_operation(document: Any, operation: Operation) -> Any:
+    """Apply one operation in place where possible; returns the new document"""
+    op, path = operation.op, operation.path
+    if op == "test":
+        if not equal(resolve(document, path), operation.value):
+            raise conflict(f"Test failed at {format_pointer(path)}")
+        return document
+    if op == "add":
+        return _add(document, path, copy.deepcopy(operation.value))
+    if op == "remove":
+        _remove(document, path)
+        return document
+    if op == "replace":
+        if not path:
+            return copy.deepcopy(operation.value)
+        resolve(document, path)
+        _remove(document, path)
+        return _add(document, path, copy.deepcopy(operation.value))
+    if op == "copy":
+        return _add(document, path, copy.deepcopy(resolve(document, operation.source)))
+    # move
+    if path[:len(operation.source)] == operation.source and path != operation.source:
+        raise conflict("Cannot move a value into itself")
+    value = _remove(document, operation.source)
+    return _add(document, path, value)
+
+
+def apply(document: Any, operations: List[Operation]) -> Any:
+    """Patched copy of a JSON document; the original is left untouched"""
+    document = copy.deepcopy(document)
+    for operation in operations:
+        document = apply_operation(document, operation)
+    return document
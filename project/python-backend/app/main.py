@@ -1,23 +1,67 @@
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import FastAPI, Depends, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from fastapi.security import HTTPBearer
 from contextlib import asynccontextmanager
+import asyncio
 import uvicorn
 from decouple import config
 
-from app.database import database, engine, metadata
+from app.auth import user_cache
+from app.database import IS_SQLITE, create_schema, database, read_router
+from app.db_pool import PoolTimeout
+from app.pagination import NEXT_CURSOR_HEADER
+from app.quotas import RATE_LIMIT_HEADERS, quota_store
 from app.routers import auth, users, destinations, trips, bookings, ai_assistant, maps
 from app.middleware.rate_limit import RateLimitMiddleware
+from app.services.maps_client import close_maps_client
+from app.services.catalog import load_catalog_indexes, refresh_catalog_indexes_periodically
+from app.services.rate_limiter import GCRALimiter, create_store
 
-# Create tables
-metadata.create_all(bind=engine)
+# Per-client request budget; RATE_LIMIT_STORE_PATH shares it across workers
+rate_limiter = GCRALimiter(
+    config("RATE_LIMIT_CALLS", default=100, cast=int),
+    config("RATE_LIMIT_PERIOD", default=60, cast=float),
+    create_store(
+        config("RATE_LIMIT_STORE_PATH", default="") or None,
+        config("RATE_LIMIT_MAX_CLIENTS", default=100000, cast=int),
+    ),
+)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
+    if config("AUTO_CREATE_TABLES", default=IS_SQLITE, cast=bool):
+        await asyncio.to_thread(create_schema)
+    # Shared state files are opened here, never at import
+    user_cache.open()
+    read_router.open()
+    for store in (rate_limiter.store, quota_store, maps.maps_cache):
+        await asyncio.to_thread(store.open)
     await database.connect()
+    await read_router.check()
+    health_task = None
+    if read_router.replicas:
+        health_task = asyncio.create_task(
+            read_router.run_health_checks(float(config("DATABASE_READ_HEALTH_INTERVAL", default="10")))
+        )
+    await load_catalog_indexes()
+    refresh_interval = float(config("CATALOG_INDEX_REFRESH_SECONDS", default="300"))
+    refresh_task = None
+    if refresh_interval > 0:
+        refresh_task = asyncio.create_task(refresh_catalog_indexes_periodically(refresh_interval))
     yield
     # Shutdown
+    if refresh_task is not None:
+        refresh_task.cancel()
+    if health_task is not None:
+        health_task.cancel()
+    await close_maps_client()
+    maps.maps_cache.close()
+    user_cache.close()
+    rate_limiter.store.close()
+    quota_store.close()
+    await read_router.disconnect()
     await database.disconnect()
 
 app = FastAPI(
@@ -34,10 +78,11 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, *RATE_LIMIT_HEADERS, "Retry-After"],
 )
 
 # Rate limiting middleware
-app.add_middleware(RateLimitMiddleware)
+app.add_middleware(RateLimitMiddleware, limiter=rate_limiter)
 
 # Security
 security = HTTPBearer()
@@ -51,6 +96,15 @@ async def health_check():
         "version": "1.0.0"
     }
 
+@app.get("/health/db")
+async def database_health():
+    return {**database.pool_stats(), "reads": read_router.stats()}
+
+@app.exception_handler(PoolTimeout)
+async def pool_timeout_handler(request: Request, exc: PoolTimeout):
+    # Pool exhausted: shed load instead of queueing requests indefinitely
+    return JSONResponse(status_code=503, content={"detail": "Database busy"}, headers={"Retry-After": "1"})
+
 # Include routers
 app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(users.router, prefix="/api/users", tags=["Users"])
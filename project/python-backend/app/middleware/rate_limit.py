@@ -1,29 +1,54 @@
-from fastapi import Request, HTTPException
-from starlette.middleware.base import BaseHTTPMiddleware
-import time
-from collections import defaultdict, deque
-
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app, calls: int = 100, period: int = 60):
-        super().__init__(app)
-        self.calls = calls
-        self.period = period
-        self.clients = defaultdict(deque)
-
-    async def dispatch(self, request: Request, call_next):
-        client_ip = request.client.host
-        now = time.time()
-        
-        # Clean old requests
-        while self.clients[client_ip] and self.clients[client_ip][0] <= now - self.period:
-            self.clients[client_ip].popleft()
-        
-        # Check rate limit
-        if len(self.clients[client_ip]) >= self.calls:
-            raise HTTPException(status_code=429, detail="Rate limit exceeded")
-        
-        # Add current request
-        self.clients[client_ip].append(now)
-        
-        response = await call_next(request)
-        return response
\ No newline at end of file
+import math
+from typing import Callable, Iterable, Optional
+
+from app.services.rate_limiter import GCRALimiter, MemoryStore
+
+_BODY = b'{"detail":"Rate limit exceeded"}'
+
+
+def client_ip(scope) -> str:
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+class RateLimitMiddleware:
+    """Per-client GCRA rate limit as plain ASGI middleware.
+
+    Over-limit requests get a 429 JSON body with Retry-After without entering
+    the app. Pass a limiter with a SQLiteStore to share budgets across workers.
+    """
+
+    def __init__(
+        self,
+        app,
+        calls: int = 100,
+        period: int = 60,
+        limiter: Optional[GCRALimiter] = None,
+        exempt_paths: Iterable[str] = ("/health",),
+        key_func: Callable[[dict], str] = client_ip,
+    ):
+        self.app = app
+        self.limiter = limiter if limiter is not None else GCRALimiter(calls, period, MemoryStore())
+        self.exempt_paths = frozenset(exempt_paths)
+        self.key_func = key_func
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        result = await self.limiter.check(self.key_func(scope))
+        if result.allowed:
+            await self.app(scope, receive, send)
+            return
+
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(_BODY)).encode()),
+                (b"retry-after", str(max(1, math.ceil(result.retry_after))).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": _BODY})
@@ -66,6 +66,16 @@ class Destination(BaseModel):
     is_active: bool
     created_at: datetime
 
+class DestinationClimate(BaseModel):
+    destination_id: str
+    temperatures: List[Optional[float]]  # mean °C, January first
+    rainfall: List[Optional[float]]  # mm, January first
+    best_time: Optional[str]
+
+class ClimateMatch(Destination):
+    month_temperature: Optional[float]
+    month_rainfall: Optional[float]
+
 # Trip Models
 class TripStatus(str, Enum):
     draft = "draft"
@@ -74,6 +84,24 @@ class TripStatus(str, Enum):
     completed = "completed"
     cancelled = "cancelled"
 
+class TripStopCreate(BaseModel):
+    destination_id: Optional[str] = None
+    arrival_date: Optional[date] = None
+    departure_date: Optional[date] = None
+    notes: Optional[str] = None
+    budget: Optional[float] = None
+    name: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+
+class TripStop(TripStopCreate):
+    id: str
+    trip_id: str
+    sequence_order: float
+
+class TripStopMove(BaseModel):
+    position: int = Field(..., ge=0, description="Zero-based index among the trip's stops")
+
 class TripCreate(BaseModel):
     title: str
     description: Optional[str] = None
@@ -83,7 +111,7 @@ class TripCreate(BaseModel):
     total_budget: float
     currency: str = "USD"
     privacy_level: str = "private"
-    destinations: List[Dict[str, Any]] = []
+    stops: List[TripStopCreate] = []
 
 class TripUpdate(BaseModel):
     title: Optional[str] = None
@@ -92,8 +120,9 @@ class TripUpdate(BaseModel):
     end_date: Optional[date] = None
     traveler_count: Optional[int] = None
     total_budget: Optional[float] = None
+    currency: Optional[str] = None
     status: Optional[TripStatus] = None
-    destinations: Optional[List[Dict[str, Any]]] = None
+    privacy_level: Optional[str] = None
 
 class Trip(BaseModel):
     id: str
@@ -107,11 +136,14 @@ class Trip(BaseModel):
     currency: str
     status: str
     privacy_level: str
-    destinations: List[Dict[str, Any]]
     ai_suggestions: Optional[Dict[str, Any]]
+    version: int
     created_at: datetime
     updated_at: datetime
 
+class TripDetail(Trip):
+    stops: List[TripStop]
+
 # Booking Models
 class BookingType(str, Enum):
     flight = "flight"
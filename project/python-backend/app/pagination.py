@@ -0,0 +1,75 @@
+import base64
+import datetime
+import json
+from typing import Any, List, Optional, Sequence
+
+import sqlalchemy
+from fastapi import HTTPException
+
+from app.database import IS_SQLITE
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    return value
+
+
+def _decode_value(value: Any, column: sqlalchemy.Column) -> Any:
+    if value is None:
+        return None
+    python_type = column.type.python_type
+    if python_type is datetime.datetime:
+        return datetime.datetime.fromisoformat(value)
+    if python_type is datetime.date:
+        return datetime.date.fromisoformat(value)
+    return python_type(value)
+
+
+def _bind(value: Any, column: sqlalchemy.Column):
+    if IS_SQLITE and isinstance(value, datetime.datetime):
+        # SQLite compares timestamps as text, so match CURRENT_TIMESTAMP's format
+        return sqlalchemy.literal(value.isoformat(sep=" "))
+    return sqlalchemy.literal(value, column.type)
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Opaque cursor for the sort key of the last row on a page"""
+    payload = json.dumps([_encode_value(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence[sqlalchemy.Column]) -> List[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError(cursor)
+        return [_decode_value(value, column) for value, column in zip(values, columns)]
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_page(query, columns: Sequence[sqlalchemy.Column], cursor: Optional[str], limit: int):
+    """Order by columns descending and start strictly after the cursor.
+
+    The last column must be unique (the primary key) so the order is total and
+    a page never repeats or skips a row. With a matching composite index every
+    page is an index range scan of `limit` rows, however deep it is.
+    """
+    if cursor:
+        values = decode_cursor(cursor, columns)
+        query = query.where(sqlalchemy.tuple_(*columns) < sqlalchemy.tuple_(
+            *(_bind(value, column) for value, column in zip(values, columns))
+        ))
+    return query.order_by(*(column.desc() for column in columns)).limit(limit)
+
+
+def next_cursor(rows: Sequence[Any], keys: Sequence[str], limit: int) -> Optional[str]:
+    """Cursor of the next page, or None when this page came back short"""
+    if rows and len(rows) >= limit:
+        last = rows[-1]
+        return encode_cursor([last[key] for key in keys])
+    return None
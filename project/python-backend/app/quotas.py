@@ -0,0 +1,63 @@
+import math
+from typing import Dict
+
+from decouple import config
+from fastapi import Depends, HTTPException, Response
+
+from app.auth import get_current_active_user
+from app.services.rate_limiter import GCRALimiter, RateLimitResult, create_store
+
+RATE_LIMIT_HEADERS = ["RateLimit-Limit", "RateLimit-Remaining", "RateLimit-Reset", "RateLimit-Policy"]
+
+# Per-user budgets for routes backed by paid upstream capacity. Routes declare
+# a cost in units; RATE_LIMIT_STORE_PATH shares the budgets across workers.
+quota_store = create_store(
+    config("RATE_LIMIT_STORE_PATH", default="") or None,
+    config("QUOTA_MAX_USERS", default=100000, cast=int),
+)
+quota_limiters: Dict[str, GCRALimiter] = {
+    "maps": GCRALimiter(
+        config("MAPS_QUOTA_UNITS", default=600, cast=int),
+        config("MAPS_QUOTA_PERIOD", default=3600, cast=float),
+        quota_store,
+    ),
+}
+
+
+def rate_limit_headers(limiter: GCRALimiter, result: RateLimitResult) -> Dict[str, str]:
+    return {
+        "RateLimit-Limit": str(result.limit),
+        "RateLimit-Remaining": str(result.remaining),
+        "RateLimit-Reset": str(math.ceil(result.reset_after)),
+        "RateLimit-Policy": f"{limiter.limit};w={int(limiter.period)}",
+    }
+
+
+async def charge_quota(bucket: str, user_id: str, response: Response, cost: int = 1):
+    """Charge `cost` units of the user's `bucket` budget; 429 when it is spent.
+
+    Call it from the handler, after any cache lookup, where only some requests
+    reach the paid upstream.
+    """
+    limiter = quota_limiters[bucket]
+    result = await limiter.check(f"{bucket}:{user_id}", cost)
+    headers = rate_limit_headers(limiter, result)
+    if not result.allowed:
+        raise HTTPException(
+            status_code=429,
+            detail=f"{bucket.capitalize()} quota exceeded",
+            headers={**headers, "Retry-After": str(max(1, math.ceil(result.retry_after)))},
+        )
+    response.headers.update(headers)
+
+
+def require_quota(bucket: str, cost: int = 1):
+    """Dependency charging `cost` units of the user's `bucket` budget on every call; resolves to the user"""
+    if bucket not in quota_limiters:
+        raise ValueError(f"Unknown quota bucket: {bucket}")
+
+    async def charge(response: Response, current_user = Depends(get_current_active_user)):
+        await charge_quota(bucket, current_user.id, response, cost)
+        return current_user
+
+    return charge
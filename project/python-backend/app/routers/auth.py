@@ -1,38 +1,46 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.responses import RedirectResponse
-from authlib.integrations.starlette_client import OAuth
 from starlette.requests import Request
 from decouple import config
 from datetime import timedelta
 
-from app.auth import create_access_token, create_user, get_user_by_email, get_user_by_google_id, ACCESS_TOKEN_EXPIRE_MINUTES
+from app.auth import create_access_token, create_user, get_current_active_user, get_user_by_email, get_user_by_google_id, ACCESS_TOKEN_EXPIRE_MINUTES
 from app.models import Token, UserCreate
 
 router = APIRouter()
 
-# OAuth setup
-oauth = OAuth()
-oauth.register(
-    name='google',
-    client_id=config('GOOGLE_CLIENT_ID'),
-    client_secret=config('GOOGLE_CLIENT_SECRET'),
-    server_metadata_url='https://accounts.google.com/.well-known/openid_configuration',
-    client_kwargs={
-        'scope': 'openid email profile'
-    }
-)
+_oauth = None
+
+def get_oauth():
+    """OAuth registry, built on first use so imports stay light and keys are only needed here"""
+    global _oauth
+    if _oauth is None:
+        from authlib.integrations.starlette_client import OAuth
+
+        oauth = OAuth()
+        oauth.register(
+            name='google',
+            client_id=config('GOOGLE_CLIENT_ID'),
+            client_secret=config('GOOGLE_CLIENT_SECRET'),
+            server_metadata_url='https://accounts.google.com/.well-known/openid_configuration',
+            client_kwargs={
+                'scope': 'openid email profile'
+            }
+        )
+        _oauth = oauth
+    return _oauth
 
 @router.get("/google")
 async def google_auth(request: Request):
     """Initiate Google OAuth flow"""
     redirect_uri = config('GOOGLE_REDIRECT_URI')
-    return await oauth.google.authorize_redirect(request, redirect_uri)
+    return await get_oauth().google.authorize_redirect(request, redirect_uri)
 
 @router.get("/google/callback")
 async def google_callback(request: Request):
     """Handle Google OAuth callback"""
     try:
-        token = await oauth.google.authorize_access_token(request)
+        token = await get_oauth().google.authorize_access_token(request)
         user_info = token.get('userinfo')
         
         if not user_info:
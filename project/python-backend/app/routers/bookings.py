@@ -1,20 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from typing import List, Optional
 import uuid
+import sqlalchemy
 
 from app.database import database, bookings_table
 from app.models import Booking, BookingCreate
-from app.auth import get_current_active_user
+from app.auth import get_current_active_user, get_current_writer, get_user_reader
+from app.data_access import insert_row, update_row
+from app.pagination import NEXT_CURSOR_HEADER, keyset_page, next_cursor
+from app.serialization import RowProjection, json_response
+from app.services import user_stats
 
 router = APIRouter()
 
+# Newest first, row id as tie-breaker; backed by ix_bookings_user_created_id
+PAGE_KEY = [bookings_table.c.created_at, bookings_table.c.id]
+
+booking_rows = RowProjection(Booking, bookings_table)
+
 @router.get("/", response_model=List[Booking])
 async def get_user_bookings(
     current_user = Depends(get_current_active_user),
+    reader = Depends(get_user_reader),
     booking_type: Optional[str] = None,
     status: Optional[str] = None,
     skip: int = 0,
-    limit: int = 10
+    limit: int = 10,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page; replaces skip")
 ):
     """Get user's bookings"""
     query = bookings_table.select().where(bookings_table.c.user_id == current_user.id)
@@ -25,15 +37,18 @@ async def get_user_bookings(
     if status:
         query = query.where(bookings_table.c.status == status)
     
-    query = query.order_by(bookings_table.c.created_at.desc()).offset(skip).limit(limit)
+    query = keyset_page(query, PAGE_KEY, cursor, limit)
+    if not cursor:
+        query = query.offset(skip)
     
-    bookings = await database.fetch_all(query)
-    return [Booking(**dict(booking)) for booking in bookings]
+    bookings = await reader.fetch_all(query)
+    page_cursor = next_cursor(bookings, ["created_at", "id"], limit)
+    return json_response(booking_rows.many(bookings), {NEXT_CURSOR_HEADER: page_cursor} if page_cursor else None)
 
 @router.post("/", response_model=Booking)
 async def create_booking(
     booking: BookingCreate,
-    current_user = Depends(get_current_active_user)
+    current_user = Depends(get_current_writer)
 ):
     """Create new booking"""
     booking_id = str(uuid.uuid4())
@@ -41,20 +56,16 @@ async def create_booking(
     booking_data["id"] = booking_id
     booking_data["user_id"] = current_user.id
     
-    query = bookings_table.insert().values(**booking_data)
-    await database.execute(query)
-    
-    # Fetch the created booking
-    created_booking = await database.fetch_one(
-        bookings_table.select().where(bookings_table.c.id == booking_id)
-    )
-    
-    return Booking(**dict(created_booking))
+    async with database.transaction():
+        created_booking = await insert_row(bookings_table, booking_data)
+        await user_stats.record_change("bookings", current_user.id, after=created_booking)
+    return json_response(booking_rows.one(created_booking))
 
 @router.get("/{booking_id}", response_model=Booking)
 async def get_booking(
     booking_id: str,
-    current_user = Depends(get_current_active_user)
+    current_user = Depends(get_current_active_user),
+    reader = Depends(get_user_reader)
 ):
     """Get single booking"""
     query = bookings_table.select().where(
@@ -62,7 +73,7 @@ async def get_booking(
         bookings_table.c.user_id == current_user.id
     )
     
-    booking = await database.fetch_one(query)
+    booking = await reader.fetch_one(query)
     if not booking:
         raise HTTPException(status_code=404, detail="Booking not found")
     
@@ -71,27 +82,42 @@ async def get_booking(
 @router.put("/{booking_id}/cancel")
 async def cancel_booking(
     booking_id: str,
-    current_user = Depends(get_current_active_user)
+    current_user = Depends(get_current_writer)
 ):
     """Cancel booking"""
-    # Check if booking exists and belongs to user
-    existing_booking = await database.fetch_one(
-        bookings_table.select().where(
-            bookings_table.c.id == booking_id,
-            bookings_table.c.user_id == current_user.id
-        )
-    )
+    owned = [bookings_table.c.id == booking_id, bookings_table.c.user_id == current_user.id]
     
-    if not existing_booking:
-        raise HTTPException(status_code=404, detail="Booking not found")
+    # Ownership and the status check are part of the conditional UPDATE. A
+    # confirmed booking also leaves the stats rollup, so it is tried first:
+    # whichever UPDATE matches tells us the previous status without a read.
+    async with database.transaction():
+        cancelled_booking = await update_row(
+            bookings_table, [*owned, bookings_table.c.status == "confirmed"], {"status": "cancelled"}
+        )
+        if cancelled_booking:
+            await user_stats.record_change(
+                "bookings",
+                current_user.id,
+                before={**dict(cancelled_booking), "status": "confirmed"},
+                after=cancelled_booking,
+            )
+        else:
+            cancelled_booking = await update_row(
+                bookings_table,
+                [
+                    *owned,
+                    sqlalchemy.or_(
+                        bookings_table.c.status.is_(None),
+                        bookings_table.c.status.notin_(["cancelled", "completed"]),
+                    ),
+                ],
+                {"status": "cancelled"},
+            )
     
-    if existing_booking["status"] in ["cancelled", "completed"]:
+    if not cancelled_booking:
+        # Only the failure path pays for a second query, to pick the right error
+        if not await database.fetch_one(bookings_table.select().where(*owned)):
+            raise HTTPException(status_code=404, detail="Booking not found")
         raise HTTPException(status_code=400, detail="Booking cannot be cancelled")
     
-    # Update booking status
-    query = bookings_table.update().where(bookings_table.c.id == booking_id).values(
-        status="cancelled"
-    )
-    await database.execute(query)
-    
     return {"message": "Booking cancelled successfully"}
\ No newline at end of file
@@ -1,15 +1,56 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from typing import Optional, List
 import uuid
 
-from app.database import database, destinations_table
-from app.models import Destination, DestinationCreate
-from app.auth import get_current_active_user
+from app.database import database, destinations_table, read_router
+from app.models import ClimateMatch, Destination, DestinationClimate, DestinationCreate
+from app.auth import get_current_writer
+from app.data_access import INTEGRITY_ERRORS, insert_row, is_unique_violation
+from app.pagination import NEXT_CURSOR_HEADER, decode_cursor, keyset_page, next_cursor
+from app.serialization import RowProjection, json_response
+from app.services import catalog
+from app.services.listing_cache import listing_response, serialize_listing
+from app.services.search import apply_full_text_search
 
 router = APIRouter()
 
+# Listing order, row id as tie-breaker; backed by ix_destinations_active_rating_id
+PAGE_KEY = [destinations_table.c.avg_rating, destinations_table.c.id]
+
+destination_rows = RowProjection(Destination, destinations_table)
+
+# Bitmap candidates beyond this are not sent as one IN list; the SQL-filtered
+# rows are read in batches of FILTER_BATCH and checked against them instead
+MAX_CANDIDATE_IDS = 500
+FILTER_BATCH = 200
+
+async def _fetch_candidates(query, candidates, skip: int, limit: int):
+    """Rows `skip` to `skip + limit` of an ordered query among those whose id is in candidates"""
+    reader = read_router.pick()
+    batch = max(FILTER_BATCH, limit)
+    rows, offset = [], 0
+    while True:
+        fetched = await reader.fetch_all(query.offset(offset).limit(batch))
+        for row in fetched:
+            if row["id"] not in candidates:
+                continue
+            if skip:
+                skip -= 1
+                continue
+            rows.append(row)
+            if len(rows) == limit:
+                return rows
+        if len(fetched) < batch:
+            return rows
+        offset += batch
+
+def _page(rows, limit: int):
+    page_cursor = next_cursor(rows, ["avg_rating", "id"], limit)
+    return destination_rows.many(rows), {NEXT_CURSOR_HEADER: page_cursor} if page_cursor else None
+
 @router.get("/", response_model=List[Destination])
 async def get_destinations(
+    request: Request,
     skip: int = 0,
     limit: int = 20,
     search: Optional[str] = None,
@@ -17,17 +58,54 @@ async def get_destinations(
     continent: Optional[str] = None,
     min_rating: Optional[float] = None,
     max_price: Optional[float] = None,
-    categories: Optional[str] = Query(None, description="Comma-separated activity categories")
+    categories: Optional[str] = Query(None, description="Comma-separated activity categories"),
+    category_mode: str = Query("all", pattern="^(all|any)$", description="Match all or any of the categories"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page; replaces skip")
 ):
     """Get destinations with filtering"""
+    if cursor and search:
+        raise HTTPException(status_code=400, detail="Search results are ranked by relevance; page them with skip")
+
     query = destinations_table.select().where(destinations_table.c.is_active == True)
+
+    category_list = [category.strip() for category in categories.split(",") if category.strip()] if categories else []
+    candidates = None
+    if not (search or country or continent or min_rating or max_price or category_list or cursor or skip):
+        # The unfiltered first page is the homepage listing; serve it pre-serialized
+        async def build():
+            # From the primary: a lagging replica would cache the listing a write just invalidated
+            rows = await database.fetch_all(keyset_page(query, PAGE_KEY, None, limit))
+            return serialize_listing(*_page(rows, limit))
+
+        return listing_response(request, await catalog.destination_listings.get(f"top:{limit}", build))
+
+    if category_list or continent:
+        # Category, continent and price filters are answered by the bitmap index
+        bitmaps = catalog.destination_bitmaps
+        bitmap = bitmaps.match(category_list, category_mode == "all", continent, max_price)
+        if not search and not country:
+            after = tuple(decode_cursor(cursor, PAGE_KEY)) if cursor else None
+            page_ids = bitmaps.top_ids(bitmap, 0 if cursor else skip, limit, min_rating, max_price, after)
+            if not page_ids:
+                return []
+            rows = await read_router.pick().fetch_all(
+                query.where(destinations_table.c.id.in_(page_ids))
+            )
+            by_id = {row["id"]: row for row in rows}
+            return json_response(*_page([by_id[id] for id in page_ids if id in by_id], limit))
+
+        candidate_ids = bitmaps.ids(bitmap, min_rating, max_price)
+        if not candidate_ids:
+            return []
+        if len(candidate_ids) <= MAX_CANDIDATE_IDS:
+            query = query.where(destinations_table.c.id.in_(candidate_ids))
+        else:
+            candidates = set(candidate_ids)
+        continent = None
     
     if search:
-        query = query.where(
-            destinations_table.c.name.ilike(f"%{search}%") |
-            destinations_table.c.city.ilike(f"%{search}%") |
-            destinations_table.c.country.ilike(f"%{search}%")
-        )
+        # Ranked by relevance first, rating breaks ties
+        query = apply_full_text_search(query, search)
     
     if country:
         query = query.where(destinations_table.c.country.ilike(f"%{country}%"))
@@ -41,23 +119,45 @@ async def get_destinations(
     if max_price:
         query = query.where(destinations_table.c.average_price <= max_price)
     
-    # Add category filtering logic here if needed
-    
-    query = query.order_by(destinations_table.c.avg_rating.desc()).offset(skip).limit(limit)
-    
-    destinations = await database.fetch_all(query)
-    return [Destination(**dict(dest)) for dest in destinations]
+    if search:
+        query = query.order_by(*(column.desc() for column in PAGE_KEY))
+        if candidates is not None:
+            destinations = await _fetch_candidates(query, candidates, skip, limit)
+        else:
+            destinations = await read_router.pick().fetch_all(query.offset(skip).limit(limit))
+        return json_response(destination_rows.many(destinations))
+
+    query = keyset_page(query, PAGE_KEY, cursor, limit)
+    if candidates is not None:
+        destinations = await _fetch_candidates(query, candidates, 0 if cursor else skip, limit)
+    else:
+        if not cursor:
+            query = query.offset(skip)
+        destinations = await read_router.pick().fetch_all(query)
+    return json_response(*_page(destinations, limit))
 
 @router.get("/featured", response_model=List[Destination])
-async def get_featured_destinations():
+async def get_featured_destinations(request: Request):
     """Get featured destinations"""
-    query = destinations_table.select().where(
-        destinations_table.c.is_featured == True,
-        destinations_table.c.is_active == True
-    ).order_by(destinations_table.c.avg_rating.desc()).limit(8)
-    
-    destinations = await database.fetch_all(query)
-    return [Destination(**dict(dest)) for dest in destinations]
+    async def build():
+        query = destinations_table.select().where(
+            destinations_table.c.is_featured == True,
+            destinations_table.c.is_active == True
+        ).order_by(destinations_table.c.avg_rating.desc()).limit(8)
+
+        # From the primary, like the homepage listing
+        destinations = await database.fetch_all(query)
+        return serialize_listing(destination_rows.many(destinations))
+
+    return listing_response(request, await catalog.destination_listings.get("featured", build))
+
+@router.get("/autocomplete")
+async def autocomplete_destinations(
+    q: str = Query(..., min_length=1, description="Typed prefix"),
+    limit: int = Query(10, ge=1, le=10, description="Maximum number of suggestions")
+):
+    """Typeahead suggestions for destination names, cities and countries"""
+    return catalog.destination_autocomplete.complete(q, limit)
 
 @router.get("/{destination_id}", response_model=Destination)
 async def get_destination(destination_id: str):
@@ -67,16 +167,16 @@ async def get_destination(destination_id: str):
         destinations_table.c.is_active == True
     )
     
-    destination = await database.fetch_one(query)
+    destination = await read_router.pick().fetch_one(query)
     if not destination:
         raise HTTPException(status_code=404, detail="Destination not found")
     
-    return Destination(**dict(destination))
+    return json_response(destination_rows.one(destination))
 
 @router.post("/", response_model=Destination)
 async def create_destination(
     destination: DestinationCreate,
-    current_user = Depends(get_current_active_user)
+    current_user = Depends(get_current_writer)
 ):
     """Create new destination (admin only)"""
     destination_id = str(uuid.uuid4())
@@ -87,10 +187,15 @@ async def create_destination(
     if not destination_data.get("image_url"):
         destination_data["image_url"] = f"https://images.pexels.com/photos/{hash(destination.name) % 1000000}/pexels-photo-{hash(destination.name) % 1000000}.jpeg?auto=compress&cs=tinysrgb&w=800"
     
-    query = destinations_table.insert().values(**destination_data)
-    await database.execute(query)
+    try:
+        created_destination = await insert_row(destinations_table, destination_data)
+    except INTEGRITY_ERRORS as error:
+        if not is_unique_violation(error):
+            raise
+        raise HTTPException(status_code=409, detail="Destination already exists")
+    catalog.index_destination(dict(created_destination))
     
-    return Destination(**destination_data)
+    return json_response(destination_rows.one(created_destination))
 
 @router.get("/search/nearby")
 async def search_nearby_destinations(
@@ -100,18 +205,56 @@ async def search_nearby_destinations(
     limit: int = Query(20, description="Maximum number of results")
 ):
     """Search destinations near coordinates"""
-    # Simple distance calculation (for production, use PostGIS or similar)
-    query = f"""
-    SELECT *, 
-           (6371 * acos(cos(radians({lat})) * cos(radians(latitude)) * 
-           cos(radians(longitude) - radians({lng})) + sin(radians({lat})) * 
-           sin(radians(latitude)))) AS distance
-    FROM destinations 
-    WHERE is_active = true
-    HAVING distance <= {radius}
-    ORDER BY distance
-    LIMIT {limit}
-    """
-    
-    destinations = await database.fetch_all(query)
-    return [dict(dest) for dest in destinations]
\ No newline at end of file
+    matches = catalog.destination_spatial_index.query(lat, lng, k=limit, radius_km=radius)
+    if not matches:
+        return []
+    
+    query = destinations_table.select().where(
+        destinations_table.c.id.in_([destination_id for destination_id, _ in matches]),
+        destinations_table.c.is_active == True
+    )
+    
+    destinations = {dest["id"]: dest for dest in await read_router.pick().fetch_all(query)}
+    return json_response([
+        {**destination_rows.one(destinations[destination_id]), "distance": distance}
+        for destination_id, distance in matches
+        if destination_id in destinations
+    ])
+
+@router.get("/search/climate", response_model=List[ClimateMatch])
+async def search_destinations_by_climate(
+    month: int = Query(..., ge=1, le=12, description="Month of travel, 1 = January"),
+    min_temp: Optional[float] = Query(None, description="Lowest acceptable mean temperature in °C"),
+    max_temp: Optional[float] = Query(None, description="Highest acceptable mean temperature in °C"),
+    max_rainfall: Optional[float] = Query(None, ge=0, description="Most rainfall in mm that month"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100)
+):
+    """Destinations with the wanted weather in a month, best rated first"""
+    if min_temp is not None and max_temp is not None and min_temp > max_temp:
+        raise HTTPException(status_code=400, detail="min_temp must not exceed max_temp")
+    
+    matches = catalog.destination_climate.search(month, min_temp, max_temp, max_rainfall, limit, skip)
+    if not matches:
+        return []
+    
+    query = destinations_table.select().where(
+        destinations_table.c.id.in_([destination_id for destination_id, _, _ in matches]),
+        destinations_table.c.is_active == True
+    )
+    
+    destinations = {dest["id"]: dest for dest in await read_router.pick().fetch_all(query)}
+    return json_response([
+        {**destination_rows.one(destinations[destination_id]), "month_temperature": temperature, "month_rainfall": rainfall}
+        for destination_id, temperature, rainfall in matches
+        if destination_id in destinations
+    ])
+
+@router.get("/{destination_id}/climate", response_model=DestinationClimate)
+async def get_destination_climate(destination_id: str):
+    """Monthly temperature and rainfall of a destination"""
+    climate = catalog.destination_climate.get(destination_id)
+    if not climate:
+        raise HTTPException(status_code=404, detail="No climate data for this destination")
+    
+    return json_response(climate)
@@ -1,28 +1,53 @@
-from fastapi import APIRouter, Depends, HTTPException
-from googlemaps import Client as GoogleMapsClient
+from fastapi import APIRouter, Depends, HTTPException, Response
 from decouple import config
 from typing import List, Optional
 
 from app.models import LocationSearch, PlaceDetails, DirectionsRequest
 from app.auth import get_current_active_user
+from app.quotas import charge_quota, require_quota
+from app.services.cache import TieredCache
+from app.services.maps_client import get_maps_client
+from app.services.singleflight import SingleFlight, make_key
+from app.services.spatial_cache import SpatialCache
 
 router = APIRouter()
 
-# Initialize Google Maps client
-gmaps = GoogleMapsClient(key=config("GOOGLE_MAPS_API_KEY"))
+# Response cache for geocoding and place details lookups
+maps_cache = TieredCache(
+    maxsize=int(config("MAPS_CACHE_MAX_ENTRIES", default="10000")),
+    ttl=float(config("MAPS_CACHE_TTL", default="86400")),
+    path=config("MAPS_CACHE_PATH", default="") or None,
+)
+
+# Reverse geocoding answers are shared between nearby coordinates
+reverse_geocode_cache = SpatialCache(
+    precision=int(config("REVERSE_GEOCODE_GEOHASH_PRECISION", default="7")),
+    tolerance_m=float(config("REVERSE_GEOCODE_TOLERANCE_M", default="50")),
+    maxsize=int(config("MAPS_CACHE_MAX_ENTRIES", default="10000")),
+    ttl=float(config("MAPS_CACHE_TTL", default="86400")),
+)
+
+# Concurrent identical upstream calls share one in-flight request
+maps_flight = SingleFlight()
+
+def _normalize_address(address: str) -> str:
+    return " ".join(address.lower().split())
 
 @router.post("/search-places")
 async def search_places(
     search: LocationSearch,
-    current_user = Depends(get_current_active_user)
+    current_user = Depends(require_quota("maps", cost=5))
 ):
     """Search for places using Google Places API"""
     try:
         # Perform place search
-        places_result = gmaps.places(
-            query=search.query,
-            location=search.location_bias,
-            radius=50000  # 50km radius
+        places_result = await maps_flight.do(
+            make_key("places", search),
+            lambda: get_maps_client().places(
+                query=search.query,
+                location=search.location_bias,
+                radius=50000  # 50km radius
+            )
         )
         
         # Format results
@@ -50,19 +75,26 @@ async def search_places(
 @router.get("/place-details/{place_id}")
 async def get_place_details(
     place_id: str,
+    response: Response,
     current_user = Depends(get_current_active_user)
 ):
     """Get detailed information about a specific place"""
+    cache_key = f"place:{place_id}"
+    cached = await maps_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    await charge_quota("maps", current_user.id, response, cost=2)
+
     try:
         # Get place details
-        place_details = gmaps.place(
+        place_details = await maps_flight.do(cache_key, lambda: get_maps_client().place(
             place_id=place_id,
             fields=[
                 'name', 'formatted_address', 'international_phone_number',
                 'website', 'rating', 'reviews', 'opening_hours', 'price_level',
                 'photos', 'geometry', 'types', 'url'
             ]
-        )
+        ))
         
         result = place_details['result']
         
@@ -91,6 +123,7 @@ async def get_place_details(
             'google_url': result.get('url')
         }
         
+        await maps_cache.set(cache_key, formatted_result)
         return formatted_result
         
     except Exception as e:
@@ -99,17 +132,20 @@ async def get_place_details(
 @router.post("/directions")
 async def get_directions(
     directions: DirectionsRequest,
-    current_user = Depends(get_current_active_user)
+    current_user = Depends(require_quota("maps", cost=5))
 ):
     """Get directions between locations"""
     try:
         # Get directions
-        directions_result = gmaps.directions(
-            origin=directions.origin,
-            destination=directions.destination,
-            waypoints=directions.waypoints,
-            mode=directions.travel_mode,
-            alternatives=True
+        directions_result = await maps_flight.do(
+            make_key("directions", directions),
+            lambda: get_maps_client().directions(
+                origin=directions.origin,
+                destination=directions.destination,
+                waypoints=directions.waypoints,
+                mode=directions.travel_mode,
+                alternatives=True
+            )
         )
         
         if not directions_result:
@@ -157,7 +193,7 @@ async def get_directions(
 async def get_place_photo(
     photo_reference: str,
     max_width: int = 400,
-    current_user = Depends(get_current_active_user)
+    current_user = Depends(require_quota("maps", cost=1))
 ):
     """Get place photo URL"""
     try:
@@ -176,24 +212,34 @@ async def get_place_photo(
 @router.post("/geocode")
 async def geocode_address(
     address: str,
+    response: Response,
     current_user = Depends(get_current_active_user)
 ):
     """Convert address to coordinates"""
+    cache_key = f"geocode:{_normalize_address(address)}"
+    cached = await maps_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    await charge_quota("maps", current_user.id, response, cost=1)
+
     try:
-        geocode_result = gmaps.geocode(address)
+        geocode_result = await maps_flight.do(cache_key, lambda: get_maps_client().geocode(address))
         
         if not geocode_result:
             raise HTTPException(status_code=404, detail="Address not found")
         
         result = geocode_result[0]
         
-        return {
+        formatted_result = {
             'address': result['formatted_address'],
             'location': result['geometry']['location'],
             'place_id': result['place_id'],
             'types': result['types']
         }
         
+        await maps_cache.set(cache_key, formatted_result)
+        return formatted_result
+        
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Maps API error: {str(e)}")
 
@@ -201,23 +247,51 @@ async def geocode_address(
 async def reverse_geocode(
     lat: float,
     lng: float,
+    response: Response,
     current_user = Depends(get_current_active_user)
 ):
     """Convert coordinates to address"""
+    nearby = reverse_geocode_cache.get(lat, lng)
+    if nearby is not None:
+        return {**nearby, 'location': {'lat': lat, 'lng': lng}}
+
+    cache_key = f"reverse:{lat},{lng}"
+    cached = await maps_cache.get(cache_key)
+    if cached is not None:
+        reverse_geocode_cache.set(lat, lng, cached)
+        return cached
+    await charge_quota("maps", current_user.id, response, cost=1)
+
     try:
-        reverse_geocode_result = gmaps.reverse_geocode((lat, lng))
+        reverse_geocode_result = await maps_flight.do(
+            cache_key, lambda: get_maps_client().reverse_geocode((lat, lng))
+        )
         
         if not reverse_geocode_result:
             raise HTTPException(status_code=404, detail="Location not found")
         
         result = reverse_geocode_result[0]
         
-        return {
+        formatted_result = {
             'address': result['formatted_address'],
             'location': {'lat': lat, 'lng': lng},
             'place_id': result['place_id'],
             'types': result['types']
         }
         
+        reverse_geocode_cache.set(lat, lng, formatted_result)
+        await maps_cache.set(cache_key, formatted_result)
+        return formatted_result
+        
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Maps API error: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Maps API error: {str(e)}")
+
+@router.get("/cache-stats")
+async def get_cache_stats(current_user = Depends(get_current_active_user)):
+    """Get hit/miss/eviction counters for the maps response cache"""
+    return {**maps_cache.stats(), "reverse_geocode_spatial": reverse_geocode_cache.stats_dict()}
+
+@router.get("/coalescing-stats")
+async def get_coalescing_stats(current_user = Depends(get_current_active_user)):
+    """Get counters for upstream calls shared between identical in-flight requests"""
+    return maps_flight.stats()
\ No newline at end of file
@@ -1,19 +1,52 @@
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List, Optional
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query
+from pydantic import ValidationError
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+import copy
 import uuid
+import orjson
+import sqlalchemy
 
-from app.database import database, trips_table
-from app.models import Trip, TripCreate, TripUpdate
-from app.auth import get_current_active_user
+from app.database import database, trips_table, trip_stops_table, destinations_table
+from app.models import Trip, TripCreate, TripDetail, TripStop, TripStopCreate, TripStopMove, TripUpdate
+from app.auth import get_current_active_user, get_current_writer, get_user_reader
+from app import json_patch
+from app.data_access import delete_row, fetch_for_update, insert_row, update_row
+from app.pagination import NEXT_CURSOR_HEADER, keyset_page, next_cursor
+from app.serialization import RowProjection, dumps, json_response
+from app.services import catalog, user_stats
+from app.services.distance import leg_distances
 
 router = APIRouter()
 
+# Newest first, row id as tie-breaker; backed by ix_trips_user_created_id
+PAGE_KEY = [trips_table.c.created_at, trips_table.c.id]
+
+trip_rows = RowProjection(Trip, trips_table)
+stop_rows = RowProjection(TripStop, trip_stops_table)
+
+# Closest two neighbouring sequence_orders may get before a move renumbers the trip
+MIN_ORDER_GAP = 1e-6
+
+# Trip columns a JSON Patch may set; /version may only be tested
+PATCH_FIELDS = {
+    "title", "description", "start_date", "end_date", "traveler_count",
+    "total_budget", "currency", "status", "privacy_level", "ai_suggestions",
+}
+NULLABLE_FIELDS = {"description", "ai_suggestions"}
+STOP_FIELDS = set(TripStopCreate.__fields__)
+
+# Trip columns rolled up into user_stats
+STATS_FIELDS = {"status", "total_budget"}
+
 @router.get("/", response_model=List[Trip])
 async def get_user_trips(
     current_user = Depends(get_current_active_user),
+    reader = Depends(get_user_reader),
     status: Optional[str] = None,
+    destination_id: Optional[str] = Query(None, description="Only trips with a stop at this destination"),
     skip: int = 0,
-    limit: int = 10
+    limit: int = 10,
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page; replaces skip")
 ):
     """Get user's trips"""
     query = trips_table.select().where(trips_table.c.user_id == current_user.id)
@@ -21,40 +54,53 @@ async def get_user_trips(
     if status:
         query = query.where(trips_table.c.status == status)
     
-    query = query.order_by(trips_table.c.created_at.desc()).offset(skip).limit(limit)
+    if destination_id:
+        # Backed by ix_trip_stops_destination_trip
+        query = query.where(trips_table.c.id.in_(
+            sqlalchemy.select(trip_stops_table.c.trip_id).where(trip_stops_table.c.destination_id == destination_id)
+        ))
+    
+    query = keyset_page(query, PAGE_KEY, cursor, limit)
+    if not cursor:
+        query = query.offset(skip)
     
-    trips = await database.fetch_all(query)
-    return [Trip(**dict(trip)) for trip in trips]
+    trips = await reader.fetch_all(query)
+    page_cursor = next_cursor(trips, ["created_at", "id"], limit)
+    return json_response(trip_rows.many(trips), {NEXT_CURSOR_HEADER: page_cursor} if page_cursor else None)
 
-@router.post("/", response_model=Trip)
+@router.post("/", response_model=TripDetail)
 async def create_trip(
     trip: TripCreate,
-    current_user = Depends(get_current_active_user)
+    current_user = Depends(get_current_writer)
 ):
     """Create new trip"""
     trip_id = str(uuid.uuid4())
     trip_data = trip.dict()
+    stops = trip_data.pop("stops")
     trip_data["id"] = trip_id
     trip_data["user_id"] = current_user.id
     
     # Validate dates
     if trip_data["end_date"] <= trip_data["start_date"]:
         raise HTTPException(status_code=400, detail="End date must be after start date")
+    await _check_destinations(stop["destination_id"] for stop in stops)
     
-    query = trips_table.insert().values(**trip_data)
-    await database.execute(query)
-    
-    # Fetch the created trip
-    created_trip = await database.fetch_one(
-        trips_table.select().where(trips_table.c.id == trip_id)
-    )
-    
-    return Trip(**dict(created_trip))
+    async with database.transaction():
+        created_trip = await insert_row(trips_table, trip_data)
+        stops = [
+            {**stop, "id": str(uuid.uuid4()), "trip_id": trip_id, "sequence_order": float(order)}
+            for order, stop in enumerate(stops, start=1)
+        ]
+        if stops:
+            await database.execute_many(trip_stops_table.insert(), stops)
+        await user_stats.record_change("trips", current_user.id, after=created_trip)
+    return json_response({**trip_rows.one(created_trip), "stops": stop_rows.many(stops)})
 
-@router.get("/{trip_id}", response_model=Trip)
+@router.get("/{trip_id}", response_model=TripDetail)
 async def get_trip(
     trip_id: str,
-    current_user = Depends(get_current_active_user)
+    current_user = Depends(get_current_active_user),
+    reader = Depends(get_user_reader)
 ):
     """Get single trip"""
     query = trips_table.select().where(
@@ -62,92 +108,602 @@ async def get_trip(
         trips_table.c.user_id == current_user.id
     )
     
-    trip = await database.fetch_one(query)
+    trip = await reader.fetch_one(query)
     if not trip:
         raise HTTPException(status_code=404, detail="Trip not found")
     
-    return Trip(**dict(trip))
+    stops = await reader.fetch_all(_ordered_stops(trip_id))
+    return json_response({**trip_rows.one(trip), "stops": stop_rows.many(stops)}, {"ETag": f'"{trip["version"]}"'})
 
 @router.put("/{trip_id}", response_model=Trip)
 async def update_trip(
     trip_id: str,
     trip_update: TripUpdate,
-    current_user = Depends(get_current_active_user)
+    current_user = Depends(get_current_writer)
 ):
     """Update trip"""
-    # Check if trip exists and belongs to user
-    existing_trip = await database.fetch_one(
-        trips_table.select().where(
-            trips_table.c.id == trip_id,
-            trips_table.c.user_id == current_user.id
-        )
-    )
-    
-    if not existing_trip:
-        raise HTTPException(status_code=404, detail="Trip not found")
+    # Ownership is part of the WHERE clause; no match means not found
+    owned = [trips_table.c.id == trip_id, trips_table.c.user_id == current_user.id]
     
     # Update only provided fields
     update_data = {k: v for k, v in trip_update.dict().items() if v is not None}
-    
     if update_data:
-        query = trips_table.update().where(trips_table.c.id == trip_id).values(**update_data)
-        await database.execute(query)
+        update_data["version"] = trips_table.c.version + 1
     
-    # Fetch updated trip
-    updated_trip = await database.fetch_one(
-        trips_table.select().where(trips_table.c.id == trip_id)
-    )
+    if not update_data:
+        updated_trip = await database.fetch_one(trips_table.select().where(*owned))
+    elif update_data.keys().isdisjoint(STATS_FIELDS):
+        updated_trip = await update_row(trips_table, owned, update_data)
+    else:
+        # The rollup needs the previous status and budget
+        async with database.transaction():
+            previous_trip = await fetch_for_update(trips_table, owned)
+            updated_trip = await update_row(trips_table, owned, update_data) if previous_trip else None
+            if updated_trip:
+                await user_stats.record_change("trips", current_user.id, before=previous_trip, after=updated_trip)
+    
+    if not updated_trip:
+        raise HTTPException(status_code=404, detail="Trip not found")
     
-    return Trip(**dict(updated_trip))
+    return json_response(trip_rows.one(updated_trip))
 
 @router.delete("/{trip_id}")
 async def delete_trip(
     trip_id: str,
-    current_user = Depends(get_current_active_user)
+    current_user = Depends(get_current_writer)
 ):
     """Delete trip"""
-    # Check if trip exists and belongs to user
-    existing_trip = await database.fetch_one(
-        trips_table.select().where(
-            trips_table.c.id == trip_id,
-            trips_table.c.user_id == current_user.id
+    async with database.transaction():
+        deleted_trip = await delete_row(
+            trips_table, [trips_table.c.id == trip_id, trips_table.c.user_id == current_user.id]
         )
-    )
+        if deleted_trip:
+            # ON DELETE CASCADE does this on PostgreSQL; SQLite leaves foreign keys unenforced
+            await database.execute(trip_stops_table.delete().where(trip_stops_table.c.trip_id == trip_id))
+            await user_stats.record_change("trips", current_user.id, before=deleted_trip)
     
-    if not existing_trip:
+    if not deleted_trip:
         raise HTTPException(status_code=404, detail="Trip not found")
     
-    query = trips_table.delete().where(trips_table.c.id == trip_id)
-    await database.execute(query)
-    
     return {"message": "Trip deleted successfully"}
 
-@router.post("/{trip_id}/destinations")
-async def add_destination_to_trip(
+def _owned_trip(trip_id: str, user_id: str):
+    """Subquery yielding trip_id only if the user owns it"""
+    return sqlalchemy.select(trips_table.c.id).where(trips_table.c.id == trip_id, trips_table.c.user_id == user_id)
+
+def _ordered_stops(trip_id: str):
+    return (
+        trip_stops_table.select()
+        .where(trip_stops_table.c.trip_id == trip_id)
+        .order_by(trip_stops_table.c.sequence_order)
+    )
+
+async def _trip_exists(reader, trip_id: str, user_id: str) -> bool:
+    return await reader.fetch_one(_owned_trip(trip_id, user_id)) is not None
+
+async def _bump_version(trip_id: str, user_id: str):
+    """Advance the version of a trip whose stops are about to change; None if the user does not own it.
+
+    Run it first in the stop write's transaction: PATCH addresses stops by
+    position, so any change to them must invalidate the trip's ETag. It also
+    locks the trip row, which serializes stop writes to one trip.
+    """
+    return await update_row(
+        trips_table,
+        [trips_table.c.id == trip_id, trips_table.c.user_id == user_id],
+        {"version": trips_table.c.version + 1},
+    )
+
+async def _check_destinations(destination_ids: Iterable[Optional[str]]):
+    """422 unless every destination a stop names exists; SQLite does not enforce the foreign key"""
+    wanted = {destination_id for destination_id in destination_ids if destination_id is not None}
+    if not wanted:
+        return
+    found = {row["id"] for row in await database.fetch_all(
+        sqlalchemy.select(destinations_table.c.id).where(destinations_table.c.id.in_(wanted))
+    )}
+    missing = wanted - found
+    if missing:
+        raise HTTPException(status_code=422, detail=f"Unknown destination: {min(missing)}")
+
+@router.get("/{trip_id}/stops", response_model=List[TripStop])
+async def get_trip_stops(
+    trip_id: str,
+    current_user = Depends(get_current_active_user),
+    reader = Depends(get_user_reader)
+):
+    """Get a trip's stops in visiting order"""
+    stops = await reader.fetch_all(
+        _ordered_stops(trip_id).where(trip_stops_table.c.trip_id.in_(_owned_trip(trip_id, current_user.id)))
+    )
+    if not stops and not await _trip_exists(reader, trip_id, current_user.id):
+        raise HTTPException(status_code=404, detail="Trip not found")
+    
+    return json_response(stop_rows.many(stops))
+
+@router.post("/{trip_id}/stops", response_model=TripStop)
+@router.post("/{trip_id}/destinations", response_model=TripStop, deprecated=True)
+async def add_trip_stop(
     trip_id: str,
-    destination_data: dict,
-    current_user = Depends(get_current_active_user)
+    stop: TripStopCreate,
+    current_user = Depends(get_current_writer)
 ):
-    """Add destination to trip"""
-    # Check if trip exists and belongs to user
-    existing_trip = await database.fetch_one(
-        trips_table.select().where(
-            trips_table.c.id == trip_id,
-            trips_table.c.user_id == current_user.id
+    """Append a stop to the end of a trip"""
+    stop_data = stop.dict()
+    await _check_destinations([stop_data["destination_id"]])
+    stops = trip_stops_table.c
+    next_order = (
+        sqlalchemy.select(sqlalchemy.func.coalesce(sqlalchemy.func.max(stops.sequence_order), 0.0) + 1)
+        .where(stops.trip_id == trip_id)
+        .scalar_subquery()
+    )
+    
+    async with database.transaction():
+        # The trip row lock keeps concurrent appends from reading the same MAX
+        if not await _bump_version(trip_id, current_user.id):
+            raise HTTPException(status_code=404, detail="Trip not found")
+        created_stop = await insert_row(
+            trip_stops_table, {**stop_data, "id": str(uuid.uuid4()), "trip_id": trip_id, "sequence_order": next_order}
         )
+    
+    return json_response(stop_rows.one(created_stop))
+
+async def _order_at(trip_id: str, stop_id: str, position: int) -> Optional[float]:
+    """sequence_order that puts a stop at `position` among the trip's other stops.
+
+    None when the neighbours are too close together to fit between.
+    """
+    stops = trip_stops_table.c
+    others = sqlalchemy.select(stops.sequence_order).where(stops.trip_id == trip_id, stops.id != stop_id)
+    if position == 0:
+        rows = await database.fetch_all(others.order_by(stops.sequence_order).limit(1))
+        before, after = 0.0, rows[0][0] if rows else None
+    else:
+        rows = await database.fetch_all(others.order_by(stops.sequence_order).offset(position - 1).limit(2))
+        if not rows:
+            # Past the end: move to last place
+            last = await database.fetch_one(sqlalchemy.select(sqlalchemy.func.max(stops.sequence_order)).where(
+                stops.trip_id == trip_id, stops.id != stop_id
+            ))
+            return (last[0] or 0.0) + 1
+        before, after = rows[0][0], rows[1][0] if len(rows) > 1 else None
+    
+    return _midpoint(before, after)
+
+def _midpoint(before: float, after: Optional[float]) -> Optional[float]:
+    """sequence_order between two neighbours (after is None at the end); None if they are too close"""
+    if after is None:
+        return before + 1
+    order = (before + after) / 2
+    if after - before < MIN_ORDER_GAP or not before < order < after:
+        return None
+    return order
+
+async def _renumber(trip_id: str):
+    """Respace a trip's stops to 1, 2, 3, ... keeping their order"""
+    stops = trip_stops_table.c
+    ids = [row["id"] for row in await database.fetch_all(
+        sqlalchemy.select(stops.id).where(stops.trip_id == trip_id).order_by(stops.sequence_order)
+    )]
+    # Orders are always positive; negating first keeps (trip_id, sequence_order) unique throughout
+    await database.execute(
+        trip_stops_table.update().where(stops.trip_id == trip_id).values(sequence_order=-stops.sequence_order)
+    )
+    await database.execute(
+        trip_stops_table.update().where(stops.trip_id == trip_id).values(
+            sequence_order=sqlalchemy.case(
+                {stop_id: float(order) for order, stop_id in enumerate(ids, start=1)}, value=stops.id
+            )
+        )
+    )
+
+@router.put("/{trip_id}/stops/{stop_id}/position", response_model=TripStop)
+async def move_trip_stop(
+    trip_id: str,
+    stop_id: str,
+    move: TripStopMove,
+    current_user = Depends(get_current_writer)
+):
+    """Move a stop to a new position; rewrites only that stop unless the trip needs respacing"""
+    owned = [trip_stops_table.c.id == stop_id, trip_stops_table.c.trip_id.in_(_owned_trip(trip_id, current_user.id))]
+    
+    async with database.transaction():
+        if not await _bump_version(trip_id, current_user.id) or not await fetch_for_update(trip_stops_table, owned):
+            raise HTTPException(status_code=404, detail="Stop not found")
+        
+        order = await _order_at(trip_id, stop_id, move.position)
+        if order is None:
+            await _renumber(trip_id)
+            order = await _order_at(trip_id, stop_id, move.position)
+        moved_stop = await update_row(trip_stops_table, owned, {"sequence_order": order})
+    
+    return json_response(stop_rows.one(moved_stop))
+
+@router.delete("/{trip_id}/stops/{stop_id}")
+async def remove_trip_stop(
+    trip_id: str,
+    stop_id: str,
+    current_user = Depends(get_current_writer)
+):
+    """Remove a stop from a trip"""
+    async with database.transaction():
+        removed_stop = None
+        if await _bump_version(trip_id, current_user.id):
+            removed_stop = await delete_row(
+                trip_stops_table, [trip_stops_table.c.id == stop_id, trip_stops_table.c.trip_id == trip_id]
+            )
+        if not removed_stop:
+            raise HTTPException(status_code=404, detail="Stop not found")
+    
+    return {"message": "Stop removed from trip successfully"}
+
+def _expected_version(if_match: Optional[str]) -> Optional[int]:
+    """Trip version an If-Match header pins, None for absent or *"""
+    if if_match is None or if_match.strip() == "*":
+        return None
+    tag = if_match.strip()
+    if tag.startswith("W/"):
+        tag = tag[2:]
+    tag = tag.strip('"')
+    if not tag.isdigit():
+        raise HTTPException(status_code=400, detail="If-Match must be a trip version ETag")
+    return int(tag)
+
+def _as_json(value: Any) -> Any:
+    """A stored value as a patch document would hold it (ISO dates, plain floats)"""
+    return orjson.loads(dumps(value))
+
+def _field_value(field: str, value: Any) -> Any:
+    """Validate a patched trip field the way PUT would"""
+    if value is None:
+        if field not in NULLABLE_FIELDS:
+            raise HTTPException(status_code=422, detail=f"{field} cannot be null")
+        return None
+    if field == "ai_suggestions":
+        if not isinstance(value, dict):
+            raise HTTPException(status_code=422, detail="ai_suggestions must be an object")
+        return value
+    try:
+        return getattr(TripUpdate(**{field: value}), field)
+    except ValidationError:
+        raise HTTPException(status_code=422, detail=f"Invalid value for {field}")
+
+def _stop_values(value: Any) -> Dict[str, Any]:
+    if not isinstance(value, dict):
+        raise HTTPException(status_code=422, detail="Invalid trip stop")
+    try:
+        return TripStopCreate(**value).dict()
+    except ValidationError:
+        raise HTTPException(status_code=422, detail="Invalid trip stop")
+
+def _check_operation(operation: json_patch.Operation):
+    """Reject operations on paths a trip does not have or does not allow"""
+    target = operation.path[0] if operation.path else None
+    if target == "version":
+        if operation.op != "test" or len(operation.path) != 1:
+            raise json_patch.invalid("/version is read-only; use it in a test operation")
+    elif target == "stops":
+        if len(operation.path) < 2 or (operation.source is not None and operation.source[:1] != ["stops"]):
+            raise json_patch.invalid("Stop operations must address /stops/<index>")
+        if operation.op != "test" and len(operation.path) > 2:
+            if len(operation.path) > 3 or operation.path[2] not in STOP_FIELDS or operation.op in ("move", "copy"):
+                raise json_patch.invalid(f"Cannot {operation.op} {json_patch.format_pointer(operation.path)}")
+        if operation.source is not None and len(operation.source) != 2:
+            raise json_patch.invalid("Only whole stops can be moved or copied")
+    elif target == "ai_suggestions" and len(operation.path) > 1:
+        if operation.source is not None and operation.source[:1] != ["ai_suggestions"]:
+            raise json_patch.invalid("move and copy must stay within /ai_suggestions")
+    elif target in PATCH_FIELDS:
+        if len(operation.path) != 1 or operation.op in ("move", "copy"):
+            raise json_patch.invalid(f"Cannot {operation.op} {json_patch.format_pointer(operation.path)}")
+    else:
+        raise json_patch.invalid(f"Cannot patch {json_patch.format_pointer(operation.path) or 'the whole trip'}")
+
+def _single_statement(operations: List[json_patch.Operation]) -> bool:
+    """Whether the patch only sets or tests trip columns, without touching the stats rollup"""
+    return all(
+        len(operation.path) == 1
+        and operation.path[0] != "stops"
+        and (operation.op == "test" or operation.path[0] not in STATS_FIELDS)
+        # JSON columns cannot be compared portably in SQL
+        and not (operation.op == "test" and operation.path[0] == "ai_suggestions")
+        for operation in operations
     )
+
+def _date_order_error(start_date, end_date) -> Optional[HTTPException]:
+    if start_date is not None and end_date is not None and end_date <= start_date:
+        return HTTPException(status_code=400, detail="End date must be after start date")
+    return None
+
+async def _patch_columns(trip_id: str, user_id: str, operations: List[json_patch.Operation], expected: Optional[int]):
+    """Apply a column-only patch as one UPDATE whose WHERE clause carries every test.
+
+    Returns the updated row and the changed fields; on no match, works out why.
+    """
+    trips = trips_table.c
+    owned = [trips.id == trip_id, trips.user_id == user_id]
+    conditions = [trips.version == expected] if expected is not None else []
+    values = {}
+    for operation in operations:
+        field = operation.path[0]
+        if operation.op == "test":
+            value = operation.value if field == "version" else _field_value(field, operation.value)
+            if field in values:
+                # Tests the value set earlier in this patch
+                if not json_patch.equal(_as_json(values[field]), _as_json(value)):
+                    raise json_patch.conflict(f"Test failed at /{field}")
+            else:
+                conditions.append(trips[field].is_(None) if value is None else trips[field] == value)
+        elif operation.op == "remove":
+            values[field] = _field_value(field, None)
+        else:
+            values[field] = _field_value(field, operation.value)
     
-    if not existing_trip:
+    # The other date comes from the row, so the ordering check goes in the WHERE clause too
+    if "start_date" in values and "end_date" in values:
+        error = _date_order_error(values["start_date"], values["end_date"])
+        if error:
+            raise error
+    elif "start_date" in values:
+        conditions.append(trips.end_date > values["start_date"])
+    elif "end_date" in values:
+        conditions.append(trips.start_date < values["end_date"])
+    
+    if values:
+        row = await update_row(trips_table, owned + conditions, {**values, "version": trips.version + 1})
+    else:
+        row = await database.fetch_one(trips_table.select().where(*owned, *conditions))
+    if row:
+        return row, set(values)
+    
+    current = await database.fetch_one(trips_table.select().where(*owned))
+    if not current:
         raise HTTPException(status_code=404, detail="Trip not found")
+    if expected is not None and current["version"] != expected:
+        raise HTTPException(status_code=412, detail="Trip was modified; fetch it again")
+    error = _date_order_error(values.get("start_date", current["start_date"]), values.get("end_date", current["end_date"]))
+    raise error or json_patch.conflict("Test operation failed")
+
+async def _place_stop(
+    trip_id: str,
+    stops: List[Dict[str, Any]],
+    index: int,
+    changed_stops: Dict[str, Dict[str, Any]],
+    moving: Optional[str] = None
+) -> float:
+    """sequence_order for a stop inserted at index of the working list.
+
+    `moving` is a stop already taken out of the list but still stored.
+    """
+    def between():
+        before = stops[index - 1]["sequence_order"] if index > 0 else 0.0
+        return _midpoint(before, stops[index]["sequence_order"] if index < len(stops) else None)
+    order = between()
+    if order is None:
+        # Respace the trip; every stop has moved
+        await _renumber(trip_id)
+        stops[:] = [
+            dict(row) for row in await database.fetch_all(_ordered_stops(trip_id)) if row["id"] != moving
+        ]
+        changed_stops.update((stop["id"], stop) for stop in stops)
+        order = between()
+    return order
+
+async def _patch_stop(
+    trip_id: str,
+    stops: List[Dict[str, Any]],
+    operation: json_patch.Operation,
+    changed_stops: Dict[str, Dict[str, Any]],
+    removed_stops: List[str]
+):
+    """Apply one /stops operation, writing only the stop rows it affects"""
+    op, path = operation.op, operation.path[1:]
+    if op == "test":
+        document = _as_json(stop_rows.many(stops))
+        if not json_patch.equal(json_patch.resolve(document, path), operation.value):
+            raise json_patch.conflict(f"Test failed at {json_patch.format_pointer(operation.path)}")
+        return
+    
+    if len(path) == 2:
+        # One field of one stop; every stop field exists, so add is replace and remove is null
+        stop = stops[json_patch.array_index(stops, path[0])]
+        value = None if op == "remove" else operation.value
+        values = {path[1]: _stop_values({path[1]: value})[path[1]]}
+        if path[1] == "destination_id":
+            await _check_destinations([values["destination_id"]])
+        updated = await update_row(trip_stops_table, [trip_stops_table.c.id == stop["id"]], values)
+        stop.update(dict(updated))
+        changed_stops[stop["id"]] = stop
+        return
+    
+    if op == "remove":
+        stop = stops.pop(json_patch.array_index(stops, path[0]))
+        await delete_row(trip_stops_table, [trip_stops_table.c.id == stop["id"]])
+        changed_stops.pop(stop["id"], None)
+        removed_stops.append(stop["id"])
+    elif op == "replace":
+        stop = stops[json_patch.array_index(stops, path[0])]
+        values = _stop_values(operation.value)
+        await _check_destinations([values["destination_id"]])
+        updated = await update_row(trip_stops_table, [trip_stops_table.c.id == stop["id"]], values)
+        stop.update(dict(updated))
+        changed_stops[stop["id"]] = stop
+    elif op == "move":
+        stop = stops.pop(json_patch.array_index(stops, operation.source[1]))
+        index = json_patch.array_index(stops, path[0], allow_end=True)
+        order = await _place_stop(trip_id, stops, index, changed_stops, moving=stop["id"])
+        updated = await update_row(trip_stops_table, [trip_stops_table.c.id == stop["id"]], {"sequence_order": order})
+        stop = dict(updated)
+        stops.insert(index, stop)
+        changed_stops[stop["id"]] = stop
+    else:
+        # add, or copy of a whole stop
+        if op == "copy":
+            source = stops[json_patch.array_index(stops, operation.source[1])]
+            values = {field: source[field] for field in STOP_FIELDS}
+        else:
+            values = _stop_values(operation.value)
+            await _check_destinations([values["destination_id"]])
+        index = json_patch.array_index(stops, path[0], allow_end=True)
+        order = await _place_stop(trip_id, stops, index, changed_stops)
+        created = await insert_row(
+            trip_stops_table, {**values, "id": str(uuid.uuid4()), "trip_id": trip_id, "sequence_order": order}
+        )
+        stop = dict(created)
+        stops.insert(index, stop)
+        changed_stops[stop["id"]] = stop
+
+async def _patch_document(trip_id: str, user_id: str, operations: List[json_patch.Operation], expected: Optional[int]):
+    """Apply a patch that reaches into ai_suggestions or stops, or changes rolled-up columns,
+    operation by operation inside one transaction on the locked trip row.
+    """
+    owned = [trips_table.c.id == trip_id, trips_table.c.user_id == user_id]
+    async with database.transaction():
+        previous = await fetch_for_update(trips_table, owned)
+        if not previous:
+            raise HTTPException(status_code=404, detail="Trip not found")
+        if expected is not None and previous["version"] != expected:
+            raise HTTPException(status_code=412, detail="Trip was modified; fetch it again")
+        
+        trip = {**dict(previous), "ai_suggestions": copy.deepcopy(previous["ai_suggestions"])}
+        changed = set()
+        stops, changed_stops, removed_stops = None, {}, []
+        for operation in operations:
+            field = operation.path[0]
+            if field == "stops":
+                if stops is None:
+                    stops = [dict(row) for row in await database.fetch_all(_ordered_stops(trip_id))]
+                await _patch_stop(trip_id, stops, operation, changed_stops, removed_stops)
+            elif field == "version" or operation.op == "test":
+                document = _as_json(trip_rows.one(trip))
+                if not json_patch.equal(json_patch.resolve(document, operation.path), operation.value):
+                    raise json_patch.conflict(f"Test failed at {json_patch.format_pointer(operation.path)}")
+            elif len(operation.path) > 1:
+                # Inside ai_suggestions
+                suggestions = trip["ai_suggestions"]
+                if suggestions is None:
+                    raise json_patch.conflict("Path not found: /ai_suggestions")
+                nested = json_patch.Operation(
+                    operation.op, operation.path[1:], operation.value,
+                    operation.source[1:] if operation.source is not None else None
+                )
+                trip["ai_suggestions"] = _field_value(field, json_patch.apply_operation(suggestions, nested))
+                changed.add(field)
+            else:
+                trip[field] = _field_value(field, None if operation.op == "remove" else operation.value)
+                changed.add(field)
+        
+        error = _date_order_error(trip["start_date"], trip["end_date"])
+        if error:
+            raise error
+        
+        updated = await update_row(
+            trips_table,
+            owned + [trips_table.c.version == previous["version"]],
+            {**{field: trip[field] for field in changed}, "version": trips_table.c.version + 1}
+        )
+        if not updated:
+            # fetch_for_update takes no lock on SQLite; a concurrent write got in first
+            raise HTTPException(status_code=412, detail="Trip was modified; fetch it again")
+        if changed & STATS_FIELDS:
+            await user_stats.record_change("trips", user_id, before=previous, after=updated)
+    
+    patched_stops = None
+    if stops is not None:
+        patched_stops = {
+            "upserted": stop_rows.many(sorted(changed_stops.values(), key=lambda stop: stop["sequence_order"])),
+            "removed": removed_stops,
+        }
+    return updated, changed, patched_stops
+
+@router.patch("/{trip_id}")
+async def patch_trip(
+    trip_id: str,
+    operations: List[Dict[str, Any]] = Body(..., media_type=json_patch.MEDIA_TYPE),
+    if_match: Optional[str] = Header(None, description="ETag from GET /api/trips/{id}; 412 if the trip changed since"),
+    current_user = Depends(get_current_writer)
+):
+    """Apply an RFC 6902 JSON Patch atomically; returns only the changed fields"""
+    expected = _expected_version(if_match)
+    patch = json_patch.parse(operations)
+    for operation in patch:
+        _check_operation(operation)
     
-    # Get current destinations
-    current_destinations = existing_trip["destinations"] or []
-    current_destinations.append(destination_data)
+    stops = None
+    if _single_statement(patch):
+        updated, changed = await _patch_columns(trip_id, current_user.id, patch, expected)
+    else:
+        updated, changed, stops = await _patch_document(trip_id, current_user.id, patch, expected)
     
-    # Update trip
-    query = trips_table.update().where(trips_table.c.id == trip_id).values(
-        destinations=current_destinations
+    projected = trip_rows.one(updated)
+    body = {"id": trip_id, "version": projected["version"], "updated_at": projected["updated_at"]}
+    body.update((field, projected[field]) for field in changed)
+    if stops is not None:
+        body["stops"] = stops
+    return json_response(body, {"ETag": f'"{projected["version"]}"'})
+
+def _stop_coordinates(stop: Mapping[str, Any]) -> Optional[Tuple[float, float]]:
+    """Resolve a trip stop to coordinates, from the stop itself or the catalog"""
+    if stop["latitude"] is not None and stop["longitude"] is not None:
+        return float(stop["latitude"]), float(stop["longitude"])
+    destination_id = stop["destination_id"]
+    return catalog.destination_coordinates.get(destination_id) if destination_id else None
+
+@router.get("/{trip_id}/distances")
+async def get_trip_distances(
+    trip_id: str,
+    radius: float = Query(50, description="Radius in kilometers around each stop"),
+    limit: int = Query(10, description="Maximum destinations per stop"),
+    current_user = Depends(get_current_active_user),
+    reader = Depends(get_user_reader)
+):
+    """Get leg distances and catalog destinations near each stop of a trip"""
+    stops = await reader.fetch_all(
+        _ordered_stops(trip_id).where(trip_stops_table.c.trip_id.in_(_owned_trip(trip_id, current_user.id)))
     )
-    await database.execute(query)
+    if not stops and not await _trip_exists(reader, trip_id, current_user.id):
+        raise HTTPException(status_code=404, detail="Trip not found")
+    
+    located = [
+        (index, coordinates)
+        for index, coordinates in enumerate(_stop_coordinates(stop) for stop in stops)
+        if coordinates is not None
+    ]
+    if not located:
+        return {"legs": [], "total_distance_km": 0.0, "nearby": []}
+    
+    stop_indexes = [index for index, _ in located]
+    lats = [lat for _, (lat, _) in located]
+    lngs = [lng for _, (_, lng) in located]
+    
+    legs = leg_distances(lats, lngs)
+    nearby = catalog.destination_coordinates.within_each(lats, lngs, radius, limit)
+    
+    # One keyed fetch for every destination near any stop
+    nearby_ids = {destination_id for matches in nearby for destination_id, _ in matches}
+    names = {}
+    if nearby_ids:
+        rows = await reader.fetch_all(
+            sqlalchemy.select(destinations_table.c.id, destinations_table.c.name).where(
+                destinations_table.c.id.in_(nearby_ids)
+            )
+        )
+        names = {row["id"]: row["name"] for row in rows}
     
-    return {"message": "Destination added to trip successfully"}
\ No newline at end of file
+    return {
+        "legs": [
+            {"from_stop": stop_indexes[i], "to_stop": stop_indexes[i + 1], "distance_km": float(distance)}
+            for i, distance in enumerate(legs)
+        ],
+        "total_distance_km": float(legs.sum()),
+        "nearby": [
+            {
+                "stop": stop_index,
+                "destinations": [
+                    {"id": destination_id, "name": names.get(destination_id), "distance_km": distance}
+                    for destination_id, distance in matches
+                ]
+            }
+            for stop_index, matches in zip(stop_indexes, nearby)
+        ]
+    }
\ No newline at end of file
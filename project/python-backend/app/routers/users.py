@@ -1,80 +1,59 @@
 from fastapi import APIRouter, Depends, HTTPException
-from app.database import database, users_table, trips_table, bookings_table, reviews_table
+from app.database import database, users_table, user_stats_table
 from app.models import User, UserUpdate
-from app.auth import get_current_active_user
+from app.auth import get_current_active_user, get_current_writer, get_user_reader, user_cache
+from app.data_access import update_row
+from app.serialization import RowProjection, json_response
 
 router = APIRouter()
 
+user_rows = RowProjection(User, users_table)
+
 @router.get("/profile", response_model=User)
 async def get_user_profile(current_user = Depends(get_current_active_user)):
     """Get current user profile"""
-    return current_user
+    return json_response(current_user.dict())
 
 @router.put("/profile", response_model=User)
 async def update_user_profile(
     user_update: UserUpdate,
-    current_user = Depends(get_current_active_user)
+    current_user = Depends(get_current_writer)
 ):
     """Update user profile"""
     # Update only provided fields
     update_data = {k: v for k, v in user_update.dict().items() if v is not None}
     
     if update_data:
-        query = users_table.update().where(users_table.c.id == current_user.id).values(**update_data)
-        await database.execute(query)
+        updated_user = await update_row(users_table, [users_table.c.id == current_user.id], update_data)
+        user_cache.invalidate(current_user.email)
+    else:
+        updated_user = await database.fetch_one(
+            users_table.select().where(users_table.c.id == current_user.id)
+        )
     
-    # Fetch updated user
-    updated_user = await database.fetch_one(
-        users_table.select().where(users_table.c.id == current_user.id)
-    )
+    if not updated_user:
+        raise HTTPException(status_code=404, detail="User not found")
     
-    return User(**dict(updated_user))
+    return json_response(user_rows.one(updated_user))
 
 @router.get("/stats")
-async def get_user_stats(current_user = Depends(get_current_active_user)):
+async def get_user_stats(current_user = Depends(get_current_active_user), reader = Depends(get_user_reader)):
     """Get user statistics"""
-    # Get trip stats
-    trip_stats = await database.fetch_one(
-        f"""
-        SELECT 
-            COUNT(*) as total_trips,
-            COUNT(CASE WHEN status = 'completed' THEN 1 END) as completed_trips,
-            SUM(total_budget) as total_budget
-        FROM trips 
-        WHERE user_id = '{current_user.id}'
-        """
-    )
-    
-    # Get booking stats
-    booking_stats = await database.fetch_one(
-        f"""
-        SELECT 
-            COUNT(*) as total_bookings,
-            SUM(amount) as total_spent
-        FROM bookings 
-        WHERE user_id = '{current_user.id}' AND status = 'confirmed'
-        """
-    )
-    
-    # Get review stats
-    review_stats = await database.fetch_one(
-        f"""
-        SELECT 
-            COUNT(*) as total_reviews,
-            AVG(rating) as avg_rating
-        FROM reviews 
-        WHERE user_id = '{current_user.id}'
-        """
+    # One primary-key read of the rollup maintained by app.services.user_stats
+    stats = await reader.fetch_one(
+        user_stats_table.select().where(user_stats_table.c.user_id == current_user.id)
     )
+    stats = dict(stats) if stats else {}
+    total_reviews = stats.get("total_reviews", 0)
     
     return {
-        "total_trips": trip_stats["total_trips"] or 0,
-        "completed_trips": trip_stats["completed_trips"] or 0,
-        "total_budget": float(trip_stats["total_budget"] or 0),
-        "total_bookings": booking_stats["total_bookings"] or 0,
-        "total_spent": float(booking_stats["total_spent"] or 0),
-        "total_reviews": review_stats["total_reviews"] or 0,
-        "avg_review_rating": float(review_stats["avg_rating"] or 0),
+        "total_trips": stats.get("total_trips", 0),
+        "completed_trips": stats.get("completed_trips", 0),
+        "total_budget": float(stats.get("total_budget", 0)),
+        "total_bookings": stats.get("total_bookings", 0),
+        "total_spent": float(stats.get("total_spent", 0)),
+        "total_reviews": total_reviews,
+        "avg_review_rating": stats["rating_sum"] / total_reviews if total_reviews else 0.0,
         "member_since": current_user.created_at,
         "profile_completion": calculate_profile_completion(current_user)
     }
@@ -92,7 +71,7 @@ def calculate_profile_completion(user: User) -> int:
     return int((completed_fields / len(fields)) * 100)
 
 @router.delete("/account")
-async def delete_user_account(current_user = Depends(get_current_active_user)):
+async def delete_user_account(current_user = Depends(get_current_writer)):
     """Delete user account (soft delete)"""
     # Soft delete - deactivate account
     query = users_table.update().where(users_table.c.id == current_user.id).values(
@@ -100,5 +79,6 @@ async def delete_user_account(current_user = Depends(get_current_active_user)):
         email=f"deleted_{current_user.id}@deleted.com"
     )
     await database.execute(query)
+    user_cache.invalidate(current_user.email)
     
     return {"message": "Account deleted successfully"}
\ No newline at end of file
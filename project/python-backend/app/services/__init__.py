@@ -0,0 +1 @@
+# Python backend services
\ No newline at end of file
@@ -0,0 +1,196 @@
+import heapq
+import math
+import unicodedata
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+SuggestionKey = Tuple[str, str]
+
+
+def normalize(text: str) -> str:
+    """Lowercase, strip accents and collapse whitespace"""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(stripped.lower().split())
+
+
+def popularity(destination: Mapping[str, Any]) -> float:
+    """Rank weight of a destination: rating scaled by how many reviews back it"""
+    rating = destination.get("avg_rating") or 0.0
+    reviews = destination.get("review_count") or 0
+    return rating * math.log1p(reviews) + rating
+
+
+class _Node:
+    __slots__ = ("children", "keys", "top")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.keys: Set[SuggestionKey] = set()
+        self.top: List[Tuple[float, SuggestionKey]] = []
+
+
+class AutocompleteIndex:
+    """Prefix index over destination names, cities and countries.
+
+    Every trie node caches the top-k suggestions of its subtree, so a lookup is
+    a walk down the prefix plus a slice. Each label is indexed under its full
+    text and under every later word ("arab emirates", "emirates"). Cities and
+    countries are shared suggestions weighted by their best destination.
+    """
+
+    def __init__(self, top_k: int = 10):
+        self.top_k = top_k
+        self._root = _Node()
+        self._scores: Dict[SuggestionKey, float] = {}
+        self._labels: Dict[SuggestionKey, Dict[str, Any]] = {}
+        # Shared city/country suggestions remember each contributing destination
+        self._contributors: Dict[SuggestionKey, Dict[str, float]] = {}
+        self._destination_keys: Dict[str, List[SuggestionKey]] = {}
+        self._bulk = False
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def rebuild(self, destinations: Iterable[Mapping[str, Any]]):
+        self._root = _Node()
+        self._scores = {}
+        self._labels = {}
+        self._contributors = {}
+        self._destination_keys = {}
+        # Load everything first, then fill the top-k caches in one post-order pass
+        self._bulk = True
+        try:
+            for destination in destinations:
+                self.add_destination(destination)
+        finally:
+            self._bulk = False
+        self._refresh_subtree(self._root)
+
+    def add_destination(self, destination: Mapping[str, Any]):
+        destination_id = destination["id"]
+        if destination_id in self._destination_keys:
+            self.remove_destination(destination_id)
+
+        weight = popularity(destination)
+        keys = []
+
+        name_key = ("destination", destination_id)
+        self._labels[name_key] = {
+            "type": "destination",
+            "text": destination["name"],
+            "destination_id": destination_id,
+            "city": destination.get("city"),
+            "country": destination.get("country"),
+        }
+        self._add_key(name_key, destination["name"], weight)
+        keys.append(name_key)
+
+        for kind, text in (("city", destination.get("city")), ("country", destination.get("country"))):
+            if not text:
+                continue
+            key = (kind, normalize(text))
+            contributors = self._contributors.setdefault(key, {})
+            contributors[destination_id] = weight
+            if key not in self._labels:
+                self._labels[key] = {
+                    "type": kind,
+                    "text": text,
+                    "destination_id": None,
+                    "country": destination.get("country") if kind == "city" else None,
+                }
+                self._add_key(key, text, weight)
+            elif weight > self._scores[key]:
+                self._rescore(key, weight)
+            keys.append(key)
+
+        self._destination_keys[destination_id] = keys
+
+    def remove_destination(self, destination_id: str):
+        for key in self._destination_keys.pop(destination_id, []):
+            contributors = self._contributors.get(key)
+            if contributors is None:
+                self._remove_key(key)
+                continue
+            contributors.pop(destination_id, None)
+            if contributors:
+                self._rescore(key, max(contributors.values()))
+            else:
+                del self._contributors[key]
+                self._remove_key(key)
+
+    def complete(self, prefix: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        node = self._root
+        for char in normalize(prefix):
+            node = node.children.get(char)
+            if node is None:
+                return []
+        limit = min(limit or self.top_k, self.top_k)
+        return [{**self._labels[key], "score": round(score, 4)} for score, key in node.top[:limit]]
+
+    # Trie maintenance
+
+    def _index_strings(self, key: SuggestionKey) -> List[str]:
+        words = normalize(self._labels[key]["text"]).split(" ")
+        return [" ".join(words[i:]) for i in range(len(words)) if words[i]]
+
+    def _add_key(self, key: SuggestionKey, text: str, score: float):
+        self._scores[key] = score
+        for string in self._index_strings(key):
+            node = self._root
+            path = [node]
+            for char in string:
+                child = node.children.get(char)
+                if child is None:
+                    child = node.children[char] = _Node()
+                node = child
+                path.append(node)
+            node.keys.add(key)
+            self._refresh(path)
+
+    def _rescore(self, key: SuggestionKey, score: float):
+        self._scores[key] = score
+        for string in self._index_strings(key):
+            self._refresh(self._path(string))
+
+    def _remove_key(self, key: SuggestionKey):
+        strings = self._index_strings(key)
+        del self._scores[key]
+        for string in strings:
+            path = self._path(string)
+            path[-1].keys.discard(key)
+            self._refresh(path)
+        del self._labels[key]
+
+    def _path(self, string: str) -> List[_Node]:
+        path = [self._root]
+        for char in string:
+            path.append(path[-1].children[char])
+        return path
+
+    def _refresh(self, path: List[_Node]):
+        """Recompute cached top-k bottom-up; each node merges its children's lists"""
+        if self._bulk:
+            return
+        for node in reversed(path):
+            self._merge_top(node)
+
+    def _refresh_subtree(self, root: _Node):
+        stack = [(root, False)]
+        while stack:
+            node, children_done = stack.pop()
+            if children_done:
+                self._merge_top(node)
+                continue
+            stack.append((node, True))
+            stack.extend((child, False) for child in node.children.values())
+
+    def _merge_top(self, node: _Node):
+        if not node.keys and len(node.children) == 1:
+            # Single-branch chains share their child's list; lists are replaced, never mutated
+            node.top = next(iter(node.children.values())).top
+            return
+        candidates = {key: self._scores[key] for key in node.keys}
+        for child in node.children.values():
+            for score, key in child.top:
+                candidates[key] = score
+        node.top = heapq.nlargest(self.top_k, ((score, key) for key, score in candidates.items()))
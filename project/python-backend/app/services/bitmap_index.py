@@ -0,0 +1,182 @@
+import heapq
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+# Upper bounds of the average_price buckets; the last bucket is open-ended
+PRICE_BUCKETS = (1000, 2500, 5000, 10000, 25000, 50000)
+
+
+def _bucket(price: Optional[float]) -> int:
+    if price is None:
+        return len(PRICE_BUCKETS)
+    for index, upper in enumerate(PRICE_BUCKETS):
+        if price <= upper:
+            return index
+    return len(PRICE_BUCKETS)
+
+
+class BitmapIndex:
+    """Inverted index from category, continent and price bucket to row bitmaps.
+
+    Each destination gets a dense ordinal and every attribute value keeps a
+    bitmap (a Python int, so AND/OR run in C over machine words) of the
+    ordinals carrying it. Filters become bitmap intersections; rating and exact
+    price are kept per ordinal to refine candidates without touching the DB.
+    """
+
+    def __init__(self):
+        self._reset()
+
+    def _reset(self):
+        self._ids: List[Optional[str]] = []
+        self._ordinals: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._ratings: List[float] = []
+        self._prices: List[Optional[float]] = []
+        self._all = 0
+        self._categories: Dict[str, int] = {}
+        self._continents: Dict[str, int] = {}
+        self._price_buckets: List[int] = [0] * (len(PRICE_BUCKETS) + 1)
+        self._attributes: Dict[str, tuple] = {}
+
+    def __len__(self) -> int:
+        return len(self._ordinals)
+
+    def rebuild(self, destinations: Iterable[Mapping[str, Any]]):
+        self._reset()
+        for destination in destinations:
+            self.add_destination(destination)
+
+    def add_destination(self, destination: Mapping[str, Any]):
+        destination_id = destination["id"]
+        if destination_id in self._ordinals:
+            self.remove_destination(destination_id)
+
+        if self._free:
+            ordinal = self._free.pop()
+            self._ids[ordinal] = destination_id
+            self._ratings[ordinal] = destination.get("avg_rating") or 0.0
+            self._prices[ordinal] = destination.get("average_price")
+        else:
+            ordinal = len(self._ids)
+            self._ids.append(destination_id)
+            self._ratings.append(destination.get("avg_rating") or 0.0)
+            self._prices.append(destination.get("average_price"))
+        self._ordinals[destination_id] = ordinal
+
+        bit = 1 << ordinal
+        categories = {category.lower() for category in destination.get("activity_categories") or []}
+        continent = (destination.get("continent") or "").lower()
+        bucket = _bucket(destination.get("average_price"))
+
+        self._all |= bit
+        for category in categories:
+            self._categories[category] = self._categories.get(category, 0) | bit
+        self._continents[continent] = self._continents.get(continent, 0) | bit
+        self._price_buckets[bucket] |= bit
+        self._attributes[destination_id] = (categories, continent, bucket)
+
+    def remove_destination(self, destination_id: str):
+        ordinal = self._ordinals.pop(destination_id, None)
+        if ordinal is None:
+            return
+
+        mask = ~(1 << ordinal)
+        categories, continent, bucket = self._attributes.pop(destination_id)
+        self._all &= mask
+        for category in categories:
+            self._categories[category] &= mask
+        self._continents[continent] &= mask
+        self._price_buckets[bucket] &= mask
+
+        self._ids[ordinal] = None
+        self._free.append(ordinal)
+
+    def match(
+        self,
+        categories: Sequence[str] = (),
+        match_all: bool = True,
+        continent: Optional[str] = None,
+        max_price: Optional[float] = None,
+    ) -> int:
+        """Bitmap of destinations passing the filters (price is bucket-coarse)"""
+        bitmap = self._all
+
+        if categories:
+            bitmaps = [self._categories.get(category.lower(), 0) for category in categories]
+            if match_all:
+                for category_bitmap in bitmaps:
+                    bitmap &= category_bitmap
+            else:
+                combined = 0
+                for category_bitmap in bitmaps:
+                    combined |= category_bitmap
+                bitmap &= combined
+
+        if continent:
+            bitmap &= self._continents.get(continent.lower(), 0)
+
+        if max_price is not None:
+            allowed = 0
+            lower = float("-inf")
+            for index, upper in enumerate(PRICE_BUCKETS + (float("inf"),)):
+                if lower < max_price:
+                    allowed |= self._price_buckets[index]
+                lower = upper
+            bitmap &= allowed
+
+        return bitmap
+
+    def _ordinals_of(self, bitmap: int) -> List[int]:
+        bits = bin(bitmap)[:1:-1]
+        ordinals = []
+        position = bits.find("1")
+        while position != -1:
+            ordinals.append(position)
+            position = bits.find("1", position + 1)
+        return ordinals
+
+    def ids(
+        self,
+        bitmap: int,
+        min_rating: Optional[float] = None,
+        max_price: Optional[float] = None,
+    ) -> List[str]:
+        """Destination ids in the bitmap, refined by exact rating and price"""
+        return [self._ids[ordinal] for ordinal in self._refine(bitmap, min_rating, max_price)]
+
+    def top_ids(
+        self,
+        bitmap: int,
+        offset: int,
+        limit: int,
+        min_rating: Optional[float] = None,
+        max_price: Optional[float] = None,
+        after: Optional[Tuple[Optional[float], str]] = None,
+    ) -> List[str]:
+        """One page of ids in the bitmap ordered by (rating, id) descending.
+
+        `after` is the (rating, id) of the previous page's last row; the page
+        starts strictly below it, matching the SQL keyset order.
+        """
+        ordinals = self._refine(bitmap, min_rating, max_price)
+        if after is not None:
+            after = (after[0] or 0.0, after[1])
+            ordinals = [
+                ordinal for ordinal in ordinals
+                if (self._ratings[ordinal], self._ids[ordinal]) < after
+            ]
+        page = heapq.nlargest(
+            offset + limit, ordinals, key=lambda ordinal: (self._ratings[ordinal], self._ids[ordinal])
+        )
+        return [self._ids[ordinal] for ordinal in page[offset:]]
+
+    def _refine(self, bitmap: int, min_rating: Optional[float], max_price: Optional[float]) -> List[int]:
+        ordinals = self._ordinals_of(bitmap)
+        if min_rating is not None:
+            ordinals = [ordinal for ordinal in ordinals if self._ratings[ordinal] >= min_rating]
+        if max_price is not None:
+            ordinals = [
+                ordinal for ordinal in ordinals
+                if self._prices[ordinal] is not None and self._prices[ordinal] <= max_price
+            ]
+        return ordinals
@@ -0,0 +1,209 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class CacheStats:
+    """Hit/miss/eviction counters for one cache tier"""
+
+    __slots__ = ("hits", "misses", "evictions", "expirations")
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class TTLCache:
+    """In-process LRU cache with a per-entry time to live and a size bound"""
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        self._data[key] = (value, time.monotonic() + (ttl if ttl is not None else self.ttl))
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.stats.evictions += 1
+
+    def delete(self, key: Hashable):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+
+class SQLiteCacheStore:
+    """Persistent key/value tier in a local SQLite file, values stored as JSON"""
+
+    def __init__(self, path: str, ttl: float = 86400, max_entries: int = 100000):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stats = CacheStats()
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def open(self):
+        """Connect and create the table; done at startup, or else by the first lookup"""
+        with self._lock:
+            self._open()
+
+    def _open(self) -> sqlite3.Connection:
+        if self._connection is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_cache_entries_expires_at ON cache_entries (expires_at)")
+            self._connection = conn
+        return self._connection
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        """(value, expires_at as a time.time() timestamp), or None on a miss"""
+        with self._lock:
+            row = self._open().execute(
+                "SELECT value, expires_at FROM cache_entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and row[1] <= time.time():
+                self._open().execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+                self.stats.expirations += 1
+                row = None
+
+        if row is None:
+            self.stats.misses += 1
+            return None
+
+        self.stats.hits += 1
+        return json.loads(row[0]), row[1]
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        expires_at = time.time() + (ttl if ttl is not None else self.ttl)
+        payload = json.dumps(value, default=str)
+        with self._lock:
+            self._open().execute(
+                "INSERT OR REPLACE INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, payload, expires_at),
+            )
+            self._writes += 1
+            # Prune periodically rather than on every write
+            if self._writes % 1000 == 0:
+                self._prune()
+
+    def _prune(self):
+        cursor = self._open().execute("DELETE FROM cache_entries WHERE expires_at <= ?", (time.time(),))
+        self.stats.expirations += cursor.rowcount
+        (count,) = self._open().execute("SELECT COUNT(*) FROM cache_entries").fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._open().execute(
+                "DELETE FROM cache_entries WHERE key IN "
+                "(SELECT key FROM cache_entries ORDER BY expires_at LIMIT ?)",
+                (overflow,),
+            )
+            self.stats.evictions += overflow
+
+    def delete(self, key: str):
+        with self._lock:
+            self._open().execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+class TieredCache:
+    """Memory LRU in front of an optional persistent SQLite tier.
+
+    Memory hits are answered synchronously; the disk tier is only consulted
+    on a memory miss and runs in a worker thread so it never blocks the loop.
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 3600, path: Optional[str] = None):
+        self.memory = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.disk = SQLiteCacheStore(path, ttl=ttl) if path else None
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = self.memory.get(key)
+        if value is not None or self.disk is None:
+            return value
+
+        entry = await asyncio.to_thread(self.disk.get, key)
+        if entry is None:
+            return None
+
+        value, expires_at = entry
+        # Promote with what is left of the disk entry's lifetime, not a fresh TTL
+        remaining = expires_at - time.time()
+        if remaining > 0:
+            self.memory.set(key, value, ttl=remaining)
+        return value
+
+    async def set(self, key: str, value: Any):
+        self.memory.set(key, value)
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.set, key, value)
+
+    async def delete(self, key: str):
+        self.memory.delete(key)
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.delete, key)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "memory": {**self.memory.stats.as_dict(), "size": len(self.memory), "maxsize": self.memory.maxsize},
+            "disk": self.disk.stats.as_dict() if self.disk is not None else None,
+        }
+
+    def open(self):
+        if self.disk is not None:
+            self.disk.open()
+
+    def close(self):
+        if self.disk is not None:
+            self.disk.close()
@@ -0,0 +1,134 @@
+import asyncio
+import logging
+from typing import Any, Callable, List, Mapping, Tuple
+
+from decouple import config
+
+import sqlalchemy
+
+from app.database import database, destination_climate_table, destinations_table
+from app.services.autocomplete import AutocompleteIndex
+from app.services.bitmap_index import BitmapIndex
+from app.services.climate import ClimateStore
+from app.services.distance import CoordinateArray
+from app.services.listing_cache import ListingCache
+from app.services.spatial_index import SpatialIndex
+
+logger = logging.getLogger(__name__)
+
+# In-memory indexes over the active destination catalog, one copy per worker.
+# Reloads build fresh instances off the event loop and swap them in, so read
+# them through this module (catalog.destination_spatial_index) at call time.
+destination_spatial_index = SpatialIndex()
+destination_coordinates = CoordinateArray()
+destination_autocomplete = AutocompleteIndex()
+destination_bitmaps = BitmapIndex()
+destination_climate = ClimateStore()
+
+# Pre-serialized featured/top listings, dropped whenever the catalog changes
+destination_listings = ListingCache(config("DESTINATION_LISTING_CACHE_TTL", default=60, cast=float))
+
+# Incremental changes made while a reload is building, one journal per reload in
+# progress; each is replayed onto the instances its reload swaps in
+_journals: List[List[Tuple[Callable, tuple]]] = []
+
+
+def _build_indexes(rows: List[Mapping[str, Any]], climate_rows: List[Mapping[str, Any]]):
+    points = [(row["id"], row["latitude"], row["longitude"]) for row in rows]
+    spatial_index = SpatialIndex()
+    spatial_index.rebuild(points)
+    coordinates = CoordinateArray()
+    coordinates.rebuild(points)
+    autocomplete = AutocompleteIndex()
+    autocomplete.rebuild(rows)
+    bitmaps = BitmapIndex()
+    bitmaps.rebuild(rows)
+    climate = ClimateStore()
+    climate.rebuild(climate_rows)
+    return spatial_index, coordinates, autocomplete, bitmaps, climate
+
+
+async def load_catalog_indexes():
+    """(Re)build every in-memory catalog index from the destinations table"""
+    global destination_spatial_index, destination_coordinates, destination_autocomplete, destination_bitmaps
+    global destination_climate
+
+    journal: List[Tuple[Callable, tuple]] = []
+    _journals.append(journal)
+    try:
+        rows = [
+            dict(row) for row in await database.fetch_all(
+                destinations_table.select().where(destinations_table.c.is_active == True)
+            )
+        ]
+        climate, destinations = destination_climate_table, destinations_table
+        climate_rows = await database.fetch_all(
+            sqlalchemy.select(
+                climate.c.destination_id, climate.c.temperatures, climate.c.rainfall, climate.c.best_time,
+                destinations.c.avg_rating,
+            )
+            .select_from(climate.join(destinations, destinations.c.id == climate.c.destination_id))
+            .where(destinations.c.is_active == True)
+            .order_by(climate.c.destination_id)
+        )
+        (
+            destination_spatial_index,
+            destination_coordinates,
+            destination_autocomplete,
+            destination_bitmaps,
+            destination_climate,
+        ) = await asyncio.to_thread(_build_indexes, rows, climate_rows)
+    finally:
+        _journals.remove(journal)
+    # Nothing awaits between the swap and the replay, so no change slips in between
+    for change, args in journal:
+        change(*args)
+    destination_listings.invalidate()
+    logger.info("Loaded %d destinations into catalog indexes", len(rows))
+
+
+def _record(change: Callable, *args):
+    for journal in _journals:
+        journal.append((change, args))
+    change(*args)
+
+
+def index_destination(destination: Mapping[str, Any]):
+    """Add or replace a single destination in the catalog indexes"""
+    _record(_index_destination, destination)
+
+
+def unindex_destination(destination_id: str):
+    """Drop a destination from the catalog indexes"""
+    _record(_unindex_destination, destination_id)
+
+
+def _index_destination(destination: Mapping[str, Any]):
+    if not destination.get("is_active", True):
+        _unindex_destination(destination["id"])
+        return
+    if destination.get("latitude") is not None and destination.get("longitude") is not None:
+        destination_spatial_index.insert(destination["id"], destination["latitude"], destination["longitude"])
+        destination_coordinates.insert(destination["id"], destination["latitude"], destination["longitude"])
+    destination_autocomplete.add_destination(destination)
+    destination_bitmaps.add_destination(destination)
+    destination_listings.invalidate()
+
+
+def _unindex_destination(destination_id: str):
+    destination_spatial_index.remove(destination_id)
+    destination_coordinates.remove(destination_id)
+    destination_autocomplete.remove_destination(destination_id)
+    destination_bitmaps.remove_destination(destination_id)
+    destination_climate.remove(destination_id)
+    destination_listings.invalidate()
+
+
+async def refresh_catalog_indexes_periodically(interval: float):
+    """Reload the indexes so writes made through other workers become visible"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await load_catalog_indexes()
+        except Exception:
+            logger.exception("Catalog index refresh failed")
@@ -0,0 +1,132 @@
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+MONTHS = 12
+# On disk and in memory: 12 little-endian float32 values per destination, NaN where unknown
+DTYPE = np.dtype("<f4")
+
+
+def pack(values: Sequence[Optional[float]]) -> bytes:
+    """Twelve monthly values as the 48-byte blob stored in destination_climate"""
+    if len(values) != MONTHS:
+        raise ValueError(f"expected {MONTHS} monthly values, got {len(values)}")
+    return np.array([np.nan if value is None else value for value in values], dtype=DTYPE).tobytes()
+
+
+def unpack(blob: bytes) -> np.ndarray:
+    return np.frombuffer(blob, dtype=DTYPE)
+
+
+def _matrix(blobs: List[bytes]) -> np.ndarray:
+    """(len(blobs), 12) writable matrix over the concatenated blobs"""
+    return np.frombuffer(bytearray(b"".join(blobs)), dtype=DTYPE).reshape(len(blobs), MONTHS)
+
+
+def _monthly(values: np.ndarray) -> List[Optional[float]]:
+    return [None if np.isnan(value) else round(float(value), 2) for value in values]
+
+
+class ClimateStore:
+    """Monthly temperature and rainfall of the active catalog as (n, 12) float32 arrays.
+
+    Queries are boolean masks over one month's column plus a top-k by rating,
+    so they cost a few vectorized passes over the catalog and no per-row
+    Python. Removals swap the last row into the freed slot.
+    """
+
+    def __init__(self):
+        self._ids: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._temperatures = np.empty((0, MONTHS), dtype=DTYPE)
+        self._rainfall = np.empty((0, MONTHS), dtype=DTYPE)
+        self._ratings = np.empty(0, dtype=DTYPE)
+        self._best_times: List[Optional[str]] = []
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, destination_id: str) -> bool:
+        return destination_id in self._positions
+
+    def rebuild(self, rows: Iterable[Mapping[str, Any]]):
+        """Replace the contents with rows of destination_id, temperatures, rainfall, best_time, avg_rating"""
+        rows = list(rows)
+        self._ids = [row["destination_id"] for row in rows]
+        self._positions = {destination_id: position for position, destination_id in enumerate(self._ids)}
+        self._temperatures = _matrix([row["temperatures"] for row in rows])
+        self._rainfall = _matrix([row["rainfall"] for row in rows])
+        self._ratings = np.array([row["avg_rating"] or 0.0 for row in rows], dtype=DTYPE)
+        self._best_times = [row["best_time"] for row in rows]
+
+    def get(self, destination_id: str) -> Optional[Dict[str, Any]]:
+        position = self._positions.get(destination_id)
+        if position is None:
+            return None
+        return {
+            "destination_id": destination_id,
+            "temperatures": _monthly(self._temperatures[position]),
+            "rainfall": _monthly(self._rainfall[position]),
+            "best_time": self._best_times[position],
+        }
+
+    def remove(self, destination_id: str):
+        position = self._positions.pop(destination_id, None)
+        if position is None:
+            return
+        last = len(self._ids) - 1
+        if position != last:
+            moved_id = self._ids[last]
+            self._ids[position] = moved_id
+            self._positions[moved_id] = position
+            self._temperatures[position] = self._temperatures[last]
+            self._rainfall[position] = self._rainfall[last]
+            self._ratings[position] = self._ratings[last]
+            self._best_times[position] = self._best_times[last]
+        self._ids.pop()
+        self._best_times.pop()
+        self._temperatures = self._temperatures[:last]
+        self._rainfall = self._rainfall[:last]
+        self._ratings = self._ratings[:last]
+
+    def search(
+        self,
+        month: int,
+        min_temperature: Optional[float] = None,
+        max_temperature: Optional[float] = None,
+        max_rainfall: Optional[float] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> List[Tuple[str, Optional[float], Optional[float]]]:
+        """(id, temperature, rainfall) in `month` (1-12) for destinations within the bounds, best rated first.
+
+        Unknown values never satisfy a bound.
+        """
+        temperatures = self._temperatures[:, month - 1]
+        rainfall = self._rainfall[:, month - 1]
+        mask = np.ones(len(self._ids), dtype=bool)
+        if min_temperature is not None:
+            mask &= temperatures >= min_temperature
+        if max_temperature is not None:
+            mask &= temperatures <= max_temperature
+        if max_rainfall is not None:
+            mask &= rainfall <= max_rainfall
+
+        hits = np.flatnonzero(mask)
+        wanted = offset + limit
+        ratings = -self._ratings[hits]
+        if wanted < len(hits):
+            # Top-k: keep everything rated at least the k-th best (ties included) and sort only that
+            threshold = np.partition(ratings, wanted - 1)[wanted - 1]
+            keep = ratings <= threshold
+            hits, ratings = hits[keep], ratings[keep]
+        # Best rated first, catalog order among equals, so pages never overlap
+        hits = hits[np.lexsort((hits, ratings))][offset:wanted]
+        return [
+            (
+                self._ids[i],
+                None if np.isnan(temperatures[i]) else round(float(temperatures[i]), 2),
+                None if np.isnan(rainfall[i]) else round(float(rainfall[i]), 2),
+            )
+            for i in hits
+        ]
@@ -0,0 +1,136 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.geo import EARTH_RADIUS_KM
+
+# Upper bound on distance matrix cells computed at once (~8 MB of float64 per temporary)
+MAX_MATRIX_CELLS = 1_000_000
+
+
+def haversine_one_to_many(lat: float, lng: float, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    """Distances in km from one point to every point of the (degree) arrays"""
+    return _haversine(np.radians(lat), np.radians(lng), np.radians(lats), np.radians(lngs))
+
+
+def haversine_many_to_many(
+    lats_a: np.ndarray, lngs_a: np.ndarray, lats_b: np.ndarray, lngs_b: np.ndarray
+) -> np.ndarray:
+    """(len(a), len(b)) matrix of distances in km between two sets of points"""
+    phi_a = np.radians(np.asarray(lats_a, dtype=np.float64))[:, None]
+    lmb_a = np.radians(np.asarray(lngs_a, dtype=np.float64))[:, None]
+    return _haversine(phi_a, lmb_a, np.radians(lats_b)[None, :], np.radians(lngs_b)[None, :])
+
+
+def leg_distances(lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    """Distances in km between consecutive points of a route"""
+    phi = np.radians(np.asarray(lats, dtype=np.float64))
+    lmb = np.radians(np.asarray(lngs, dtype=np.float64))
+    return _haversine(phi[:-1], lmb[:-1], phi[1:], lmb[1:])
+
+
+def _haversine(phi1, lmb1, phi2, lmb2) -> np.ndarray:
+    a = np.sin((phi2 - phi1) / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin((lmb2 - lmb1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+class CoordinateArray:
+    """Destination coordinates kept as contiguous float64 arrays for bulk distance math.
+
+    Appends grow the backing arrays geometrically; removals swap the last row
+    into the freed slot, so both stay O(1) amortized.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self._lats = np.empty(capacity, dtype=np.float64)
+        self._lngs = np.empty(capacity, dtype=np.float64)
+        self._ids: List[str] = []
+        self._positions: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, point_id: str) -> bool:
+        return point_id in self._positions
+
+    @property
+    def ids(self) -> List[str]:
+        return self._ids
+
+    @property
+    def lats(self) -> np.ndarray:
+        return self._lats[:len(self._ids)]
+
+    @property
+    def lngs(self) -> np.ndarray:
+        return self._lngs[:len(self._ids)]
+
+    def rebuild(self, points: Iterable[Tuple[str, float, float]]):
+        """Replace the contents with (id, latitude, longitude) triples"""
+        points = [point for point in points if point[1] is not None and point[2] is not None]
+        self._ids = [point_id for point_id, _, _ in points]
+        self._positions = {point_id: position for position, point_id in enumerate(self._ids)}
+        capacity = max(1024, len(points))
+        self._lats = np.empty(capacity, dtype=np.float64)
+        self._lngs = np.empty(capacity, dtype=np.float64)
+        self._lats[:len(points)] = [lat for _, lat, _ in points]
+        self._lngs[:len(points)] = [lng for _, _, lng in points]
+
+    def get(self, point_id: str) -> Optional[Tuple[float, float]]:
+        position = self._positions.get(point_id)
+        if position is None:
+            return None
+        return float(self._lats[position]), float(self._lngs[position])
+
+    def insert(self, point_id: str, lat: float, lng: float):
+        position = self._positions.get(point_id)
+        if position is None:
+            position = len(self._ids)
+            if position == len(self._lats):
+                self._lats = np.concatenate([self._lats, np.empty_like(self._lats)])
+                self._lngs = np.concatenate([self._lngs, np.empty_like(self._lngs)])
+            self._ids.append(point_id)
+            self._positions[point_id] = position
+        self._lats[position] = lat
+        self._lngs[position] = lng
+
+    def remove(self, point_id: str):
+        position = self._positions.pop(point_id, None)
+        if position is None:
+            return
+        last = len(self._ids) - 1
+        if position != last:
+            moved_id = self._ids[last]
+            self._ids[position] = moved_id
+            self._positions[moved_id] = position
+            self._lats[position] = self._lats[last]
+            self._lngs[position] = self._lngs[last]
+        self._ids.pop()
+
+    def distances_from(self, lat: float, lng: float) -> np.ndarray:
+        return haversine_one_to_many(lat, lng, self.lats, self.lngs)
+
+    def within(self, lat: float, lng: float, radius_km: float, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """(id, distance_km) pairs within the radius of one point, closest first"""
+        return self.within_each([lat], [lng], radius_km, limit)[0]
+
+    def within_each(
+        self, lats: Iterable[float], lngs: Iterable[float], radius_km: float, limit: Optional[int] = None
+    ) -> List[List[Tuple[str, float]]]:
+        """For every query point, the (id, distance_km) pairs within the radius, closest first"""
+        lats, lngs = np.asarray(lats, dtype=np.float64), np.asarray(lngs, dtype=np.float64)
+        if not self._ids:
+            return [[] for _ in lats]
+
+        # A block of query points at a time keeps memory flat however big the catalog is
+        step = max(1, MAX_MATRIX_CELLS // len(self._ids))
+        results = []
+        for start in range(0, len(lats), step):
+            matrix = haversine_many_to_many(lats[start:start + step], lngs[start:start + step], self.lats, self.lngs)
+            for row in matrix:
+                hits = np.flatnonzero(row <= radius_km)
+                hits = hits[np.argsort(row[hits], kind="stable")]
+                if limit is not None:
+                    hits = hits[:limit]
+                results.append([(self._ids[i], float(row[i])) for i in hits])
+        return results
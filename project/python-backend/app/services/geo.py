@@ -0,0 +1,44 @@
+import math
+from typing import List, Tuple
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance between two points in kilometers"""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def geohash_cell(lat: float, lng: float, precision: int = 7) -> Tuple[int, int]:
+    """Return the (row, column) of the geohash cell containing a point.
+
+    A geohash of ``precision`` characters interleaves 5 * precision bits, with
+    longitude taking the extra bit, so the cells form a regular lat/lng grid.
+    Working with integer cells keeps neighbour lookups free of string work.
+    """
+    lat_bits = (5 * precision) // 2
+    lng_bits = 5 * precision - lat_bits
+    rows = 1 << lat_bits
+    cols = 1 << lng_bits
+    row = min(int((lat + 90.0) / 180.0 * rows), rows - 1)
+    col = min(int((lng + 180.0) / 360.0 * cols), cols - 1)
+    return row, col
+
+
+def geohash_neighborhood(cell: Tuple[int, int], precision: int = 7) -> List[Tuple[int, int]]:
+    """Return a cell and its (up to) eight surrounding cells, wrapping at the antimeridian"""
+    lat_bits = (5 * precision) // 2
+    rows = 1 << lat_bits
+    cols = 1 << (5 * precision - lat_bits)
+    row, col = cell
+    return [
+        (r, (col + dc) % cols)
+        for r in (row - 1, row, row + 1)
+        if 0 <= r < rows
+        for dc in (-1, 0, 1)
+    ]
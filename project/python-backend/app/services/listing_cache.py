@@ -0,0 +1,78 @@
+import hashlib
+import time
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional, Tuple
+
+from fastapi import Request, Response
+
+from app.serialization import dumps
+from app.services.cache import CacheStats
+from app.services.singleflight import SingleFlight
+
+# Body, strong ETag and extra response headers of one materialized listing
+Listing = Tuple[bytes, str, Dict[str, str]]
+
+
+def serialize_listing(items: Any, headers: Optional[Mapping[str, str]] = None) -> Listing:
+    """Encode projected rows to a response body once and tag it"""
+    body = dumps(items)
+    etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+    return body, etag, dict(headers or {})
+
+
+def listing_response(request: Request, listing: Listing) -> Response:
+    """200 with the cached bytes, or 304 when the client already holds them"""
+    body, etag, headers = listing
+    headers = {**headers, "ETag": etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+class ListingCache:
+    """Materialized, pre-serialized listings invalidated on catalog writes.
+
+    Writes through this worker call invalidate(); the TTL bounds how long a
+    write made through another worker can stay invisible. Concurrent misses for
+    a key share one rebuild, and a rebuild that raced an invalidation is served
+    but not stored.
+    """
+
+    def __init__(self, ttl: float = 60, maxsize: int = 64):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.stats = CacheStats()
+        self._entries: Dict[str, Tuple[Listing, float]] = {}
+        self._generation = 0
+        self._flight = SingleFlight()
+
+    async def get(self, key: str, build: Callable[[], Awaitable[Listing]]) -> Listing:
+        entry = self._entries.get(key)
+        if entry is not None:
+            listing, expires_at = entry
+            if expires_at > time.monotonic():
+                self.stats.hits += 1
+                return listing
+            del self._entries[key]
+            self.stats.expirations += 1
+
+        self.stats.misses += 1
+        # Rebuilds started before an invalidation are not joined after it
+        return await self._flight.do(f"{self._generation}:{key}", lambda: self._build(key, build))
+
+    async def _build(self, key: str, build: Callable[[], Awaitable[Listing]]) -> Listing:
+        generation = self._generation
+        listing = await build()
+        if generation == self._generation:
+            if key not in self._entries and len(self._entries) >= self.maxsize:
+                del self._entries[next(iter(self._entries))]
+                self.stats.evictions += 1
+            self._entries[key] = (listing, time.monotonic() + self.ttl)
+        return listing
+
+    def invalidate(self):
+        self._generation += 1
+        self._entries.clear()
+
+    def stats_dict(self) -> Dict[str, Any]:
+        return {**self.stats.as_dict(), "entries": len(self._entries), "generation": self._generation}
@@ -0,0 +1,160 @@
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import httpx
+from decouple import config
+
+# Configuration
+GOOGLE_MAPS_BASE_URL = config("GOOGLE_MAPS_BASE_URL", default="https://maps.googleapis.com")
+GOOGLE_MAPS_TIMEOUT = float(config("GOOGLE_MAPS_TIMEOUT", default="10"))
+GOOGLE_MAPS_CONNECT_TIMEOUT = float(config("GOOGLE_MAPS_CONNECT_TIMEOUT", default="3"))
+GOOGLE_MAPS_MAX_CONCURRENCY = int(config("GOOGLE_MAPS_MAX_CONCURRENCY", default="20"))
+GOOGLE_MAPS_MAX_KEEPALIVE = int(config("GOOGLE_MAPS_MAX_KEEPALIVE", default="20"))
+
+# Statuses the googlemaps SDK treats as a successful (possibly empty) answer
+OK_STATUSES = {"OK", "ZERO_RESULTS"}
+
+
+class MapsApiError(Exception):
+    """Raised when the Maps web service answers with an error status"""
+
+    def __init__(self, status: str, message: Optional[str] = None):
+        self.status = status
+        self.message = message
+        super().__init__(f"{status}: {message}" if message else status)
+
+
+def _format_latlng(location: Union[Dict[str, float], Tuple[float, float], List[float]]) -> str:
+    if isinstance(location, dict):
+        return f"{location['lat']},{location['lng']}"
+    return f"{location[0]},{location[1]}"
+
+
+class AsyncMapsClient:
+    """Non-blocking Google Maps web service client on a pooled httpx.AsyncClient.
+
+    Return values mirror the synchronous ``googlemaps.Client`` methods so the
+    routers keep their response formatting unchanged.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        base_url: str = GOOGLE_MAPS_BASE_URL,
+        timeout: float = GOOGLE_MAPS_TIMEOUT,
+        connect_timeout: float = GOOGLE_MAPS_CONNECT_TIMEOUT,
+        max_concurrency: int = GOOGLE_MAPS_MAX_CONCURRENCY,
+        max_keepalive: int = GOOGLE_MAPS_MAX_KEEPALIVE,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.key = key
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=httpx.Timeout(timeout, connect=connect_timeout),
+            limits=httpx.Limits(
+                max_connections=max_concurrency,
+                max_keepalive_connections=max_keepalive,
+            ),
+            transport=transport,
+        )
+
+    async def _request(self, path: str, params: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        params = {k: v for k, v in params.items() if v is not None}
+        params["key"] = self.key
+
+        async with self._semaphore:
+            response = await self._client.get(path, params=params, timeout=timeout or self.timeout)
+
+        response.raise_for_status()
+        body = response.json()
+
+        status = body.get("status")
+        if status not in OK_STATUSES:
+            raise MapsApiError(status, body.get("error_message"))
+
+        return body
+
+    async def places(
+        self,
+        query: str,
+        location: Optional[Dict[str, float]] = None,
+        radius: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Places text search"""
+        return await self._request(
+            "/maps/api/place/textsearch/json",
+            {
+                "query": query,
+                "location": _format_latlng(location) if location else None,
+                "radius": radius,
+            },
+            timeout,
+        )
+
+    async def place(self, place_id: str, fields: Optional[List[str]] = None, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Place details"""
+        return await self._request(
+            "/maps/api/place/details/json",
+            {
+                "place_id": place_id,
+                "fields": ",".join(fields) if fields else None,
+            },
+            timeout,
+        )
+
+    async def directions(
+        self,
+        origin: str,
+        destination: str,
+        waypoints: Optional[List[str]] = None,
+        mode: Optional[str] = None,
+        alternatives: bool = False,
+        timeout: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """Directions between locations, returns the list of routes"""
+        body = await self._request(
+            "/maps/api/directions/json",
+            {
+                "origin": origin,
+                "destination": destination,
+                "waypoints": "|".join(waypoints) if waypoints else None,
+                "mode": mode,
+                "alternatives": "true" if alternatives else None,
+            },
+            timeout,
+        )
+        return body.get("routes", [])
+
+    async def geocode(self, address: str, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Address to coordinates, returns the list of results"""
+        body = await self._request("/maps/api/geocode/json", {"address": address}, timeout)
+        return body.get("results", [])
+
+    async def reverse_geocode(self, latlng: Tuple[float, float], timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Coordinates to address, returns the list of results"""
+        body = await self._request("/maps/api/geocode/json", {"latlng": _format_latlng(latlng)}, timeout)
+        return body.get("results", [])
+
+    async def aclose(self):
+        await self._client.aclose()
+
+
+_maps_client: Optional[AsyncMapsClient] = None
+
+
+def get_maps_client() -> AsyncMapsClient:
+    """Return the process-wide maps client, creating it on first use"""
+    global _maps_client
+    if _maps_client is None:
+        _maps_client = AsyncMapsClient(key=config("GOOGLE_MAPS_API_KEY"))
+    return _maps_client
+
+
+async def close_maps_client():
+    global _maps_client
+    if _maps_client is not None:
+        await _maps_client.aclose()
+        _maps_client = None
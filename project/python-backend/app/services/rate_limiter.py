@@ -0,0 +1,181 @@
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, NamedTuple, Optional, Tuple
+
+# A store decision: the new theoretical arrival time to persist (None keeps the
+# stored one) and the result to hand back to the caller
+Decision = Tuple[Optional[float], "RateLimitResult"]
+
+# Epoch timestamps carry ~0.2us of float error; absorb it in comparisons
+_EPSILON = 1e-6
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitResult(NamedTuple):
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: float
+    retry_after: float
+
+
+class MemoryStore:
+    """Per-process GCRA state: one float per client, bounded and idle-evicted.
+
+    A key whose theoretical arrival time has passed is indistinguishable from a
+    new one, so it can be dropped. Keys are kept in LRU order; idle keys are
+    swept from the cold end and the coldest live key goes once the cap is hit.
+    """
+
+    blocking = False
+
+    def __init__(self, max_entries: int = 100000):
+        self.max_entries = max_entries
+        self._tats: "OrderedDict[str, float]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._tats)
+
+    def open(self):
+        pass
+
+    def transact(self, key: str, now: float, decide: Callable[[Optional[float]], Decision]) -> "RateLimitResult":
+        tat, result = decide(self._tats.get(key))
+        if tat is not None:
+            self._tats[key] = tat
+            self._tats.move_to_end(key)
+            self._evict(now)
+        return result
+
+    def _evict(self, now: float):
+        tats = self._tats
+        # Sweep a few idle keys per write so eviction cost stays O(1) amortized
+        for _ in range(2):
+            if not tats:
+                break
+            key, tat = next(iter(tats.items()))
+            if tat > now:
+                break
+            del tats[key]
+        while len(tats) > self.max_entries:
+            tats.popitem(last=False)
+
+    def close(self):
+        pass
+
+
+class SQLiteStore:
+    """GCRA state in a SQLite file so every worker on the host shares one budget.
+
+    Each decision is a short IMMEDIATE transaction: read the arrival time,
+    decide, write it back. State is disposable, so durability is relaxed.
+    Transactions wait on other workers' locks, so async callers run them in a
+    thread (see GCRALimiter.check).
+    """
+
+    blocking = True
+    PRUNE_EVERY = 1000
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def open(self):
+        """Connect and create the table; done at startup, or else by the first decision"""
+        with self._lock:
+            self._open()
+
+    def _open(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, timeout=1.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute("CREATE TABLE IF NOT EXISTS rate_limits (key TEXT PRIMARY KEY, tat REAL NOT NULL)")
+            self._conn = conn
+        return self._conn
+
+    def transact(self, key: str, now: float, decide: Callable[[Optional[float]], Decision]) -> "RateLimitResult":
+        with self._lock:
+            conn = self._open()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute("SELECT tat FROM rate_limits WHERE key = ?", (key,)).fetchone()
+                tat, result = decide(row[0] if row else None)
+                if tat is not None:
+                    conn.execute(
+                        "INSERT INTO rate_limits (key, tat) VALUES (?, ?) "
+                        "ON CONFLICT(key) DO UPDATE SET tat = excluded.tat",
+                        (key, tat),
+                    )
+                    self._writes += 1
+                    if self._writes % self.PRUNE_EVERY == 0:
+                        conn.execute("DELETE FROM rate_limits WHERE tat <= ?", (now,))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return result
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class GCRALimiter:
+    """Generic cell rate algorithm: `limit` units per `period` seconds, bursts up to `limit`.
+
+    The only state per key is its theoretical arrival time (TAT). A request
+    costing n units pushes the TAT n emission intervals into the future and is
+    allowed while the TAT stays within one period of now.
+    """
+
+    def __init__(self, limit: int, period: float, store=None):
+        self.limit = limit
+        self.period = period
+        self.interval = period / limit
+        self.store = store if store is not None else MemoryStore()
+
+    def hit(self, key: str, cost: int = 1, now: Optional[float] = None) -> RateLimitResult:
+        now = time.time() if now is None else now
+        return self.store.transact(key, now, lambda tat: self._decide(tat, now, cost))
+
+    async def check(self, key: str, cost: int = 1) -> RateLimitResult:
+        """hit() without blocking the event loop; fails open when the shared store is locked"""
+        if not self.store.blocking:
+            return self.hit(key, cost)
+        now = time.time()
+        try:
+            return await asyncio.to_thread(self.hit, key, cost, now)
+        except sqlite3.OperationalError as error:
+            logger.warning("Rate limit store unavailable, allowing request: %s", error)
+            return self._decide(None, now, cost)[1]
+
+    def _decide(self, tat: Optional[float], now: float, cost: int) -> Decision:
+        base = now if tat is None or tat < now else tat
+        new_tat = base + cost * self.interval
+        backlog = new_tat - now
+        if backlog <= self.period + _EPSILON:
+            remaining = max(0, int((self.period - backlog) / self.interval + _EPSILON))
+            return new_tat, RateLimitResult(True, self.limit, remaining, backlog, 0.0)
+
+        current = base - now
+        # A cost above the limit can never pass; report a full period rather than forever
+        retry_after = backlog - self.period if cost <= self.limit else self.period
+        remaining = max(0, int((self.period - current) / self.interval + _EPSILON))
+        return None, RateLimitResult(False, self.limit, remaining, current, retry_after)
+
+
+def create_store(path: Optional[str] = None, max_entries: int = 100000):
+    """SQLite-backed store shared across workers when a path is given, else in-memory"""
+    if path:
+        return SQLiteStore(path)
+    return MemoryStore(max_entries)
@@ -0,0 +1,50 @@
+import re
+from typing import List
+
+import sqlalchemy
+from sqlalchemy import func, literal_column
+
+from app.database import IS_SQLITE, destinations_table
+
+# BM25 column weights, in SEARCH_COLUMNS order: name, city, country, short_description, description
+BM25_WEIGHTS = (10.0, 5.0, 5.0, 2.0, 1.0)
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+destinations_fts = sqlalchemy.table("destinations_fts", sqlalchemy.column("rowid"))
+
+
+def search_tokens(term: str) -> List[str]:
+    """Split free text into index tokens; punctuation never reaches the query parser"""
+    return _TOKEN.findall(term.lower())
+
+
+def apply_full_text_search(query, term: str):
+    """Restrict a destinations select to full-text matches, most relevant first.
+
+    Every token must match, and the last token also matches as a prefix so
+    results keep up with partially typed words.
+    """
+    tokens = search_tokens(term)
+    if not tokens:
+        return query
+
+    if IS_SQLITE:
+        match = " ".join(f'"{token}"' for token in tokens[:-1])
+        match = f'{match} "{tokens[-1]}"*'.strip()
+        fts = literal_column("destinations_fts")
+        return query.select_from(
+            destinations_table.join(destinations_fts, destinations_fts.c.rowid == literal_column("destinations.rowid"))
+        ).where(
+            fts.op("MATCH")(match)
+        ).order_by(
+            func.bm25(fts, *BM25_WEIGHTS)
+        )
+
+    search_vector = literal_column("destinations.search_vector")
+    ts_query = func.to_tsquery("simple", " & ".join(tokens[:-1] + [f"{tokens[-1]}:*"]))
+    return query.where(
+        search_vector.op("@@")(ts_query)
+    ).order_by(
+        func.ts_rank(search_vector, ts_query).desc()
+    )
@@ -0,0 +1,68 @@
+import mmap
+import os
+import stat
+import struct
+import tempfile
+import zlib
+from typing import Optional
+
+_COUNTER = struct.Struct("<Q")
+
+
+def runtime_directory() -> str:
+    """Per-user directory for shared state files: the runtime dir, else a 0700 one under the temp dir"""
+    return os.environ.get("XDG_RUNTIME_DIR") or os.path.join(tempfile.gettempdir(), f"globe_trotter-{os.getuid()}")
+
+
+def _private_directory(path: str):
+    """Create `path` for this user only, and refuse one someone else made or can write to"""
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise RuntimeError(f"{path} must be a directory private to this user")
+
+
+class SharedCounters:
+    """Fixed table of 64-bit values by key, shared by every worker on the host.
+
+    Keys hash into the slots of a memory-mapped file, so a write in one process
+    is visible to the others on their next read with no syscall. Keys can
+    collide; callers must treat that as harmless. Without a path the table is
+    process-local. The file is mapped by open(), at startup.
+    """
+
+    def __init__(self, path: Optional[str] = None, slots: int = 4096):
+        self.path = path
+        self.slots = slots
+        self._buffer = bytearray(slots * _COUNTER.size)
+
+    def open(self):
+        if not self.path or isinstance(self._buffer, mmap.mmap):
+            return
+        size = self.slots * _COUNTER.size
+        if os.path.dirname(self.path) == runtime_directory():
+            _private_directory(runtime_directory())
+        # Never follow a planted symlink, and only share a file this user owns
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT | getattr(os, "O_NOFOLLOW", 0), 0o600)
+        try:
+            info = os.fstat(fd)
+            if not stat.S_ISREG(info.st_mode) or info.st_uid != os.getuid():
+                raise RuntimeError(f"{self.path} must be a regular file owned by this user")
+            if info.st_size < size:
+                os.ftruncate(fd, size)
+            self._buffer = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+
+    def _offset(self, key: str) -> int:
+        return (zlib.crc32(key.encode()) % self.slots) * _COUNTER.size
+
+    def get(self, key: str) -> int:
+        return _COUNTER.unpack_from(self._buffer, self._offset(key))[0]
+
+    def set(self, key: str, value: int):
+        _COUNTER.pack_into(self._buffer, self._offset(key), value & 0xFFFFFFFFFFFFFFFF)
+
+    def close(self):
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
@@ -0,0 +1,62 @@
+import asyncio
+import json
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+def make_key(namespace: str, payload: Any) -> str:
+    """Build a normalized coalescing key from a request model, dict or prompt string"""
+    if isinstance(payload, BaseModel):
+        payload = payload.dict()
+    if isinstance(payload, str):
+        normalized = " ".join(payload.split())
+    else:
+        normalized = json.dumps(payload, sort_keys=True, default=str, separators=(",", ":"))
+    return f"{namespace}:{normalized}"
+
+
+class SingleFlight:
+    """Coalesce concurrent identical calls onto one shared upstream future.
+
+    The first caller for a key starts the upstream call as its own task; callers
+    arriving while it is in flight await the same task. A cancelled caller does
+    not cancel the shared call for everyone else.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.calls = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return await asyncio.shield(task)
+
+        self.calls += 1
+        task = asyncio.ensure_future(fn())
+        self._inflight[key] = task
+        task.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: asyncio.Future):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception as retrieved even if every waiter was cancelled
+        if not task.cancelled() and task.exception() is not None:
+            self.errors += 1
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.calls + self.coalesced
+        return {
+            "upstream_calls": self.calls,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "in_flight": len(self._inflight),
+            "coalesced_ratio": round(self.coalesced / total, 4) if total else 0.0,
+        }
@@ -0,0 +1,89 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple
+
+from app.services.cache import CacheStats
+from app.services.geo import geohash_cell, geohash_neighborhood, haversine_km
+
+
+class SpatialCache:
+    """Cache keyed on location that answers with the nearest stored point.
+
+    Points are bucketed into a grid of geohash cells at ``precision``; a lookup
+    inspects the query cell and its eight neighbours, so the cost does not depend
+    on how many points are cached. ``tolerance_m`` should stay below the cell
+    size (about 150 m at precision 7) for the neighbourhood to cover it.
+    """
+
+    def __init__(self, precision: int = 7, tolerance_m: float = 50.0, maxsize: int = 50000, ttl: float = 86400):
+        self.precision = precision
+        self.tolerance_km = tolerance_m / 1000.0
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stats = CacheStats()
+        # Points are de-duplicated on a geohash two characters finer than the grid
+        self._points: "OrderedDict[Tuple[int, int], tuple]" = OrderedDict()
+        self._cells: Dict[Tuple[int, int], Set[Tuple[int, int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def get(self, lat: float, lng: float) -> Optional[Any]:
+        now = time.monotonic()
+        best_key = None
+        best_distance = self.tolerance_km
+        expired = []
+
+        for cell in geohash_neighborhood(geohash_cell(lat, lng, self.precision), self.precision):
+            for point_key in self._cells.get(cell, ()):
+                point_lat, point_lng, _, expires_at, _ = self._points[point_key]
+                if expires_at <= now:
+                    expired.append(point_key)
+                    continue
+                distance = haversine_km(lat, lng, point_lat, point_lng)
+                if distance <= best_distance:
+                    best_key = point_key
+                    best_distance = distance
+
+        for point_key in expired:
+            self._remove(point_key)
+        self.stats.expirations += len(expired)
+
+        if best_key is None:
+            self.stats.misses += 1
+            return None
+
+        self._points.move_to_end(best_key)
+        self.stats.hits += 1
+        return self._points[best_key][2]
+
+    def set(self, lat: float, lng: float, value: Any):
+        point_key = geohash_cell(lat, lng, self.precision + 2)
+        cell = geohash_cell(lat, lng, self.precision)
+        self._points[point_key] = (lat, lng, value, time.monotonic() + self.ttl, cell)
+        self._points.move_to_end(point_key)
+        self._cells.setdefault(cell, set()).add(point_key)
+
+        while len(self._points) > self.maxsize:
+            self._remove(next(iter(self._points)))
+            self.stats.evictions += 1
+
+    def _remove(self, point_key: Tuple[int, int]):
+        cell = self._points.pop(point_key)[4]
+        members = self._cells[cell]
+        members.discard(point_key)
+        if not members:
+            del self._cells[cell]
+
+    def clear(self):
+        self._points.clear()
+        self._cells.clear()
+
+    def stats_dict(self) -> Dict[str, Any]:
+        return {
+            **self.stats.as_dict(),
+            "size": len(self._points),
+            "cells": len(self._cells),
+            "precision": self.precision,
+            "tolerance_m": self.tolerance_km * 1000,
+        }
@@ -0,0 +1,199 @@
+import heapq
+import math
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.services.geo import EARTH_RADIUS_KM
+
+LEAF_SIZE = 16
+
+
+def _to_unit_vector(lat: float, lng: float) -> Tuple[float, float, float]:
+    phi = math.radians(lat)
+    lmb = math.radians(lng)
+    cos_phi = math.cos(phi)
+    return (cos_phi * math.cos(lmb), cos_phi * math.sin(lmb), math.sin(phi))
+
+
+def _km_to_chord_sq(distance_km: float) -> float:
+    angle = min(distance_km / EARTH_RADIUS_KM, math.pi)
+    chord = 2 * math.sin(angle / 2)
+    return chord * chord
+
+
+def _chord_sq_to_km(chord_sq: float) -> float:
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(chord_sq) / 2))
+
+
+class SpatialIndex:
+    """KD-tree over unit-sphere coordinates for radius and k-nearest queries.
+
+    Points live on the unit sphere, so the straight-line (chord) distance is a
+    monotonic function of the great-circle distance and the tree can prune with
+    plain Euclidean bounds. Inserts go to a small pending buffer that is scanned
+    linearly and folded into the tree once it outgrows ``sqrt(n)``; removals are
+    tombstoned. Queries cost O(log n + k) on the tree plus the buffer scan.
+    """
+
+    def __init__(self):
+        self._ids: List[str] = []
+        self._points: List[Tuple[float, float, float]] = []
+        self._positions: Dict[str, int] = {}
+        self._removed = set()
+        self._pending: List[int] = []
+        # Flat node arrays: leaves have _left == -1 and own _order[_start:_end]
+        self._order: List[int] = []
+        self._start: List[int] = []
+        self._end: List[int] = []
+        self._axis: List[int] = []
+        self._split: List[float] = []
+        self._left: List[int] = []
+        self._right: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, point_id: str) -> bool:
+        return point_id in self._positions
+
+    def rebuild(self, points: Iterable[Tuple[str, float, float]]):
+        """Replace the index contents with (id, latitude, longitude) triples"""
+        self._ids = []
+        self._points = []
+        self._positions = {}
+        self._removed = set()
+        self._pending = []
+        for point_id, lat, lng in points:
+            if lat is None or lng is None:
+                continue
+            self._positions[point_id] = len(self._ids)
+            self._ids.append(point_id)
+            self._points.append(_to_unit_vector(lat, lng))
+        self._build(list(range(len(self._ids))))
+
+    def insert(self, point_id: str, lat: float, lng: float):
+        if point_id in self._positions:
+            self.remove(point_id)
+        position = len(self._ids)
+        self._positions[point_id] = position
+        self._ids.append(point_id)
+        self._points.append(_to_unit_vector(lat, lng))
+        self._pending.append(position)
+
+        if len(self._pending) > max(64, int(math.sqrt(len(self._positions)))):
+            self._compact()
+
+    def remove(self, point_id: str):
+        position = self._positions.pop(point_id, None)
+        if position is not None:
+            self._removed.add(position)
+
+    def _compact(self):
+        live = sorted(self._positions.items(), key=lambda item: item[1])
+        self._ids = [point_id for point_id, _ in live]
+        self._points = [self._points[position] for _, position in live]
+        self._positions = {point_id: position for position, point_id in enumerate(self._ids)}
+        self._removed = set()
+        self._pending = []
+        self._build(list(range(len(self._ids))))
+
+    def _build(self, order: List[int]):
+        self._order = order
+        self._start, self._end, self._axis, self._split, self._left, self._right = [], [], [], [], [], []
+        if not order:
+            return
+
+        points = self._points
+        self._new_node(0, len(order))
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            start, end = self._start[node], self._end[node]
+            if end - start <= LEAF_SIZE:
+                continue
+
+            segment = order[start:end]
+            # Split on the axis with the widest spread
+            spreads = []
+            for axis in range(3):
+                values = [points[i][axis] for i in segment]
+                spreads.append(max(values) - min(values))
+            axis = spreads.index(max(spreads))
+
+            segment.sort(key=lambda i: points[i][axis])
+            order[start:end] = segment
+            mid = start + (end - start) // 2
+
+            self._axis[node] = axis
+            self._split[node] = points[order[mid]][axis]
+            self._left[node] = self._new_node(start, mid)
+            self._right[node] = self._new_node(mid, end)
+            stack.append(self._left[node])
+            stack.append(self._right[node])
+
+    def _new_node(self, start: int, end: int) -> int:
+        self._start.append(start)
+        self._end.append(end)
+        self._axis.append(0)
+        self._split.append(0.0)
+        self._left.append(-1)
+        self._right.append(-1)
+        return len(self._start) - 1
+
+    def query(
+        self,
+        lat: float,
+        lng: float,
+        k: int = 20,
+        radius_km: Optional[float] = None,
+    ) -> List[Tuple[str, float]]:
+        """Return up to k (id, distance_km) pairs nearest the point, closest first"""
+        if k <= 0 or not self._positions:
+            return []
+
+        qx, qy, qz = query = _to_unit_vector(lat, lng)
+        bound = _km_to_chord_sq(radius_km) if radius_km is not None else 4.0
+        points = self._points
+        removed = self._removed
+        # Max-heap of the best k candidates as (-chord_sq, position)
+        heap: List[Tuple[float, int]] = []
+
+        def consider(position: int):
+            nonlocal bound
+            if position in removed:
+                return
+            px, py, pz = points[position]
+            d = (px - qx) ** 2 + (py - qy) ** 2 + (pz - qz) ** 2
+            if d > bound:
+                return
+            if len(heap) < k:
+                heapq.heappush(heap, (-d, position))
+            else:
+                heapq.heapreplace(heap, (-d, position))
+            if len(heap) == k:
+                bound = -heap[0][0]
+
+        if self._order:
+            # Entries carry a lower bound on the squared distance to their subtree
+            stack = [(0, 0.0)]
+            order = self._order
+            while stack:
+                node, min_d = stack.pop()
+                if min_d > bound:
+                    continue
+                left = self._left[node]
+                if left == -1:
+                    for i in range(self._start[node], self._end[node]):
+                        consider(order[i])
+                    continue
+
+                diff = query[self._axis[node]] - self._split[node]
+                near, far = (left, self._right[node]) if diff < 0 else (self._right[node], left)
+                # Far side is pushed first so the near side is explored first
+                stack.append((far, max(min_d, diff * diff)))
+                stack.append((near, min_d))
+
+        for position in self._pending:
+            consider(position)
+
+        results = sorted((-neg_d, position) for neg_d, position in heap)
+        return [(self._ids[position], _chord_sq_to_km(d)) for d, position in results]
@@ -0,0 +1,86 @@
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.services.cache import CacheStats
+from app.services.shared_counters import SharedCounters, runtime_directory
+
+
+def default_generations_path() -> str:
+    return os.path.join(runtime_directory(), "user_generations")
+
+
+class GenerationCounters(SharedCounters):
+    """Per-key invalidation counters shared by every worker on the host.
+
+    Colliding keys only cause extra invalidations.
+    """
+
+    def bump(self, key: str):
+        # A lost race between two bumps still moves the counter off the cached value
+        self.set(key, self.get(key) + 1)
+
+
+class UserCache:
+    """Bounded TTL cache of resolved users keyed by token subject.
+
+    Each entry remembers the subject's generation at load time and is stale as
+    soon as any worker bumps it, so profile updates and deletions take effect
+    everywhere on the next request; the TTL covers workers on other hosts.
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 60, generations_path: Optional[str] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self.generations = GenerationCounters(generations_path)
+        self._data: "OrderedDict[str, Tuple[Any, float, int]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def generation(self, subject: str) -> int:
+        """Read before loading a user and pass to set(), so a concurrent invalidation wins"""
+        return self.generations.get(subject)
+
+    def get(self, subject: str) -> Optional[Any]:
+        entry = self._data.get(subject)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+
+        user, expires_at, generation = entry
+        if expires_at <= time.monotonic() or generation != self.generations.get(subject):
+            del self._data[subject]
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+
+        self._data.move_to_end(subject)
+        self.stats.hits += 1
+        return user
+
+    def set(self, subject: str, user: Any, generation: int):
+        if generation != self.generations.get(subject):
+            return
+        if subject in self._data:
+            self._data.move_to_end(subject)
+        self._data[subject] = (user, time.monotonic() + self.ttl, generation)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.stats.evictions += 1
+
+    def invalidate(self, subject: str):
+        self._data.pop(subject, None)
+        self.generations.bump(subject)
+
+    def stats_dict(self) -> Dict[str, Any]:
+        return {**self.stats.as_dict(), "entries": len(self._data)}
+
+    def open(self):
+        """Map the shared generation counters; call at startup, before serving requests"""
+        self.generations.open()
+
+    def close(self):
+        self.generations.close()
@@ -0,0 +1,159 @@
+from collections import Counter
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+import sqlalchemy
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.database import IS_SQLITE, bookings_table, database, reviews_table, trips_table, user_stats_table, users_table
+
+ROLLUP_COLUMNS = [
+    "total_trips",
+    "completed_trips",
+    "total_budget",
+    "total_bookings",
+    "total_spent",
+    "total_reviews",
+    "rating_sum",
+]
+
+_insert = sqlite.insert if IS_SQLITE else postgresql.insert
+
+
+def _trip(row: Mapping[str, Any]) -> Dict[str, float]:
+    return {
+        "total_trips": 1,
+        "completed_trips": int(row["status"] == "completed"),
+        "total_budget": row["total_budget"] or 0.0,
+    }
+
+
+def _booking(row: Mapping[str, Any]) -> Dict[str, float]:
+    # Only confirmed bookings count, as they always have on the stats page
+    if row["status"] != "confirmed":
+        return {}
+    return {"total_bookings": 1, "total_spent": row["amount"] or 0.0}
+
+
+def _review(row: Mapping[str, Any]) -> Dict[str, float]:
+    return {"total_reviews": 1, "rating_sum": row["rating"] or 0}
+
+
+_CONTRIBUTIONS: Dict[str, Callable[[Mapping[str, Any]], Dict[str, float]]] = {
+    "trips": _trip,
+    "bookings": _booking,
+    "reviews": _review,
+}
+
+
+async def record_change(
+    table: str,
+    user_id: str,
+    before: Optional[Mapping[str, Any]] = None,
+    after: Optional[Mapping[str, Any]] = None,
+):
+    """Fold one row change into the user's rollup.
+
+    Pass the row as it was (None for an insert) and as it is now (None for a
+    delete). Call inside the transaction that made the change.
+    """
+    delta = Counter()
+    if after is not None:
+        delta.update(_CONTRIBUTIONS[table](after))
+    if before is not None:
+        delta.subtract(_CONTRIBUTIONS[table](before))
+    delta = {column: value for column, value in delta.items() if value}
+    if not delta:
+        return
+
+    statement = _insert(user_stats_table).values(user_id=user_id, **delta)
+    statement = statement.on_conflict_do_update(
+        index_elements=[user_stats_table.c.user_id],
+        set_={
+            **{column: user_stats_table.c[column] + statement.excluded[column] for column in delta},
+            "updated_at": sqlalchemy.func.now(),
+        },
+    )
+    await database.execute(statement)
+
+
+def _aggregates(user_ids: Optional[List[str]] = None):
+    """Rollup values recomputed from the base tables, one row per user"""
+    users, trips, bookings, reviews = users_table, trips_table, bookings_table, reviews_table
+
+    def scalar(expression, table, *conditions):
+        return (
+            sqlalchemy.select(expression)
+            .select_from(table)
+            .where(table.c.user_id == users.c.id, *conditions)
+            .scalar_subquery()
+        )
+
+    query = sqlalchemy.select(
+        users.c.id.label("user_id"),
+        scalar(sqlalchemy.func.count(), trips).label("total_trips"),
+        scalar(sqlalchemy.func.count(), trips, trips.c.status == "completed").label("completed_trips"),
+        scalar(sqlalchemy.func.coalesce(sqlalchemy.func.sum(trips.c.total_budget), 0.0), trips).label("total_budget"),
+        scalar(sqlalchemy.func.count(), bookings, bookings.c.status == "confirmed").label("total_bookings"),
+        scalar(
+            sqlalchemy.func.coalesce(sqlalchemy.func.sum(bookings.c.amount), 0.0), bookings, bookings.c.status == "confirmed"
+        ).label("total_spent"),
+        scalar(sqlalchemy.func.count(), reviews).label("total_reviews"),
+        scalar(sqlalchemy.func.coalesce(sqlalchemy.func.sum(reviews.c.rating), 0), reviews).label("rating_sum"),
+    )
+    if user_ids is not None:
+        query = query.where(users.c.id.in_(user_ids))
+    return query
+
+
+async def _user_ids(user_id: Optional[str]) -> List[str]:
+    if user_id is not None:
+        return [user_id]
+    return [row["id"] for row in await database.fetch_all(sqlalchemy.select(users_table.c.id))]
+
+
+async def rebuild(user_id: Optional[str] = None, chunk_size: int = 500) -> int:
+    """Recompute and overwrite the rollup for one user, or for every user.
+
+    Each chunk is read and written in one transaction; a change committed by
+    another worker mid-chunk can still be lost, so follow up with a check.
+    """
+    statement = _insert(user_stats_table)
+    statement = statement.on_conflict_do_update(
+        index_elements=[user_stats_table.c.user_id],
+        set_={
+            **{column: statement.excluded[column] for column in ROLLUP_COLUMNS},
+            "updated_at": sqlalchemy.func.now(),
+        },
+    )
+    user_ids = await _user_ids(user_id)
+    for start in range(0, len(user_ids), chunk_size):
+        async with database.transaction():
+            rows = await database.fetch_all(_aggregates(user_ids[start:start + chunk_size]))
+            if rows:
+                await database.execute_many(statement, [dict(row) for row in rows])
+    return len(user_ids)
+
+
+async def find_mismatches(user_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Users whose stored rollup differs from a fresh recomputation"""
+    expected = {
+        row["user_id"]: dict(row)
+        for row in await database.fetch_all(_aggregates(None if user_id is None else [user_id]))
+    }
+    stored_query = user_stats_table.select()
+    if user_id is not None:
+        stored_query = stored_query.where(user_stats_table.c.user_id == user_id)
+    stored = {row["user_id"]: dict(row) for row in await database.fetch_all(stored_query)}
+
+    mismatches = []
+    for uid, values in expected.items():
+        actual = stored.get(uid, {})
+        diff = {
+            column: {"expected": values[column], "stored": actual.get(column, 0)}
+            for column in ROLLUP_COLUMNS
+            # Budgets and amounts are floats summed incrementally; allow rounding drift
+            if abs((values[column] or 0) - (actual.get(column) or 0)) > 1e-6 * max(1.0, abs(values[column] or 0))
+        }
+        if diff:
+            mismatches.append({"user_id": uid, "columns": diff})
+    return mismatches
@@ -0,0 +1,150 @@
+"""initial schema
+
+Adopts a database made by the old startup DDL: tables that already exist are
+kept, and only the indexes and full-text search objects they lack are added.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.database import POSTGRES_SEARCH_DDL, SQLITE_SEARCH_DDL
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _create_table(name, *columns):
+    if not sa.inspect(op.get_bind()).has_table(name):
+        op.create_table(name, *columns)
+
+
+def _create_index(name, table, columns, unique=False):
+    if name not in {index["name"] for index in sa.inspect(op.get_bind()).get_indexes(table)}:
+        op.create_index(name, table, columns, unique=unique)
+
+
+def upgrade():
+    _create_table(
+        "users",
+        sa.Column("id", sa.String, primary_key=True),
+        sa.Column("email", sa.String),
+        sa.Column("google_id", sa.String, unique=True, nullable=True),
+        sa.Column("first_name", sa.String),
+        sa.Column("last_name", sa.String),
+        sa.Column("profile_image_url", sa.String, nullable=True),
+        sa.Column("is_active", sa.Boolean),
+        sa.Column("travel_preferences", sa.JSON, nullable=True),
+        sa.Column("created_at", sa.DateTime, server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime, server_default=sa.func.now()),
+    )
+    _create_index("ix_users_email", "users", ["email"], unique=True)
+
+    _create_table(
+        "destinations",
+        sa.Column("id", sa.String, primary_key=True),
+        sa.Column("name", sa.String),
+        sa.Column("city", sa.String),
+        sa.Column("country", sa.String),
+        sa.Column("continent", sa.String),
+        sa.Column("latitude", sa.Float),
+        sa.Column("longitude", sa.Float),
+        sa.Column("description", sa.Text),
+        sa.Column("short_description", sa.String),
+        sa.Column("avg_rating", sa.Float),
+        sa.Column("review_count", sa.Integer),
+        sa.Column("average_price", sa.Float),
+        sa.Column("currency", sa.String),
+        sa.Column("safety_index", sa.Integer),
+        sa.Column("avg_temperature", sa.Float),
+        sa.Column("activity_categories", sa.JSON),
+        sa.Column("image_url", sa.String),
+        sa.Column("is_featured", sa.Boolean),
+        sa.Column("is_active", sa.Boolean),
+        sa.Column("created_at", sa.DateTime, server_default=sa.func.now()),
+    )
+    _create_index("ix_destinations_name", "destinations", ["name"])
+    _create_index("ix_destinations_country", "destinations", ["country"])
+    _create_index("ix_destinations_active_rating_id", "destinations", ["is_active", "avg_rating", "id"])
+
+    _create_table(
+        "trips",
+        sa.Column("id", sa.String, primary_key=True),
+        sa.Column("user_id", sa.String, sa.ForeignKey("users.id")),
+        sa.Column("title", sa.String),
+        sa.Column("description", sa.Text, nullable=True),
+        sa.Column("start_date", sa.Date),
+        sa.Column("end_date", sa.Date),
+        sa.Column("traveler_count", sa.Integer),
+        sa.Column("total_budget", sa.Float),
+        sa.Column("currency", sa.String),
+        sa.Column("status", sa.String),
+        sa.Column("privacy_level", sa.String),
+        sa.Column("destinations", sa.JSON),
+        sa.Column("ai_suggestions", sa.JSON, nullable=True),
+        sa.Column("created_at", sa.DateTime, server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime, server_default=sa.func.now()),
+    )
+    _create_index("ix_trips_user_created_id", "trips", ["user_id", "created_at", "id"])
+
+    _create_table(
+        "bookings",
+        sa.Column("id", sa.String, primary_key=True),
+        sa.Column("user_id", sa.String, sa.ForeignKey("users.id")),
+        sa.Column("trip_id", sa.String, sa.ForeignKey("trips.id"), nullable=True),
+        sa.Column("booking_type", sa.String),
+        sa.Column("status", sa.String),
+        sa.Column("amount", sa.Float),
+        sa.Column("currency", sa.String),
+        sa.Column("booking_details", sa.JSON),
+        sa.Column("service_date", sa.Date),
+        sa.Column("created_at", sa.DateTime, server_default=sa.func.now()),
+    )
+    _create_index("ix_bookings_user_created_id", "bookings", ["user_id", "created_at", "id"])
+
+    _create_table(
+        "reviews",
+        sa.Column("id", sa.String, primary_key=True),
+        sa.Column("user_id", sa.String, sa.ForeignKey("users.id")),
+        sa.Column("destination_id", sa.String, sa.ForeignKey("destinations.id")),
+        sa.Column("trip_id", sa.String, sa.ForeignKey("trips.id"), nullable=True),
+        sa.Column("rating", sa.Integer),
+        sa.Column("title", sa.String, nullable=True),
+        sa.Column("content", sa.Text),
+        sa.Column("is_approved", sa.Boolean),
+        sa.Column("helpful_votes", sa.Integer),
+        sa.Column("created_at", sa.DateTime, server_default=sa.func.now()),
+    )
+
+    # Full-text search index (FTS5 table + triggers, or tsvector + GIN)
+    bind = op.get_bind()
+    statements = {"sqlite": SQLITE_SEARCH_DDL, "postgresql": POSTGRES_SEARCH_DDL}.get(bind.dialect.name, [])
+    if bind.dialect.name == "sqlite" and sa.inspect(bind).has_table("destinations_fts"):
+        # Already there: just make sure of the triggers, then reindex
+        statements = SQLITE_SEARCH_DDL[1:]
+    for statement in statements:
+        op.execute(statement)
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        for trigger in ("destinations_fts_insert", "destinations_fts_delete", "destinations_fts_update"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS destinations_fts")
+
+    op.drop_table("reviews")
+    op.drop_index("ix_bookings_user_created_id", table_name="bookings")
+    op.drop_table("bookings")
+    op.drop_index("ix_trips_user_created_id", table_name="trips")
+    op.drop_table("trips")
+    op.drop_index("ix_destinations_active_rating_id", table_name="destinations")
+    op.drop_index("ix_destinations_country", table_name="destinations")
+    op.drop_index("ix_destinations_name", table_name="destinations")
+    op.drop_table("destinations")
+    op.drop_index("ix_users_email", table_name="users")
+    op.drop_table("users")
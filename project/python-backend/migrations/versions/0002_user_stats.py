@@ -0,0 +1,47 @@
+"""user stats rollup
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+BACKFILL = """
+INSERT INTO user_stats (user_id, total_trips, completed_trips, total_budget, total_bookings, total_spent, total_reviews, rating_sum)
+SELECT
+    u.id,
+    (SELECT COUNT(*) FROM trips t WHERE t.user_id = u.id),
+    (SELECT COUNT(*) FROM trips t WHERE t.user_id = u.id AND t.status = 'completed'),
+    (SELECT COALESCE(SUM(t.total_budget), 0) FROM trips t WHERE t.user_id = u.id),
+    (SELECT COUNT(*) FROM bookings b WHERE b.user_id = u.id AND b.status = 'confirmed'),
+    (SELECT COALESCE(SUM(b.amount), 0) FROM bookings b WHERE b.user_id = u.id AND b.status = 'confirmed'),
+    (SELECT COUNT(*) FROM reviews r WHERE r.user_id = u.id),
+    (SELECT COALESCE(SUM(r.rating), 0) FROM reviews r WHERE r.user_id = u.id)
+FROM users u
+"""
+
+
+def upgrade():
+    op.create_table(
+        "user_stats",
+        sa.Column("user_id", sa.String, sa.ForeignKey("users.id"), primary_key=True),
+        sa.Column("total_trips", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("completed_trips", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("total_budget", sa.Float, nullable=False, server_default="0"),
+        sa.Column("total_bookings", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("total_spent", sa.Float, nullable=False, server_default="0"),
+        sa.Column("total_reviews", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("rating_sum", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime, server_default=sa.func.now()),
+    )
+    op.execute(BACKFILL)
+
+
+def downgrade():
+    op.drop_table("user_stats")
@@ -0,0 +1,154 @@
+"""trip stops table replaces trips.destinations
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+import json
+import logging
+import uuid
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+trips = sa.table("trips", sa.column("id", sa.String), sa.column("destinations", sa.JSON))
+destinations = sa.table("destinations", sa.column("id", sa.String))
+trip_stops = sa.table(
+    "trip_stops",
+    sa.column("id", sa.String),
+    sa.column("trip_id", sa.String),
+    sa.column("destination_id", sa.String),
+    sa.column("sequence_order", sa.Float),
+    sa.column("arrival_date", sa.Date),
+    sa.column("departure_date", sa.Date),
+    sa.column("notes", sa.Text),
+    sa.column("budget", sa.Float),
+    sa.column("name", sa.String),
+    sa.column("latitude", sa.Float),
+    sa.column("longitude", sa.Float),
+)
+
+# JSON keys the old endpoint accepted, snake_case first
+KEYS = {
+    "destination_id": ("destination_id", "destinationId", "id"),
+    "arrival_date": ("arrival_date", "arrivalDate"),
+    "departure_date": ("departure_date", "departureDate"),
+    "notes": ("notes",),
+    "budget": ("budget",),
+    "name": ("name",),
+    "latitude": ("latitude", "lat"),
+    "longitude": ("longitude", "lng"),
+}
+
+
+def _pick(stop, keys):
+    for key in keys:
+        if stop.get(key) is not None:
+            return stop[key]
+    return None
+
+
+def _date(value):
+    try:
+        return date.fromisoformat(str(value)[:10]) if value else None
+    except ValueError:
+        return None
+
+
+def _float(value):
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _stop_rows(trip_id, stops, known_destinations):
+    if isinstance(stops, str):
+        stops = json.loads(stops)
+    rows = []
+    for order, stop in enumerate(stops or [], start=1):
+        if not isinstance(stop, dict):
+            # Bare destination ids
+            stop = {"destination_id": stop}
+        destination_id = _pick(stop, KEYS["destination_id"])
+        name, notes = _pick(stop, KEYS["name"]), _pick(stop, KEYS["notes"])
+        if destination_id is not None and destination_id not in known_destinations:
+            # The catalog lost this destination; keep the reference instead of blanking the stop
+            logger.warning("Trip %s stop %d: unknown destination %s kept in its notes", trip_id, order, destination_id)
+            reference = f"Unknown destination: {destination_id}"
+            name = name or str(destination_id)
+            notes = f"{notes}\n{reference}" if notes else reference
+            destination_id = None
+        rows.append({
+            "id": str(uuid.uuid4()),
+            "trip_id": trip_id,
+            "destination_id": destination_id,
+            "sequence_order": float(order),
+            "arrival_date": _date(_pick(stop, KEYS["arrival_date"])),
+            "departure_date": _date(_pick(stop, KEYS["departure_date"])),
+            "notes": notes,
+            "budget": _float(_pick(stop, KEYS["budget"])),
+            "name": name,
+            "latitude": _float(_pick(stop, KEYS["latitude"])),
+            "longitude": _float(_pick(stop, KEYS["longitude"])),
+        })
+    return rows
+
+
+def upgrade():
+    op.create_table(
+        "trip_stops",
+        sa.Column("id", sa.String, primary_key=True),
+        sa.Column("trip_id", sa.String, sa.ForeignKey("trips.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("destination_id", sa.String, sa.ForeignKey("destinations.id"), nullable=True),
+        sa.Column("sequence_order", sa.Float, nullable=False),
+        sa.Column("arrival_date", sa.Date, nullable=True),
+        sa.Column("departure_date", sa.Date, nullable=True),
+        sa.Column("notes", sa.Text, nullable=True),
+        sa.Column("budget", sa.Float, nullable=True),
+        sa.Column("name", sa.String, nullable=True),
+        sa.Column("latitude", sa.Float, nullable=True),
+        sa.Column("longitude", sa.Float, nullable=True),
+        sa.Column("created_at", sa.DateTime, server_default=sa.func.now()),
+    )
+    op.create_index("ix_trip_stops_trip_order", "trip_stops", ["trip_id", "sequence_order"], unique=True)
+    op.create_index("ix_trip_stops_destination_trip", "trip_stops", ["destination_id", "trip_id"])
+
+    connection = op.get_bind()
+    known_destinations = {row[0] for row in connection.execute(sa.select(destinations.c.id))}
+    for trip in connection.execute(sa.select(trips.c.id, trips.c.destinations)):
+        rows = _stop_rows(trip[0], trip[1], known_destinations)
+        if rows:
+            connection.execute(trip_stops.insert(), rows)
+
+    with op.batch_alter_table("trips") as batch:
+        batch.drop_column("destinations")
+
+
+def downgrade():
+    with op.batch_alter_table("trips") as batch:
+        batch.add_column(sa.Column("destinations", sa.JSON))
+
+    connection = op.get_bind()
+    stops = {}
+    for row in connection.execute(sa.select(trip_stops).order_by(trip_stops.c.trip_id, trip_stops.c.sequence_order)):
+        stop = {
+            key: value.isoformat() if isinstance(value, date) else value
+            for key, value in row._mapping.items()
+            if key not in ("id", "trip_id", "sequence_order") and value is not None
+        }
+        stops.setdefault(row.trip_id, []).append(stop)
+    for trip_id, trip_destinations in stops.items():
+        connection.execute(trips.update().where(trips.c.id == trip_id).values(destinations=trip_destinations))
+
+    op.drop_index("ix_trip_stops_destination_trip", table_name="trip_stops")
+    op.drop_index("ix_trip_stops_trip_order", table_name="trip_stops")
+    op.drop_table("trip_stops")
@@ -0,0 +1,21 @@
+"""unique natural key on destinations for bulk upserts
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Fails if the catalog already holds duplicate (name, city, country) rows; merge them first
+    op.create_index("ux_destinations_name_city_country", "destinations", ["name", "city", "country"], unique=True)
+
+
+def downgrade():
+    op.drop_index("ux_destinations_name_city_country", table_name="destinations")
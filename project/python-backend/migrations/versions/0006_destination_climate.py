@@ -0,0 +1,28 @@
+"""monthly climate per destination
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "destination_climate",
+        sa.Column("destination_id", sa.String, sa.ForeignKey("destinations.id"), primary_key=True),
+        sa.Column("temperatures", sa.LargeBinary, nullable=False),
+        sa.Column("rainfall", sa.LargeBinary, nullable=False),
+        sa.Column("best_time", sa.String, nullable=True),
+        sa.Column("updated_at", sa.DateTime, server_default=sa.func.now()),
+    )
+
+
+def downgrade():
+    op.drop_table("destination_climate")
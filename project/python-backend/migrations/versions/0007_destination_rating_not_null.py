@@ -0,0 +1,42 @@
+"""destinations.avg_rating NOT NULL, so keyset pages never skip unrated rows
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.database import SQLITE_SEARCH_DDL
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+TRIGGERS = ("destinations_fts_insert", "destinations_fts_delete", "destinations_fts_update")
+
+
+def _alter_rating(**changes):
+    bind = op.get_bind()
+    # A database without the full-text table has no triggers to carry over
+    search = bind.dialect.name == "sqlite" and sa.inspect(bind).has_table("destinations_fts")
+    if search:
+        # The batch rebuild of destinations would drop the full-text triggers with the old table
+        for trigger in TRIGGERS:
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    with op.batch_alter_table("destinations") as batch:
+        batch.alter_column("avg_rating", existing_type=sa.Float, **changes)
+    if search:
+        # The trigger DDL and a 'rebuild', since the copy may renumber rowids
+        for statement in SQLITE_SEARCH_DDL[1:]:
+            op.execute(statement)
+
+
+def upgrade():
+    op.execute("UPDATE destinations SET avg_rating = 0 WHERE avg_rating IS NULL")
+    _alter_rating(nullable=False, server_default="0")
+
+
+def downgrade():
+    _alter_rating(nullable=True, server_default=None)
@@ -0,0 +1,57 @@
+"""
+Throughput of the NumPy haversine kernel against a pure-Python loop.
+
+    python scripts/benchmark_distance.py --sizes 1000 100000 1000000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.distance import haversine_many_to_many, haversine_one_to_many
+from app.services.geo import haversine_km
+
+
+def best_of(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000, 1000000])
+    parser.add_argument("--stops", type=int, default=10, help="Query points for the many-to-many run")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    print(f"{'points':>10} {'python':>14} {'numpy 1:n':>14} {'numpy m:n':>14} {'speedup':>9}")
+    for size in args.sizes:
+        lats = [rng.uniform(-90, 90) for _ in range(size)]
+        lngs = [rng.uniform(-180, 180) for _ in range(size)]
+        lat_array = np.array(lats, dtype=np.float64)
+        lng_array = np.array(lngs, dtype=np.float64)
+        stop_lats = np.array([rng.uniform(-90, 90) for _ in range(args.stops)])
+        stop_lngs = np.array([rng.uniform(-180, 180) for _ in range(args.stops)])
+
+        python = best_of(lambda: [haversine_km(10.0, 20.0, lat, lng) for lat, lng in zip(lats, lngs)], 1)
+        one_to_many = best_of(lambda: haversine_one_to_many(10.0, 20.0, lat_array, lng_array))
+        many_to_many = best_of(lambda: haversine_many_to_many(stop_lats, stop_lngs, lat_array, lng_array))
+
+        print(
+            f"{size:>10} {size / python / 1e6:>10.2f} M/s {size / one_to_many / 1e6:>10.2f} M/s "
+            f"{size * args.stops / many_to_many / 1e6:>10.2f} M/s {python / one_to_many:>8.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
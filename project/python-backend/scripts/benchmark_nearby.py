@@ -0,0 +1,106 @@
+"""
+Compare /api/destinations/search/nearby strategies.
+
+Runs the original trigonometric full-scan SQL against an in-memory SQLite
+catalog and the in-memory SpatialIndex over the same random points.
+
+    python scripts/benchmark_nearby.py --sizes 10000 100000 1000000
+"""
+
+import argparse
+import math
+import os
+import random
+import sqlite3
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.spatial_index import SpatialIndex
+
+# Same shape as the SQL the endpoint used to build; SQLite needs the distance
+# filter in an outer query instead of HAVING without GROUP BY.
+SQL_QUERY = """
+SELECT * FROM (
+    SELECT *,
+           (6371 * acos(cos(radians(?)) * cos(radians(latitude)) *
+           cos(radians(longitude) - radians(?)) + sin(radians(?)) *
+           sin(radians(latitude)))) AS distance
+    FROM destinations
+    WHERE is_active = 1
+)
+WHERE distance <= ?
+ORDER BY distance
+LIMIT ?
+"""
+
+
+def make_points(count: int):
+    rng = random.Random(42)
+    return [
+        (f"dest-{i}", math.degrees(math.asin(rng.uniform(-1, 1))), rng.uniform(-180, 180))
+        for i in range(count)
+    ]
+
+
+def make_sqlite(points):
+    conn = sqlite3.connect(":memory:")
+    for name, fn in (("acos", lambda x: math.acos(max(-1.0, min(1.0, x)))), ("cos", math.cos),
+                     ("sin", math.sin), ("radians", math.radians)):
+        conn.create_function(name, 1, fn, deterministic=True)
+    conn.execute(
+        "CREATE TABLE destinations (id TEXT PRIMARY KEY, latitude REAL, longitude REAL, is_active INTEGER)"
+    )
+    conn.executemany("INSERT INTO destinations VALUES (?, ?, ?, 1)", points)
+    return conn
+
+
+def timed(fn, queries):
+    start = time.perf_counter()
+    for query in queries:
+        fn(*query)
+    return (time.perf_counter() - start) / len(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--sql-queries", type=int, default=5)
+    parser.add_argument("--radius", type=float, default=50)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    queries = [
+        (math.degrees(math.asin(rng.uniform(-1, 1))), rng.uniform(-180, 180), args.radius, args.limit)
+        for _ in range(args.queries)
+    ]
+
+    print(f"{'rows':>10} {'index build':>12} {'index query':>12} {'sql query':>12} {'speedup':>9}")
+    for size in args.sizes:
+        points = make_points(size)
+
+        index = SpatialIndex()
+        start = time.perf_counter()
+        index.rebuild(points)
+        build = time.perf_counter() - start
+
+        index_query = timed(lambda lat, lng, radius, limit: index.query(lat, lng, k=limit, radius_km=radius), queries)
+
+        conn = make_sqlite(points)
+        sql_query = timed(
+            lambda lat, lng, radius, limit: conn.execute(SQL_QUERY, (lat, lng, lat, radius, limit)).fetchall(),
+            queries[:args.sql_queries],
+        )
+        conn.close()
+
+        print(
+            f"{size:>10} {build:>11.2f}s {index_query * 1e6:>10.1f}us "
+            f"{sql_query * 1e3:>10.1f}ms {sql_query / index_query:>8.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Per-request overhead of the rate limit middleware on a bare ASGI app.
+
+    python scripts/benchmark_rate_limit.py --requests 50000 --clients 1000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.middleware.rate_limit import RateLimitMiddleware
+from app.services.rate_limiter import GCRALimiter, MemoryStore, SQLiteStore
+
+
+async def endpoint(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain")]})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+class PassThroughMiddleware(BaseHTTPMiddleware):
+    """What the previous limiter cost before doing any limiting"""
+
+    async def dispatch(self, request, call_next):
+        return await call_next(request)
+
+
+async def measure(app, requests: int, clients: int) -> float:
+    def connection():
+        """receive/send pair acting like a server: disconnect once the response is sent"""
+        sent = asyncio.Event()
+        messages = [{"type": "http.request", "body": b"", "more_body": False}]
+
+        async def receive():
+            if messages:
+                return messages.pop()
+            await sent.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.body" and not message.get("more_body"):
+                sent.set()
+
+        return receive, send
+
+    scopes = [
+        {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+            "scheme": "http", "path": "/api/destinations/", "raw_path": b"/api/destinations/",
+            "query_string": b"", "root_path": "", "headers": [], "client": (f"10.0.{i // 256}.{i % 256}", 1234),
+            "server": ("bench", 80),
+        }
+        for i in range(clients)
+    ]
+    start = time.perf_counter()
+    for i in range(requests):
+        await app(scopes[i % clients], *connection())
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=50000)
+    parser.add_argument("--clients", type=int, default=1000)
+    args = parser.parse_args()
+
+    limit = args.requests * 10
+    store_path = os.path.join(tempfile.mkdtemp(), "rate_limits.db")
+    variants = [
+        ("bare app", endpoint),
+        ("BaseHTTPMiddleware no-op", PassThroughMiddleware(endpoint)),
+        ("GCRA memory", RateLimitMiddleware(endpoint, limiter=GCRALimiter(limit, 60, MemoryStore()))),
+        ("GCRA sqlite (shared)", RateLimitMiddleware(endpoint, limiter=GCRALimiter(limit, 60, SQLiteStore(store_path)))),
+    ]
+
+    baseline = None
+    print(f"{'variant':<26} {'us/request':>11} {'overhead':>10}")
+    for name, app in variants:
+        cost = await measure(app, args.requests, args.clients)
+        baseline = cost if baseline is None else baseline
+        print(f"{name:<26} {cost:>11.2f} {cost - baseline:>8.2f}us")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
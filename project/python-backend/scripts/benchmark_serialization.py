@@ -0,0 +1,102 @@
+"""
+Requests per second of list responses: pydantic models + response_model
+against the projected-row orjson fast path, over the same query.
+
+    python scripts/benchmark_serialization.py --rows 20 100 --requests 2000
+"""
+
+import argparse
+import asyncio
+import datetime
+import os
+import sys
+import tempfile
+import time
+import uuid
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DATABASE_PATH = os.path.join(tempfile.mkdtemp(), "benchmark.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DATABASE_PATH}"
+
+import httpx
+from fastapi import FastAPI
+
+from app.database import create_schema, database, destinations_table
+from app.models import Destination
+from app.serialization import RowProjection, json_response
+
+destination_rows = RowProjection(Destination, destinations_table)
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+
+    def page_query(limit: int):
+        return destinations_table.select().order_by(destinations_table.c.avg_rating.desc()).limit(limit)
+
+    @app.get("/before", response_model=List[Destination])
+    async def before(limit: int):
+        rows = await database.fetch_all(page_query(limit))
+        return [Destination(**dict(row)) for row in rows]
+
+    @app.get("/after", response_model=List[Destination])
+    async def after(limit: int):
+        rows = await database.fetch_all(page_query(limit))
+        return json_response(destination_rows.many(rows))
+
+    return app
+
+
+async def seed(count: int):
+    now = datetime.datetime(2024, 1, 1, 12, 30)
+    await database.execute_many(destinations_table.insert(), [
+        {
+            "id": str(uuid.uuid4()), "name": f"Destination {i}", "city": "City", "country": "Country",
+            "continent": "Asia", "latitude": 10.0 + i / 1000, "longitude": 20.0, "description": "Long description " * 20,
+            "short_description": "Short description", "avg_rating": 4.0 + (i % 10) / 10, "review_count": i,
+            "average_price": 1500, "currency": "USD", "safety_index": 70, "avg_temperature": 24.5,
+            "activity_categories": ["Beach", "Food", "Culture"], "image_url": "https://example.com/image.jpg",
+            "is_featured": False, "is_active": True, "created_at": now,
+        }
+        for i in range(count)
+    ])
+
+
+async def run(client: httpx.AsyncClient, path: str, requests: int) -> float:
+    start = time.perf_counter()
+    for _ in range(requests):
+        response = await client.get(path)
+        response.raise_for_status()
+    return requests / (time.perf_counter() - start)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[20, 100])
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    create_schema()
+    await database.connect()
+    await seed(max(args.rows))
+
+    transport = httpx.ASGITransport(app=build_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        for limit in args.rows:
+            before = (await client.get(f"/before?limit={limit}")).json()
+            after = (await client.get(f"/after?limit={limit}")).json()
+            assert before == after, "fast path output differs from response_model output"
+
+        print(f"{'rows':>6} {'before':>12} {'after':>12} {'speedup':>9}")
+        for limit in args.rows:
+            before = await run(client, f"/before?limit={limit}", args.requests)
+            after = await run(client, f"/after?limit={limit}", args.requests)
+            print(f"{limit:>6} {before:>8.0f} rps {after:>8.0f} rps {after / before:>8.2f}x")
+
+    await database.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,113 @@
+"""
+Read throughput of the pooled SQLite database with stock settings against the
+production pragma profile, with concurrent readers and one steady writer.
+
+    python scripts/benchmark_sqlite_pragmas.py --rows 20000 --readers 1 8 32 --seconds 5 --dir .
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'unused.db')}"
+
+from sqlalchemy import create_engine
+
+from app.database import SQLITE_PRAGMAS, destinations_table, metadata
+from app.db_pool import PooledDatabase
+
+COUNTRIES = ["India", "France", "Japan", "Peru", "Kenya", "Italy", "Brazil", "Canada"]
+
+
+def create_database(path: str, rows: int):
+    engine = create_engine(f"sqlite:///{path}")
+    metadata.create_all(bind=engine, tables=[destinations_table])
+    with engine.begin() as connection:
+        connection.execute(destinations_table.insert(), [
+            {
+                "id": str(uuid.uuid4()), "name": f"Destination {i}", "city": "City",
+                "country": COUNTRIES[i % len(COUNTRIES)], "continent": "Asia", "latitude": 10.0, "longitude": 20.0,
+                "description": "Long description " * 40, "short_description": "Short", "avg_rating": (i % 50) / 10,
+                "review_count": i, "average_price": 500 + i % 3000, "currency": "USD", "safety_index": 70,
+                "avg_temperature": 24.5, "activity_categories": ["Beach", "Food"], "image_url": "https://example.com/x.jpg",
+                "is_featured": False, "is_active": True,
+            }
+            for i in range(rows)
+        ])
+    engine.dispose()
+
+
+async def reader(database: PooledDatabase, deadline: float, latencies: list):
+    table = destinations_table
+    while time.perf_counter() < deadline:
+        query = (
+            table.select()
+            .where(table.c.is_active == True, table.c.country == random.choice(COUNTRIES))
+            .order_by(table.c.avg_rating.desc(), table.c.id.desc())
+            .limit(20)
+        )
+        start = time.perf_counter()
+        await database.fetch_all(query)
+        latencies.append(time.perf_counter() - start)
+
+
+async def writer(database: PooledDatabase, deadline: float, ids: list) -> int:
+    writes = 0
+    while time.perf_counter() < deadline:
+        await database.execute(
+            destinations_table.update()
+            .where(destinations_table.c.id == random.choice(ids))
+            .values(review_count=destinations_table.c.review_count + 1)
+        )
+        writes += 1
+    return writes
+
+
+async def measure(path: str, pragmas, readers: int, seconds: float):
+    database = PooledDatabase(f"sqlite+aiosqlite:///{path}", min_size=readers + 1, max_size=readers + 1, sqlite_pragmas=pragmas)
+    await database.connect()
+    ids = [row[0] for row in await database.fetch_all(destinations_table.select().with_only_columns(destinations_table.c.id))]
+    latencies = []
+    deadline = time.perf_counter() + seconds
+    results = await asyncio.gather(
+        writer(database, deadline, ids),
+        *(reader(database, deadline, latencies) for _ in range(readers)),
+    )
+    await database.disconnect()
+    p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else 0.0
+    return len(latencies) / seconds, p95 * 1000, results[0] / seconds
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--readers", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--dir", default=None, help="where to create the databases; use a real disk, not tmpfs")
+    args = parser.parse_args()
+
+    # Separate files: journal_mode=WAL persists in the database header
+    workdir = tempfile.mkdtemp(dir=args.dir)
+    profiles = {"stock": None, "tuned": SQLITE_PRAGMAS}
+    paths = {}
+    for name in profiles:
+        paths[name] = os.path.join(workdir, f"{name}.db")
+        create_database(paths[name], args.rows)
+
+    print(f"{'readers':>7} {'profile':>8} {'reads/s':>10} {'p95 ms':>8} {'writes/s':>9}")
+    for readers in args.readers:
+        for name, pragmas in profiles.items():
+            reads, p95, writes = await measure(paths[name], pragmas, readers, args.seconds)
+            print(f"{readers:>7} {name:>8} {reads:>10.0f} {p95:>8.2f} {writes:>9.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
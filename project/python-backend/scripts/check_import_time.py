@@ -0,0 +1,130 @@
+"""
+Enforce the worker import-time budget: importing the app must stay under
+--budget-ms and must not touch the database or any shared state file.
+
+    python scripts/check_import_time.py --budget-ms 1500
+    python scripts/check_import_time.py --module app.main
+
+By default it imports every module app.main does, except app.routers.ai_assistant,
+which is not Python yet; once it is, check app.main itself. Exits non-zero when
+the budget is exceeded, the import fails or a file appears. tests/test_import_time.py
+runs the same probe under pytest. Each run uses a fresh interpreter; the best of
+--runs is compared.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# What app.main imports, minus the router that does not parse
+DEFAULT_MODULES = [
+    "app.auth",
+    "app.database",
+    "app.quotas",
+    "app.routers.auth",
+    "app.routers.users",
+    "app.routers.destinations",
+    "app.routers.trips",
+    "app.routers.bookings",
+    "app.routers.maps",
+    "app.middleware.rate_limit",
+    "app.services.maps_client",
+    "app.services.catalog",
+]
+
+# Files the app may only create from its startup hooks
+STATE_FILES = {
+    "DATABASE_URL": "import_probe.db",
+    "RATE_LIMIT_STORE_PATH": "rate_limits.db",
+    "MAPS_CACHE_PATH": "maps_cache.db",
+    "USER_CACHE_GENERATIONS_PATH": "user_generations",
+    "READ_YOUR_WRITES_PATH": "recent_writes",
+}
+
+PROBE = """
+import sys, time
+start = time.perf_counter()
+for module in sys.argv[1:]:
+    __import__(module)
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+def run_import(modules: List[str], env: dict, importtime: bool = False) -> subprocess.CompletedProcess:
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    command += ["-c", PROBE, *modules]
+    return subprocess.run(command, cwd=BACKEND_DIR, env=env, capture_output=True, text=True)
+
+
+def probe_environment(probe_dir: str) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """State file paths inside probe_dir, and an environment pointing the app at them"""
+    paths = {name: os.path.join(probe_dir, filename) for name, filename in STATE_FILES.items()}
+    return paths, {**os.environ, **paths, "DATABASE_URL": f"sqlite:///{paths['DATABASE_URL']}"}
+
+
+def best_import_ms(modules: List[str], env: Dict[str, str], runs: int) -> float:
+    """Fastest of `runs` imports of modules; RuntimeError with the traceback if one fails"""
+    timings = []
+    for _ in range(runs):
+        result = run_import(modules, env)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr)
+        timings.append(float(result.stdout.strip().splitlines()[-1]))
+    return min(timings)
+
+
+def created_files(paths: Dict[str, str]) -> List[str]:
+    return [name for name, path in paths.items() if os.path.exists(path)]
+
+
+def slowest_imports(stderr: str, count: int):
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--module", action="append", dest="modules", help="repeatable; default: see above")
+    parser.add_argument("--budget-ms", type=float, default=1500)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+    modules = args.modules or DEFAULT_MODULES
+    label = modules[0] if len(modules) == 1 else f"{len(modules)} modules"
+
+    # Point the app at database and state paths that must still not exist afterwards
+    paths, env = probe_environment(tempfile.mkdtemp())
+
+    try:
+        best = best_import_ms(modules, env, args.runs)
+    except RuntimeError as error:
+        print(error, file=sys.stderr)
+        print(f"FAIL: importing {label} raised")
+        sys.exit(1)
+
+    print(f"import {label}: best {best:.0f} ms of {args.runs} (budget {args.budget_ms:.0f} ms)")
+    for cumulative, name in slowest_imports(run_import(modules, env, importtime=True).stderr, 10):
+        print(f"  {cumulative / 1000:>8.1f} ms  {name}")
+
+    touched = created_files(paths)
+    if touched:
+        print(f"FAIL: importing the app created {', '.join(touched)} files")
+        sys.exit(1)
+    if best > args.budget_ms:
+        print("FAIL: import-time budget exceeded")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
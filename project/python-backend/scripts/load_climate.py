@@ -0,0 +1,153 @@
+"""
+Load monthly climate from a CSV into destination_climate, upserting per destination.
+
+    python scripts/load_climate.py climate.csv
+    python scripts/load_climate.py "Seasonal Temperature.csv" --dry-run
+
+Monthly files have temp_jan..temp_dec (mean °C) and optionally
+rain_jan..rain_dec (mm). Seasonal files, like the Kaggle "seasonal temperature
+of Indian travel destinations" set read by scripts/import-temperature-data.js,
+have Winter/Summer/Monsoon/Post Monsoon Temperature columns, which are spread
+over their months (Winter Dec-Feb, Summer Mar-May, Monsoon Jun-Sep, Post Monsoon
+Oct-Nov). Empty cells are stored as unknown.
+
+Rows name their destination by destination_id, or by Destination/name (matched
+case-insensitively against name, then city, optionally narrowed by country).
+Unmatched rows are reported and skipped; load the destinations first with
+scripts/load_destinations.py. Running API workers pick the changes up on their
+next catalog index refresh.
+"""
+
+import argparse
+import asyncio
+import csv
+import os
+import sys
+from typing import Any, Dict, List, Optional
+
+import sqlalchemy
+from sqlalchemy.dialects import postgresql, sqlite
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import IS_SQLITE, database, destination_climate_table, destinations_table
+from app.services.climate import pack
+
+MONTH_NAMES = ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"]
+# Season column -> its months (1-12)
+SEASONS = {
+    "winter": (12, 1, 2),
+    "summer": (3, 4, 5),
+    "monsoon": (6, 7, 8, 9),
+    "post monsoon": (10, 11),
+}
+
+
+def _key(name: str) -> str:
+    return " ".join(name.lower().replace("_", " ").split())
+
+
+def _float(value: Optional[str]) -> Optional[float]:
+    if value is None or not value.strip():
+        return None
+    return float(value)
+
+
+def monthly(row: Dict[str, str], prefix: str) -> List[Optional[float]]:
+    """Twelve values from monthly columns, or from seasonal ones when there are none"""
+    values = [_float(row.get(f"{prefix} {month}")) for month in MONTH_NAMES]
+    if any(value is not None for value in values) or prefix != "temp":
+        return values
+    for season, months in SEASONS.items():
+        value = _float(row.get(f"{season} temperature") or row.get(f"{season} temp") or row.get(season))
+        for month in months:
+            values[month - 1] = value
+    return values
+
+
+class Matcher:
+    """Destination ids by id, name or city"""
+
+    def __init__(self, rows):
+        self.ids = {row["id"] for row in rows}
+        self.names: Dict[str, List[Any]] = {}
+        self.cities: Dict[str, List[Any]] = {}
+        for row in rows:
+            self.names.setdefault(row["name"].lower(), []).append(row)
+            self.cities.setdefault(row["city"].lower(), []).append(row)
+
+    def match(self, row: Dict[str, str]) -> Optional[str]:
+        if row.get("destination id"):
+            return row["destination id"] if row["destination id"] in self.ids else None
+        name = (row.get("destination") or row.get("name") or row.get("city") or "").strip().lower()
+        country = (row.get("country") or "").strip().lower()
+        for candidates in (self.names.get(name, []), self.cities.get(name, [])):
+            if country:
+                candidates = [candidate for candidate in candidates if candidate["country"].lower() == country]
+            if len(candidates) == 1:
+                return candidates[0]["id"]
+        return None
+
+
+def read(path: str, matcher: Matcher, strict: bool) -> List[Dict[str, Any]]:
+    values, skipped = {}, 0
+    with open(path, newline="", encoding="utf-8-sig") as file:
+        for number, row in enumerate(csv.DictReader(file), start=2):
+            row = {_key(key): value for key, value in row.items() if key}
+            try:
+                destination_id = matcher.match(row)
+                if destination_id is None:
+                    raise ValueError("no single matching destination")
+                values[destination_id] = {
+                    "destination_id": destination_id,
+                    "temperatures": pack(monthly(row, "temp")),
+                    "rainfall": pack(monthly(row, "rain")),
+                    "best_time": (row.get("best time to visit") or row.get("best time") or "").strip() or None,
+                }
+            except ValueError as error:
+                skipped += 1
+                if strict:
+                    raise SystemExit(f"line {number}: {error}")
+                if skipped <= 10:
+                    print(f"skipping line {number}: {error}", file=sys.stderr)
+    return list(values.values())
+
+
+def upsert():
+    insert = (sqlite.insert if IS_SQLITE else postgresql.insert)(destination_climate_table)
+    return insert.on_conflict_do_update(
+        index_elements=["destination_id"],
+        set_={
+            "temperatures": insert.excluded.temperatures,
+            "rainfall": insert.excluded.rainfall,
+            "best_time": insert.excluded.best_time,
+            "updated_at": sqlalchemy.func.now(),
+        },
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("path")
+    parser.add_argument("--strict", action="store_true", help="stop at the first unusable row")
+    parser.add_argument("--dry-run", action="store_true", help="match and parse only, write nothing")
+    args = parser.parse_args()
+
+    await database.connect()
+    try:
+        destinations = await database.fetch_all(
+            sqlalchemy.select(destinations_table.c.id, destinations_table.c.name, destinations_table.c.city, destinations_table.c.country)
+        )
+        rows = read(args.path, Matcher(destinations), args.strict)
+        if rows and not args.dry_run:
+            # A catalog's worth of 100-byte rows: one transaction is plenty
+            async with database.transaction():
+                await database.execute_many(upsert(), rows)
+    finally:
+        await database.disconnect()
+
+    print(f"{len(rows)} destinations {'matched' if args.dry_run else 'updated'}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
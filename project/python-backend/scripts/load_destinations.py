@@ -0,0 +1,249 @@
+"""
+Stream a destination catalog file (CSV, JSONL or Parquet) into the destinations
+table, upserting on (name, city, country).
+
+    python scripts/load_destinations.py catalog.csv
+    python scripts/load_destinations.py catalog.parquet --chunk-size 20000
+    python scripts/load_destinations.py catalog.jsonl --dry-run
+
+Rows are validated against DestinationCreate; invalid rows are reported and
+skipped (--strict stops at the first one). Memory stays at one chunk: each is
+written in its own transaction, as one executemany of a prepared upsert on
+SQLite and as COPY into a staging table on PostgreSQL. An interrupted load keeps
+its committed chunks and a rerun converges. Existing rows keep their id,
+ratings, featured flag and active flag. Running API workers pick the changes up on their
+next catalog index refresh. Parquet needs pyarrow.
+"""
+
+import argparse
+import asyncio
+import csv
+import itertools
+import os
+import sys
+import time
+import uuid
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+import orjson
+import sqlalchemy
+from pydantic import ValidationError
+from sqlalchemy.dialects import postgresql, sqlite
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import IS_SQLITE, SQLITE_SEARCH_DDL, database, destinations_table
+from app.models import DestinationCreate
+
+NATURAL_KEY = ["name", "city", "country"]
+FIELDS = list(getattr(DestinationCreate, "model_fields", None) or DestinationCreate.__fields__)
+# Set when a row is new; a reload leaves them alone, so it never reactivates a deactivated destination
+NEW_ROW_FIELDS = {"avg_rating": 0.0, "review_count": 0, "is_featured": False, "is_active": True}
+INSERT_COLUMNS = ["id", *FIELDS, *NEW_ROW_FIELDS]
+UPDATE_COLUMNS = FIELDS
+JSON_COLUMNS = {name for name in INSERT_COLUMNS if isinstance(destinations_table.c[name].type, sqlalchemy.JSON)}
+
+
+def read_csv(path: str, batch_size: int) -> Iterator[Dict[str, Any]]:
+    with open(path, newline="", encoding="utf-8") as file:
+        for row in csv.DictReader(file):
+            # Empty cells mean "not given", so model defaults apply
+            row = {key: value for key, value in row.items() if value != ""}
+            categories = row.get("activity_categories")
+            if categories is not None:
+                row["activity_categories"] = (
+                    orjson.loads(categories) if categories.startswith("[")
+                    else [item.strip() for item in categories.split("|") if item.strip()]
+                )
+            yield row
+
+
+def read_jsonl(path: str, batch_size: int) -> Iterator[Dict[str, Any]]:
+    with open(path, "rb") as file:
+        for line in file:
+            if line.strip():
+                yield orjson.loads(line)
+
+
+def read_parquet(path: str, batch_size: int) -> Iterator[Dict[str, Any]]:
+    try:
+        import pyarrow.parquet
+    except ImportError:
+        raise SystemExit("Reading Parquet needs pyarrow: pip install pyarrow")
+    for batch in pyarrow.parquet.ParquetFile(path).iter_batches(batch_size=batch_size):
+        for row in batch.to_pylist():
+            yield {key: value for key, value in row.items() if value is not None}
+
+
+READERS = {"csv": read_csv, "jsonl": read_jsonl, "ndjson": read_jsonl, "parquet": read_parquet}
+
+
+class Stats:
+    def __init__(self):
+        self.read = 0
+        self.invalid = 0
+        self.written = 0
+
+
+def describe(error: Exception) -> str:
+    if isinstance(error, ValidationError):
+        first = error.errors()[0]
+        return f"{'.'.join(str(part) for part in first['loc'])}: {first['msg']}"
+    return str(error)
+
+
+def validated(rows: Iterable[Dict[str, Any]], stats: Stats, strict: bool) -> Iterator[Dict[str, Any]]:
+    for number, row in enumerate(rows, start=1):
+        stats.read += 1
+        try:
+            yield DestinationCreate(**row).dict()
+        except (TypeError, ValidationError) as error:
+            stats.invalid += 1
+            if strict:
+                raise SystemExit(f"row {number}: {describe(error)}")
+            if stats.invalid <= 10:
+                print(f"skipping row {number}: {describe(error)}", file=sys.stderr)
+
+
+def chunks(rows: Iterator[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    while True:
+        chunk = list(itertools.islice(rows, size))
+        if not chunk:
+            return
+        # One row per natural key: PostgreSQL refuses to upsert the same row twice in a statement
+        yield records(list({tuple(row[key] for key in NATURAL_KEY): row for row in chunk}.values()))
+
+
+def records(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Column values for a chunk; ids are only used by rows that turn out to be new"""
+    # One urandom call per chunk instead of one per uuid4()
+    entropy = os.urandom(16 * len(rows))
+    values = []
+    for index, row in enumerate(rows):
+        row = {
+            "id": str(uuid.UUID(bytes=entropy[16 * index:16 * index + 16], version=4)),
+            **row, **NEW_ROW_FIELDS,
+        }
+        for name in JSON_COLUMNS:
+            row[name] = orjson.dumps(row[name]).decode()
+        values.append(row)
+    return values
+
+
+def _upsert(dialect_insert, source=None):
+    if source is None:
+        statement = dialect_insert(destinations_table).values({name: sqlalchemy.bindparam(name) for name in INSERT_COLUMNS})
+    else:
+        statement = dialect_insert(destinations_table).from_select(INSERT_COLUMNS, sqlalchemy.select(*source.c))
+    return statement.on_conflict_do_update(
+        index_elements=NATURAL_KEY,
+        set_={name: statement.excluded[name] for name in UPDATE_COLUMNS},
+    )
+
+
+class SQLiteWriter:
+    """One prepared upsert, run by sqlite3's executemany without per-row Python round trips.
+
+    The full-text index triggers cost more than the insert itself, so they are
+    dropped for the load and the index is rebuilt once at the end.
+    """
+
+    TRIGGERS = ["destinations_fts_insert", "destinations_fts_delete", "destinations_fts_update"]
+
+    def __init__(self, connection):
+        self.raw = connection.raw_connection
+        self.sql = _upsert(sqlite.insert).compile(dialect=sqlite.dialect(paramstyle="named")).string
+
+    async def prepare(self):
+        for trigger in self.TRIGGERS:
+            await self.raw.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+
+    async def write(self, rows: List[Dict[str, Any]]):
+        await self.raw.executemany(self.sql, rows)
+
+    async def finish(self):
+        # The trigger DDL and the final 'rebuild'
+        for statement in SQLITE_SEARCH_DDL[1:]:
+            await self.raw.execute(statement)
+
+
+class PostgresWriter:
+    """COPY each chunk into a temp staging table, then one INSERT ... SELECT ... ON CONFLICT"""
+
+    STAGING = "destinations_load"
+
+    def __init__(self, connection):
+        self.raw = connection.raw_connection
+        staging = sqlalchemy.table(self.STAGING, *(sqlalchemy.column(name) for name in INSERT_COLUMNS))
+        self.sql = _upsert(postgresql.insert, staging).compile(dialect=postgresql.dialect()).string
+
+    async def prepare(self):
+        await self.raw.execute(
+            f"CREATE TEMP TABLE IF NOT EXISTS {self.STAGING} "
+            f"(LIKE destinations INCLUDING DEFAULTS) ON COMMIT DELETE ROWS"
+        )
+
+    async def write(self, rows: List[Dict[str, Any]]):
+        tuples = [tuple(row[name] for name in INSERT_COLUMNS) for row in rows]
+        await self.raw.copy_records_to_table(self.STAGING, records=tuples, columns=INSERT_COLUMNS)
+        await self.raw.execute(self.sql)
+
+    async def finish(self):
+        pass
+
+
+async def load(path: str, file_format: str, chunk_size: int, strict: bool, dry_run: bool) -> Tuple[Stats, float]:
+    stats = Stats()
+    rows = validated(READERS[file_format](path, chunk_size), stats, strict)
+    start = time.perf_counter()
+    if dry_run:
+        for _ in rows:
+            pass
+        return stats, time.perf_counter() - start
+
+    async with database.connection() as connection:
+        writer = (SQLiteWriter if IS_SQLITE else PostgresWriter)(connection)
+        async with connection.transaction():
+            await writer.prepare()
+        try:
+            for chunk in chunks(rows, chunk_size):
+                async with connection.transaction():
+                    await writer.write(chunk)
+                stats.written += len(chunk)
+                elapsed = time.perf_counter() - start
+                print(f"\r{stats.written} rows, {stats.written / elapsed:,.0f} rows/s", end="", file=sys.stderr, flush=True)
+        finally:
+            async with connection.transaction():
+                await writer.finish()
+    print(file=sys.stderr)
+    return stats, time.perf_counter() - start
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=sorted(READERS), help="default: from the file extension")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="rows per transaction")
+    parser.add_argument("--strict", action="store_true", help="stop at the first invalid row")
+    parser.add_argument("--dry-run", action="store_true", help="validate only, write nothing")
+    args = parser.parse_args()
+
+    file_format = args.format or os.path.splitext(args.path)[1].lstrip(".").lower()
+    if file_format not in READERS:
+        parser.error(f"cannot tell the format of {args.path}; pass --format")
+
+    await database.connect()
+    try:
+        stats, elapsed = await load(args.path, file_format, args.chunk_size, args.strict, args.dry_run)
+    finally:
+        await database.disconnect()
+
+    valid = stats.read - stats.invalid
+    print(
+        f"{stats.read} rows read, {stats.invalid} invalid, {stats.written} upserted "
+        f"in {elapsed:.1f}s ({valid / elapsed if elapsed else 0:,.0f} rows/s)"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,55 @@
+"""
+Rebuild or verify the user_stats rollup against the trips, bookings and
+reviews tables.
+
+    python scripts/rebuild_user_stats.py            # recompute every user
+    python scripts/rebuild_user_stats.py --check    # report drift, change nothing
+    python scripts/rebuild_user_stats.py --user <id> --check
+
+--check exits non-zero when any stored rollup differs, so it can run from cron
+or CI; --repair rebuilds only the users it found drifting.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import database
+from app.services import user_stats
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--user", help="limit to one user id")
+    parser.add_argument("--check", action="store_true", help="only compare stored and recomputed values")
+    parser.add_argument("--repair", action="store_true", help="with --check, rebuild the drifting users")
+    parser.add_argument("--chunk-size", type=int, default=500)
+    args = parser.parse_args()
+
+    await database.connect()
+    try:
+        if not args.check:
+            count = await user_stats.rebuild(args.user, args.chunk_size)
+            print(f"rebuilt user_stats for {count} users")
+            return
+
+        mismatches = await user_stats.find_mismatches(args.user)
+        for mismatch in mismatches:
+            print(json.dumps(mismatch, default=str))
+        print(f"{len(mismatches)} users with drifting user_stats")
+        if mismatches and args.repair:
+            for mismatch in mismatches:
+                await user_stats.rebuild(mismatch["user_id"])
+            print(f"repaired {len(mismatches)} users")
+        elif mismatches:
+            sys.exit(1)
+    finally:
+        await database.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,5 +1,10 @@
 import asyncio
+import os
+import sys
 import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 from app.database import database, destinations_table
 
 # Sample destinations data
@@ -116,13 +121,10 @@ async def seed_destinations():
     await database.connect()
     
     try:
-        # Clear existing data
-        await database.execute(destinations_table.delete())
-        
-        # Insert sample data
-        for destination in destinations_data:
-            query = destinations_table.insert().values(**destination)
-            await database.execute(query)
+        # Clear existing data and insert the samples in one transaction
+        async with database.transaction():
+            await database.execute(destinations_table.delete())
+            await database.execute_many(destinations_table.insert(), destinations_data)
         
         print(f"Successfully seeded {len(destinations_data)} destinations!")
         
@@ -0,0 +1,31 @@
+"""Worker import-time budget: see scripts/check_import_time.py"""
+
+import importlib.util
+import os
+
+import pytest
+
+SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts", "check_import_time.py")
+_spec = importlib.util.spec_from_file_location("check_import_time", SCRIPT)
+check_import_time = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(check_import_time)
+
+BUDGET_MS = float(os.environ.get("IMPORT_TIME_BUDGET_MS", "1500"))
+
+
+@pytest.fixture
+def probe(tmp_path):
+    return check_import_time.probe_environment(str(tmp_path))
+
+
+def test_import_within_budget(probe):
+    _, env = probe
+    best = check_import_time.best_import_ms(check_import_time.DEFAULT_MODULES, env, runs=3)
+    assert best <= BUDGET_MS, f"importing the app took {best:.0f} ms (budget {BUDGET_MS:.0f} ms)"
+
+
+def test_import_creates_no_database_or_state_files(probe):
+    paths, env = probe
+    check_import_time.best_import_ms(check_import_time.DEFAULT_MODULES, env, runs=1)
+    # The SQLite file would appear on any connection or DDL at import
+    assert check_import_time.created_files(paths) == []
@@ -149,6 +149,14 @@ export const destinationsAPI = {
       headers: getAuthHeaders()
     });
     return handleResponse(response);
+  },
+
+  async autocomplete(query: string, limit = 10) {
+    const params = new URLSearchParams({ q: query, limit: limit.toString() });
+    const response = await fetch(`${API_BASE_URL}/destinations/autocomplete?${params}`, {
+      headers: getAuthHeaders()
+    });
+    return handleResponse(response);
   }
 };
 